@@ -0,0 +1,12 @@
+"""
+- runner script for the benchmark suite of the per-frame hot path
+- imports the main function from the benchmark module and executes it
+- usage:
+    run the script directly from the command line:
+    python3 bench.py [--levels 50] [--ticks 200] [--no-display] [--compound-batches] [--output bench.json] [--compare old.json]
+"""
+
+# import the main function from the benchmark module and execute it
+from src.benchmark import main
+if __name__ == "__main__":
+    main()
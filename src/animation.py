@@ -0,0 +1,101 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import itertools
+import time
+
+# keyframe of an animation: seconds after the start and the callable changing the look at that time
+Keyframe = Tuple[float, Callable[[], None]]
+# seconds the explosion is shown after a collision before the game over prompt
+EXPLOSION_DURATION: float = 1.0
+# seconds and amount of blinks of the level label on level ups and of the player after teleporting to the start
+LEVEL_FLASH_DURATION: float = 0.6
+LEVEL_FLASH_BLINKS: int = 3
+TELEPORT_DURATION: float = 0.3
+TELEPORT_BLINKS: int = 2
+
+
+def blink(set_visible: Callable[[bool], None], duration: float, blinks: int) -> List[Keyframe]:
+    """keyframes hiding and showing something blinks times within duration; starts hiding and ends visible"""
+    step: float = duration / (2 * blinks)
+    return [(index * step, lambda visible=index % 2 == 1: set_visible(visible)) for index in range(2 * blinks)]
+
+
+class AnimationScheduler:
+    """
+    - timeline of non-blocking animations driven by the game loop instead of sleeping in tk callbacks
+    - keyframes of all running animations are kept in one priority queue (heap) keyed by deadline
+    - run_due is called once per frame and runs the keyframes whose deadline passed, in the order of their deadlines
+    - animations have names; playing a name again or cancelling it drops its remaining keyframes
+    - cancelled keyframes stay in the heap and are skipped when popped instead of rebuilding the heap
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock: Callable[[], float] = clock
+        # deadline, sequence number as tie breaker keeping the scheduling order, animation name and generation
+        self._heap: List[Tuple[float, int, str, int, Callable[[], None]]] = []
+        self._sequence = itertools.count()
+        # current generation per animation name; keyframes of older generations are cancelled
+        self._generations: Dict[str, int] = {}
+        # keyframes not run yet per animation name
+        self._remaining: Dict[str, int] = {}
+
+    def play(self, name: str, keyframes: Iterable[Keyframe]) -> None:
+        """starts an animation now; a running animation of the same name is cancelled first"""
+        self.cancel(name)
+        start: float = self._clock()
+        generation: int = self._generations.get(name, 0)
+        for offset, action in keyframes:
+            heapq.heappush(self._heap, (start + offset, next(self._sequence), name, generation, action))
+            self._remaining[name] = self._remaining.get(name, 0) + 1
+
+    def schedule(self, name: str, delay: float, action: Callable[[], None] = lambda: None) -> None:
+        """single keyframe after delay seconds; without action it only keeps the animation running, e.g. a hold"""
+        self.play(name, [(delay, action)])
+
+    def cancel(self, name: str) -> None:
+        """drops the remaining keyframes of an animation"""
+        if self._remaining.pop(name, 0):
+            self._generations[name] = self._generations.get(name, 0) + 1
+
+    def clear(self) -> None:
+        """drops all animations, e.g. on a restart of the game"""
+        for name in list(self._remaining):
+            self.cancel(name)
+        self._heap.clear()
+
+    def is_running(self, name: str) -> bool:
+        """whether keyframes of the animation are left"""
+        return name in self._remaining
+
+    @property
+    def running(self) -> Tuple[str, ...]:
+        """names of all animations with keyframes left"""
+        return tuple(self._remaining)
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """clock time of the next keyframe; none without animations"""
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """runs all keyframes with passed deadline; returns the amount of keyframes run"""
+        now = self._clock() if now is None else now
+        ran: int = 0
+        self._drop_cancelled()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name, _, action = heapq.heappop(self._heap)
+            self._remaining[name] -= 1
+            if not self._remaining[name]:
+                del self._remaining[name]
+            action()
+            ran += 1
+            self._drop_cancelled()
+        return ran
+
+    def _drop_cancelled(self) -> None:
+        """pops cancelled keyframes from the top of the heap"""
+        while self._heap:
+            _, _, name, generation, _ = self._heap[0]
+            if name in self._remaining and generation == self._generations.get(name, 0):
+                return
+            heapq.heappop(self._heap)
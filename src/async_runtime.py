@@ -0,0 +1,137 @@
+"""
+- asyncio runtime of the game: simulation ticks, rendering and the tk event pump are cooperating tasks on one loop
+- blocking i/o (leaderboard inserts, recordings, chrome traces) runs in a thread pool executor and is awaited there;
+  frames never wait for the disk
+- the loop idles in asyncio.sleep until the next tick is due; no task spins
+- usage:
+    python3 run.py --runtime asyncio
+"""
+from src.main import Game, MAX_FRAME_TIME
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, Set
+import asyncio
+import time
+
+
+class AsyncRuntime:
+    """
+    - runs the runs of a Game on an asyncio event loop instead of the synchronous loop of Game.run
+    - tick task: fixed timestep like Game.run; catches up with all due ticks and signals the render task
+    - render task: draws once per signalled frame; several ticks between two frames are drawn only once
+    - pump task: handles tk events like key presses when no frame was drawn since its last run
+    - animations still running at the end of a run, like the explosion, are rendered while the run is saved
+    - io() awaits blocking calls in the executor; submit() starts them without waiting, e.g. from key callbacks
+    - highscore updates on level ups stay inline: the write-behind db only caches them for its writer thread
+    """
+    def __init__(self, game: Game, executor: Optional[Executor] = None) -> None:
+        self.game: Game = game
+        # one worker keeps the i/o in the order it was submitted, e.g. the leaderboard insert after the recording
+        self._executor: Executor = executor if executor is not None else ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="game-io"
+        )
+        # submitted i/o not finished yet; awaited at the end of every run
+        self._pending: Set[asyncio.Future] = set()
+        self._frame_due: Optional[asyncio.Event] = None
+        # frames drawn in the current run; the pump task skips while frames are drawn
+        self.frames: int = 0
+
+    def run(self) -> None:
+        """plays one run of the game on a new event loop until the game ends; blocks like Game.run"""
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        """plays one run with tick, render and pump task and awaits the i/o of the finished run"""
+        self._frame_due = asyncio.Event()
+        self.frames = 0
+        render: asyncio.Task = asyncio.create_task(self._render_frames())
+        pump: asyncio.Task = asyncio.create_task(self._pump_events())
+        try:
+            await self._run_ticks()
+        finally:
+            render.cancel()
+            pump.cancel()
+            await asyncio.gather(render, pump, return_exceptions=True)
+        # last frame, e.g. the explosion of the collision; shown while the run is saved
+        self.game._render()
+        saving: asyncio.Task = asyncio.create_task(self._save_run())
+        await self._finish_animations()
+        await saving
+        await self.drain()
+
+    async def io(self, function: Callable, *args: Any) -> Any:
+        """runs a blocking call in the executor and awaits its result"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args))
+
+    def submit(self, function: Callable, *args: Any) -> asyncio.Future:
+        """starts a blocking call in the executor without waiting for it; needs a running event loop"""
+        future: asyncio.Future = asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def offload(self, function: Callable) -> Callable:
+        """wraps a blocking callback to run in the executor while the loop runs; called directly otherwise"""
+        def handler() -> None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                function()
+                return
+            self.submit(function)
+        return handler
+
+    async def drain(self) -> None:
+        """awaits all submitted i/o"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def close(self) -> None:
+        """waits for the executor to finish and shuts it down on game exit"""
+        self._executor.shutdown(wait=True)
+
+    async def _run_ticks(self) -> None:
+        """fixed timestep loop of Game.run; sleeps on the event loop until the next tick is due"""
+        game: Game = self.game
+        accumulator: float = 0.0
+        previous_time: float = time.perf_counter()
+        while game.running:
+            current_time: float = time.perf_counter()
+            frame_time: float = current_time - previous_time
+            accumulator += min(frame_time, MAX_FRAME_TIME)
+            previous_time = current_time
+            if accumulator >= game.tick_duration:
+                accumulator = game._catch_up(accumulator, frame_time)
+                self._frame_due.set()
+            await asyncio.sleep(max(0.0, game.tick_duration - accumulator))
+
+    async def _render_frames(self) -> None:
+        """draws a frame whenever ticks ran since the last one"""
+        while True:
+            await self._frame_due.wait()
+            self._frame_due.clear()
+            self.game._render()
+            self.frames += 1
+
+    async def _pump_events(self) -> None:
+        """handles tk events once per tick duration unless a frame was drawn meanwhile; drawing handles them too"""
+        while True:
+            frames: int = self.frames
+            await asyncio.sleep(self.game.tick_duration)
+            if self.frames == frames:
+                self.game.screen.process_events()
+
+    async def _save_run(self) -> None:
+        """i/o of the finished run in the order of Game.run"""
+        await self.io(self.game._save_recording)
+        await self.io(self.game._save_run)
+        await self.io(self.game._export_trace)
+
+    async def _finish_animations(self) -> None:
+        """renders frames until running animations like the explosion are done; the loop sleeps in between"""
+        game: Game = self.game
+        while game.animations.running:
+            game._render()
+            deadline: Optional[float] = game.animations.next_deadline
+            if deadline is not None:
+                await asyncio.sleep(min(game.tick_duration, max(0.0, deadline - time.perf_counter())))
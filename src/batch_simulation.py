@@ -0,0 +1,270 @@
+"""
+- lockstep simulator advancing thousands of independent games with one set of array operations per tick
+- block state of all games lives in padded numpy arrays of shape (games, max_blocks); empty slots hold x = -inf
+- player moves, block moves, spawns, wrecks, collisions and level ups are computed for all games at once
+- crashed games are reset independently at the end of the tick; the other games keep running
+- rules are the ones of Simulation; the games draw from one numpy generator, so runs are not identical to Simulation
+- usage:
+    python3 -m src.batch_simulation --games 4096 --steps 2000
+"""
+from src.simulation import HeadlessScreen, BLOCK_WIDTH, BLOCK_HEIGHT
+from src.difficulty import DifficultySchedule
+from src.helpers import OVERLAP_MARGIN
+from typing import Dict, Optional
+import argparse
+import time
+import numpy as np
+
+# action codes per game passed to step(); same movements as the key names "Up", "Down", "Right", "Left"
+NO_ACTION: int = 0
+UP: int = 1
+DOWN: int = 2
+RIGHT: int = 3
+LEFT: int = 4
+ACTION_CODES: Dict[Optional[str], int] = {None: NO_ACTION, "Up": UP, "Down": DOWN, "Right": RIGHT, "Left": LEFT}
+# initial amount of block slots per game; doubles on demand like the arrays of ArrayBlockManager
+INITIAL_MAX_BLOCKS: int = 64
+# x-coordinate of empty slots; never overlaps with the player and stays -inf when moved
+EMPTY_X: float = -np.inf
+# dtype of the block coordinates; single precision halves the memory traffic of the per-tick passes
+COORDINATE_DTYPE = np.float32
+
+
+class BatchSimulation:
+    """
+    - runs games independent games of the Simulation rules in lockstep; game i is row i of every array
+    - player: x / y per game; blocks: x / y per game and slot; difficulty parameters and level per game
+    - one call of step() equals one call of Simulation.step() for every game
+    - wrecked blocks are not removed: they move on behind the wrecking coordinate and their slot counts as free
+    - spawns only touch the rows of the games spawning in this tick; all other work is a few passes over the arrays
+    """
+    def __init__(
+        self,
+        games: int,
+        seed: Optional[int] = None,
+        schedule: Optional[DifficultySchedule] = None,
+        screen: Optional[HeadlessScreen] = None,
+        max_blocks: int = INITIAL_MAX_BLOCKS,
+        start_x: int = 0,
+        start_y: int = -265,
+        player_width: int = 15,
+        player_height: int = 30,
+        move_distance: int = 10
+    ) -> None:
+        self.games: int = games
+        self.schedule: DifficultySchedule = schedule if schedule is not None else DifficultySchedule()
+        self.screen = screen if screen is not None else HeadlessScreen()
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.start_x: int = start_x
+        self.start_y: int = start_y
+        self.move_distance: int = move_distance
+        screen = self.screen
+        self.x_genesis_cor: int = int((screen.width / 2) + 20)
+        self.x_wrecking_cor: int = int(-(screen.width / 2) - 20)
+        self.goal_y: int = screen.top_boundary + 10
+        # movement limits of the player; same checks as HeadlessPlayer
+        self.min_y: float = screen.bottom_boundary + (player_height / 2)
+        self.min_x: float = screen.left_boundary + (player_width / 2)
+        self.max_x: float = screen.right_boundary - (player_width / 2)
+        # possible y-coordinates of blocks: range(lane_bottom, lane_top, int(y_gap)) like create_block_batch
+        self.lane_bottom: int = screen.bottom_boundary + 12
+        self.lane_top: int = screen.top_boundary - 12
+        # max. center distances of overlapping player and block boxes; same boxes as check_collision_vectorized
+        self.overlap_x: float = BLOCK_WIDTH / 2 + player_width / 2 - OVERLAP_MARGIN
+        self.overlap_y: float = BLOCK_HEIGHT / 2 + player_height / 2 - OVERLAP_MARGIN
+        # per game state
+        self.player_x: np.ndarray = np.full(games, start_x, dtype=np.int64)
+        self.player_y: np.ndarray = np.full(games, start_y, dtype=np.int64)
+        self.level: np.ndarray = np.ones(games, dtype=np.int64)
+        self.ticks: np.ndarray = np.zeros(games, dtype=np.int64)
+        self.distance: np.ndarray = np.empty(games, dtype=np.float64)
+        self.block_batch_max: np.ndarray = np.empty(games, dtype=np.int64)
+        self.block_batch_min: np.ndarray = np.empty(games, dtype=np.int64)
+        self.block_batch_x_gap: np.ndarray = np.empty(games, dtype=np.float64)
+        self.block_batch_y_gap: np.ndarray = np.empty(games, dtype=np.float64)
+        # x-coordinate of the rightmost block per game; all blocks move equally, so it is the newest batch
+        self.rightmost: np.ndarray = np.full(games, EMPTY_X)
+        # per game and slot state
+        self.block_x: np.ndarray = np.full((games, max_blocks), EMPTY_X, dtype=COORDINATE_DTYPE)
+        self.block_y: np.ndarray = np.zeros((games, max_blocks), dtype=COORDINATE_DTYPE)
+        # crash flags of the last step and the level the crashed games reached before their reset
+        self.crashed: np.ndarray = np.zeros(games, dtype=bool)
+        self.final_level: np.ndarray = np.zeros(games, dtype=np.int64)
+        # finished games over all steps, e.g. for averages of the reached level
+        self.episodes: int = 0
+        self.episode_levels: int = 0
+        # scratch buffers of the collision check; allocated once and reused on every step
+        self._distances: np.ndarray = np.empty((games, max_blocks), dtype=COORDINATE_DTYPE)
+        self._overlap: np.ndarray = np.empty((games, max_blocks), dtype=bool)
+        self._overlap_y: np.ndarray = np.empty((games, max_blocks), dtype=bool)
+        self._reset_games(np.ones(games, dtype=bool))
+
+    @property
+    def max_blocks(self) -> int:
+        """amount of block slots per game"""
+        return self.block_x.shape[1]
+
+    def block_counts(self) -> np.ndarray:
+        """amount of blocks on screen per game; blocks behind the wrecking coordinate are not counted"""
+        return np.count_nonzero(self.block_x >= self.x_wrecking_cor, axis=1)
+
+    def _grow(self, required: int) -> None:
+        """doubles the block slots of all games until the required amount fits in"""
+        max_blocks: int = self.max_blocks
+        while max_blocks < required:
+            max_blocks *= 2
+        extra: int = max_blocks - self.max_blocks
+        self.block_x = np.concatenate(
+            [self.block_x, np.full((self.games, extra), EMPTY_X, dtype=COORDINATE_DTYPE)], axis=1
+        )
+        self.block_y = np.concatenate([self.block_y, np.zeros((self.games, extra), dtype=COORDINATE_DTYPE)], axis=1)
+        self._distances = np.empty((self.games, max_blocks), dtype=COORDINATE_DTYPE)
+        self._overlap = np.empty((self.games, max_blocks), dtype=bool)
+        self._overlap_y = np.empty((self.games, max_blocks), dtype=bool)
+
+    def _spawn(self, spawning: np.ndarray) -> None:
+        """
+        - adds a block batch to the delivered games with the rules of create_block_batch
+        - amount per game is a randint between min and max, capped at the amount of possible y-coordinates
+        - y-coordinates are sampled without duplicates by sorting one random key per possible y-coordinate
+        - the blocks are written into the first free slots of every game
+        """
+        rows: np.ndarray = np.flatnonzero(spawning)
+        if not len(rows):
+            return
+        steps: np.ndarray = np.maximum(self.block_batch_y_gap[rows].astype(np.int64), 1)
+        lanes: np.ndarray = -(-(self.lane_top - self.lane_bottom) // steps)
+        amounts: np.ndarray = np.minimum(
+            self.rng.integers(self.block_batch_min[rows], self.block_batch_max[rows], endpoint=True), lanes
+        )
+        batch: int = int(amounts.max())
+        if batch <= 0:
+            return
+        keys: np.ndarray = self.rng.random((len(rows), int(lanes.max())))
+        # lanes beyond the possible y-coordinates of a game are sorted to the end and never drawn
+        keys[np.arange(keys.shape[1]) >= lanes[:, None]] = 2.0
+        drawn_lanes: np.ndarray = np.argsort(keys, axis=1)[:, :batch]
+        ys: np.ndarray = self.lane_bottom + drawn_lanes * steps[:, None]
+        free: np.ndarray = self.block_x[rows] < self.x_wrecking_cor
+        required: int = int(np.max(self.max_blocks - free.sum(axis=1) + amounts))
+        if required > self.max_blocks:
+            self._grow(required)
+            free = self.block_x[rows] < self.x_wrecking_cor
+        # stable sort of "not free" delivers the indices of the free slots first
+        slots: np.ndarray = np.argsort(~free, axis=1, kind="stable")[:, :batch]
+        used: np.ndarray = np.arange(batch) < amounts[:, None]
+        target_rows: np.ndarray = np.broadcast_to(rows[:, None], slots.shape)[used]
+        self.block_x[target_rows, slots[used]] = self.x_genesis_cor
+        self.block_y[target_rows, slots[used]] = ys[used]
+        self.rightmost[rows[amounts > 0]] = self.x_genesis_cor
+
+    def _reset_games(self, games: np.ndarray) -> None:
+        """resets the delivered games like Simulation.reset: empty road, start values and a first block batch"""
+        schedule: DifficultySchedule = self.schedule
+        self.block_x[games] = EMPTY_X
+        self.rightmost[games] = EMPTY_X
+        self.player_x[games] = self.start_x
+        self.player_y[games] = self.start_y
+        self.level[games] = 1
+        self.ticks[games] = 0
+        self.distance[games] = schedule.distance
+        self.block_batch_max[games] = schedule.block_batch_max
+        self.block_batch_min[games] = schedule.block_batch_min
+        self.block_batch_x_gap[games] = schedule.block_batch_x_gap
+        self.block_batch_y_gap[games] = schedule.block_batch_y_gap
+        self._spawn(games)
+
+    def _level_up(self, games: np.ndarray) -> None:
+        """increases level, puts the player back to start and increases difficulty for the delivered games"""
+        schedule: DifficultySchedule = self.schedule
+        self.level[games] += 1
+        self.player_x[games] = self.start_x
+        self.player_y[games] = self.start_y
+        self.distance[games] /= schedule.speed_factor
+        level: np.ndarray = self.level
+        self.block_batch_max[games & (level >= schedule.batch_max_level)] += schedule.batch_max_step
+        gap: np.ndarray = games & (level >= schedule.gap_level)
+        self.block_batch_x_gap[gap] *= schedule.gap_factor
+        self.block_batch_y_gap[gap] *= schedule.gap_factor
+        self.block_batch_min[games & (level >= schedule.batch_min_level)] += schedule.batch_min_step
+
+    def _move_players(self, actions: np.ndarray) -> None:
+        """moves the players of all games; blocked moves are dropped with the same boundary checks as the player"""
+        step: int = self.move_distance
+        x, y = self.player_x, self.player_y
+        y += np.where(actions == UP, step, 0)
+        y -= np.where((actions == DOWN) & (y - step >= self.min_y), step, 0)
+        x += np.where((actions == RIGHT) & (x + step <= self.max_x), step, 0)
+        x -= np.where((actions == LEFT) & (x - step >= self.min_x), step, 0)
+
+    def _collisions(self) -> np.ndarray:
+        """bounding box collision of every player against all blocks of its game; empty slots never overlap"""
+        distances, overlap, overlap_y = self._distances, self._overlap, self._overlap_y
+        np.subtract(self.block_x, self.player_x.astype(COORDINATE_DTYPE)[:, None], out=distances)
+        np.abs(distances, out=distances)
+        np.less(distances, self.overlap_x, out=overlap)
+        np.subtract(self.block_y, self.player_y.astype(COORDINATE_DTYPE)[:, None], out=distances)
+        np.abs(distances, out=distances)
+        np.less(distances, self.overlap_y, out=overlap_y)
+        overlap &= overlap_y
+        return overlap.any(axis=1)
+
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        - advances all games by one tick; actions is an int array with one action code per game or None
+        - same order as Simulation.step: act, update blocks, check collision, check goal
+        - crashed games are reset right away; returns the crash flags of this tick (overwritten by the next step)
+        """
+        if actions is not None:
+            self._move_players(actions)
+        self.ticks += 1
+        # move blocks; wrecked blocks and empty slots keep moving left, which keeps them free
+        distance: np.ndarray = self.distance
+        self.block_x -= distance.astype(COORDINATE_DTYPE)[:, None]
+        self.rightmost -= distance
+        self._spawn(self.rightmost < self.x_genesis_cor - self.block_batch_x_gap)
+        crashed: np.ndarray = self._collisions()
+        reached_goal: np.ndarray = (self.player_y > self.goal_y) & ~crashed
+        if reached_goal.any():
+            self._level_up(reached_goal)
+        self.crashed[:] = crashed
+        if crashed.any():
+            self.final_level[crashed] = self.level[crashed]
+            self.episodes += int(crashed.sum())
+            self.episode_levels += int(self.level[crashed].sum())
+            self._reset_games(crashed)
+        return self.crashed
+
+
+def benchmark(games: int = 4096, steps: int = 2000, seed: int = 0) -> float:
+    """
+    - runs games in lockstep for steps ticks with random key presses and returns the game-steps per second
+    - the actions are drawn up front, so only the simulation itself is timed
+    """
+    simulation: BatchSimulation = BatchSimulation(games, seed=seed)
+    rng: np.random.Generator = np.random.default_rng(seed)
+    # mostly no key, some up and a few sideways / down presses like a player pressing keys every few ticks
+    actions: np.ndarray = rng.choice(
+        np.array([NO_ACTION, UP, DOWN, RIGHT, LEFT], dtype=np.int64), size=(steps, games),
+        p=[0.8, 0.12, 0.02, 0.03, 0.03]
+    )
+    start: float = time.perf_counter()
+    for tick in range(steps):
+        simulation.step(actions[tick])
+    elapsed: float = time.perf_counter() - start
+    return games * steps / elapsed
+
+
+def main() -> None:
+    """command line entry point measuring the throughput on one core"""
+    parser = argparse.ArgumentParser(description="measure the lockstep simulator of Road Rage Royal")
+    parser.add_argument("--games", type=int, default=4096, help="games simulated in lockstep (default 4096)")
+    parser.add_argument("--steps", type=int, default=2000, help="ticks per game (default 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generator (default 0)")
+    args = parser.parse_args()
+    throughput: float = benchmark(args.games, args.steps, args.seed)
+    print(f"{args.games} games x {args.steps} steps: {throughput / 1e6:.2f} M game-steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+- benchmark suite for the per-frame hot path of the game
+- plays levels 1-50 with the real increase_difficulty schedule and measures every phase of a tick separately
+- headless: ArrayBlockManager.update_blocks and check_collision of the solvable Simulation
+- display: BlockManager.update_blocks, BlockManager.check_collision, GameScreen.update_screen and
+  Scoreboard.increase_level on a real turtle screen
+- both spawn their batches through a SpawnGenerator like Game; its next_batch calls are measured as extra phase
+- display: start-up phases of a cold start (import, window, shapes, first frame) in a fresh interpreter
+- results are written as json to compare them between versions and catch frame time and start-up regressions
+"""
+from src.simulation import Simulation
+from src.spawn_generator import SpawnGenerator
+from random import Random
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+# version of the json result layout
+RESULT_VERSION: int = 1
+# percentiles reported per phase
+PERCENTILES: List[int] = [50, 90, 99]
+# duration of one tick of Game at 50 ticks per second; spawning a batch has to stay well below it
+FRAME_BUDGET_US: float = 1e6 / 50
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """delivers mean, percentiles and max of the delivered timings in microseconds"""
+    if not samples_ns:
+        return {}
+    ordered: List[int] = sorted(samples_ns)
+    summary: Dict[str, float] = {"mean_us": sum(ordered) / len(ordered) / 1000}
+    for percentile in PERCENTILES:
+        index: int = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        summary[f"p{percentile}_us"] = ordered[index] / 1000
+    summary["max_us"] = ordered[-1] / 1000
+    return summary
+
+
+def _timed(phase: Callable, samples: List[int]) -> None:
+    """executes the phase and appends its duration in ns to the samples"""
+    start: int = time.perf_counter_ns()
+    phase()
+    samples.append(time.perf_counter_ns() - start)
+
+
+def _time_spawns(spawner: SpawnGenerator, samples: List[int]) -> None:
+    """replaces next_batch of the spawner by a wrapper appending the duration of every call in ns to the samples"""
+    next_batch: Callable = spawner.next_batch
+
+    def timed_next_batch(*parameters):
+        start: int = time.perf_counter_ns()
+        batch = next_batch(*parameters)
+        samples.append(time.perf_counter_ns() - start)
+        return batch
+    spawner.next_batch = timed_next_batch
+
+
+def _level_result(phases: Dict[str, List[int]], tick_phases: List[str], ticks: int, blocks: int) -> Dict:
+    """ticks per second based on the summed tick phases and the summaries of all phases of one level"""
+    tick_time_ns: int = sum(sum(phases[phase]) for phase in tick_phases)
+    return {
+        "ticks_per_second": ticks / (tick_time_ns / 1e9) if tick_time_ns else 0.0,
+        "blocks": blocks,
+        "phases": {phase: summarize(samples) for phase, samples in phases.items() if samples}
+    }
+
+
+def bench_headless(levels: int = 50, ticks: int = 200, warmup: int = 100, seed: int = 0) -> Dict:
+    """
+    - benchmarks the headless simulation; player is parked at y=0 so collision checks look at crowded lanes
+    - batches come from the spawn generator like in Game; next_batch is timed during warmup and measured ticks, so
+      the lookahead refill after the level up is part of it; it is included in update_blocks as well
+    - collisions are measured but never end the benchmark
+    """
+    simulation: Simulation = Simulation(seed=seed, solvable=True)
+    simulation.player.y = 0
+    spawns: List[int] = []
+    _time_spawns(simulation.blocks.spawner, spawns)
+    results: Dict[str, Dict] = {}
+    for level in range(1, levels + 1):
+        spawns.clear()
+        if level > 1:
+            simulation.blocks.increase_difficulty(level)
+        for _ in range(warmup):
+            simulation.blocks.update_blocks()
+        phases: Dict[str, List[int]] = {"update_blocks": [], "check_collision": [], "next_batch": spawns}
+        for _ in range(ticks):
+            _timed(simulation.blocks.update_blocks, phases["update_blocks"])
+            _timed(lambda: simulation.blocks.check_collision(simulation.player), phases["check_collision"])
+        results[str(level)] = _level_result(phases, ["update_blocks", "check_collision"], ticks, simulation.blocks.count)
+    return results
+
+
+def bench_display(
+    levels: int = 50,
+    ticks: int = 200,
+    warmup: int = 100,
+    seed: int = 0,
+    compound_batches: bool = False
+) -> Dict:
+    """
+    - benchmarks the turtle based game objects on a real screen; raises tkinter.TclError without display
+    - compound_batches draws every block batch with one compound shape turtle like Game(compound_batches=True)
+    - batches come from the spawn generator like in Game; next_batch is timed like in bench_headless
+    - screen updates are part of the tick; level ups are measured once per level with Scoreboard.increase_level
+    """
+    # imported here; the turtle modules are only needed when a display is benchmarked
+    from src.screen import GameScreen
+    from src.player import Player
+    from src.block_manager import BlockManager
+    from src.scoreboard import Scoreboard
+    screen = GameScreen()
+    player = Player(screen)
+    # move the player from start to y=-5 with its own movement method so collision checks look at crowded lanes
+    while player.get_ycor() < -10:
+        player.move_up()
+    rng: Random = Random(seed)
+    spawner: SpawnGenerator = SpawnGenerator(screen, rng, player=player)
+    spawns: List[int] = []
+    _time_spawns(spawner, spawns)
+    blocks = BlockManager(screen, compound_batches=compound_batches, rng=rng, spawner=spawner)
+    scoreboard = Scoreboard()
+    results: Dict[str, Dict] = {}
+    for level in range(1, levels + 1):
+        spawns.clear()
+        phases: Dict[str, List[int]] = {
+            "update_blocks": [], "check_collision": [], "update_screen": [], "increase_level": [], "next_batch": spawns
+        }
+        if level > 1:
+            _timed(scoreboard.increase_level, phases["increase_level"])
+            blocks.increase_difficulty(level)
+        for _ in range(warmup):
+            blocks.update_blocks()
+        for _ in range(ticks):
+            _timed(blocks.update_blocks, phases["update_blocks"])
+            _timed(lambda: blocks.check_collision(player), phases["check_collision"])
+            _timed(screen.update_screen, phases["update_screen"])
+        tick_phases: List[str] = ["update_blocks", "check_collision", "update_screen"]
+        results[str(level)] = _level_result(phases, tick_phases, ticks, len(blocks.block_container))
+    return results
+
+
+def bench_startup(renderer: str = "turtle") -> Dict[str, float]:
+    """
+    - measures the start-up phases with src.startup in a fresh interpreter, so imports are really cold
+    - raises subprocess.CalledProcessError without display
+    """
+    output: str = subprocess.run(
+        [sys.executable, "-m", "src.startup", "--renderer", renderer, "--json"],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def run_benchmarks(
+    levels: int = 50,
+    ticks: int = 200,
+    warmup: int = 100,
+    seed: int = 0,
+    display: bool = True,
+    compound_batches: bool = False
+) -> Dict:
+    """runs the headless and optionally the display benchmark; a missing display is noted in the result"""
+    result: Dict = {
+        "version": RESULT_VERSION,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {
+            "levels": levels, "ticks": ticks, "warmup": warmup, "seed": seed, "compound_batches": compound_batches
+        },
+        "headless": bench_headless(levels, ticks, warmup, seed),
+        "display": None,
+        "startup": None
+    }
+    if display:
+        try:
+            result["display"] = bench_display(levels, ticks, warmup, seed, compound_batches)
+            result["startup"] = bench_startup()
+        except Exception as e:
+            # tkinter.TclError without display; kept generic since tkinter itself may be missing
+            result["display_error"] = str(e)
+    return result
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[str]:
+    """
+    - compares the mean tick rate per mode and level and the total start-up time of two results
+    - returns a message for every level running slower and a start-up taking longer than the baseline by more than
+      the threshold fraction
+    """
+    regressions: List[str] = []
+    for mode in ("headless", "display"):
+        if not baseline.get(mode) or not current.get(mode):
+            continue
+        for level, old in baseline[mode].items():
+            new: Optional[Dict] = current[mode].get(level)
+            if new is None or not old["ticks_per_second"]:
+                continue
+            ratio: float = new["ticks_per_second"] / old["ticks_per_second"]
+            if ratio < 1 - threshold:
+                regressions.append(
+                    f"{mode} level {level}: {new['ticks_per_second']:.0f} ticks/s "
+                    f"vs. {old['ticks_per_second']:.0f} ticks/s ({ratio:.0%})"
+                )
+    if baseline.get("startup") and current.get("startup") and baseline["startup"]["total"]:
+        ratio = current["startup"]["total"] / baseline["startup"]["total"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"startup: {current['startup']['total'] * 1000:.0f} ms "
+                f"vs. {baseline['startup']['total'] * 1000:.0f} ms ({ratio:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    """command line entry point; writes the json result and optionally compares it with a baseline"""
+    parser = argparse.ArgumentParser(description="benchmark the per-frame hot path of Road Rage Royal")
+    parser.add_argument("--levels", type=int, default=50, help="amount of levels to play (default 50)")
+    parser.add_argument("--ticks", type=int, default=200, help="measured ticks per level (default 200)")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured ticks per level (default 100)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the block batches (default 0)")
+    parser.add_argument("--no-display", action="store_true", help="skip the turtle screen benchmark")
+    parser.add_argument(
+        "--compound-batches", action="store_true", help="draw every block batch with one turtle in the display benchmark"
+    )
+    parser.add_argument("--output", default="bench.json", help="json result file (default bench.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="json result of an older version to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="tolerated slowdown fraction (default 0.1)")
+    args = parser.parse_args()
+    result: Dict = run_benchmarks(
+        args.levels, args.ticks, args.warmup, args.seed, not args.no_display, args.compound_batches
+    )
+    with open(args.output, "w") as file:
+        json.dump(result, file, indent=2)
+    for mode in ("headless", "display"):
+        if result.get(mode):
+            rates: List[float] = [level["ticks_per_second"] for level in result[mode].values()]
+            print(f"{mode}: {min(rates):.0f} - {max(rates):.0f} ticks/s over {len(rates)} levels")
+    for mode in ("headless", "display"):
+        if result.get(mode):
+            slowest: float = max(
+                level["phases"].get("next_batch", {}).get("max_us", 0.0) for level in result[mode].values()
+            )
+            print(f"{mode}: next_batch max {slowest / 1000:.2f} ms of {FRAME_BUDGET_US / 1000:.0f} ms frame budget")
+    if result.get("startup"):
+        print(f"startup: {result['startup']['total'] * 1000:.0f} ms until the first frame")
+    if "display_error" in result:
+        print(f"display benchmark skipped: {result['display_error']}")
+    if args.compare:
+        with open(args.compare) as file:
+            regressions: List[str] = compare(json.load(file), result, args.threshold)
+        for message in regressions:
+            print(f"regression: {message}")
+        if regressions:
+            sys.exit(1)
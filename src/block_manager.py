@@ -1,25 +1,51 @@
 from src.screen import GameScreen
-from src.helpers import random_color, create_block_batch
-from typing import List, Tuple
+from src.helpers import random_color, create_block_batch, check_collision, swept_collision_time
+from src.lane_index import LaneIndex
+from src.difficulty import DifficultySchedule
+from src.spawn_generator import SpawnGenerator
+from src.simulation import INITIAL_CAPACITY
+from typing import Dict, Iterator, List, Optional, Tuple
 from turtle import Turtle
-# importing the module single to be able to change color mode on module level to rgb
-import turtle
-turtle.colormode(255)
+from random import Random
+import numpy as np
 
 
 class Block:
-    """represents a single block moving over the screen"""
-    def __init__(self, x: int, y: int, shape: str = "square"):
-        self._turtle = Turtle(shape)
-        self._turtle.penup()
-        # stretch it to size 40x20 px as rectangle
-        self._turtle.shapesize(stretch_wid=1, stretch_len=2)
+    """
+    - represents a single block moving over the screen
+    - optionally takes a hidden turtle from the BlockManager turtle pool, which is re-colored and repositioned
+    """
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        shape: str = "square",
+        turtle_obj: Optional[Turtle] = None,
+        rng: Optional[Random] = None
+    ):
+        if turtle_obj is None:
+            turtle_obj = Block.create_turtle(shape)
+        self._turtle = turtle_obj
+        # cache the size in px; stretch * 20px; prevents calling shapesize() on every collision check
+        self._width: float = 2 * 20
+        self._height: float = 1 * 20
         # retrieving random rgb colors from helpers.py
-        self._turtle.color(random_color())
+        self._turtle.color(random_color(rng))
         self._turtle.goto(x, y)
+        self._turtle.showturtle()
+
+    @staticmethod
+    def create_turtle(shape: str = "square") -> Turtle:
+        """creates a hidden turtle stretched to the block size of 40x20 px as rectangle; without undo history"""
+        new_turtle: Turtle = Turtle(shape, undobuffersize=0, visible=False)
+        # colors are rgb tuples; set on the screen of the turtle instead of on import to not open a window on import
+        new_turtle.screen.colormode(255)
+        new_turtle.penup()
+        new_turtle.shapesize(stretch_wid=1, stretch_len=2)
+        return new_turtle
 
-    def move(self, distance: int) -> None:
-        """move from left to right by reducing x-coordinate by distance per frame"""
+    def move(self, distance: float) -> None:
+        """move from left to right by reducing x-coordinate by distance per tick"""
         new_x: float = self._turtle.xcor() - distance
         self._turtle.goto(new_x, self._turtle.ycor())
 
@@ -32,6 +58,11 @@ class Block:
         self._turtle.hideturtle()
         self._turtle.clear()
 
+    def recycle(self) -> Turtle:
+        """removes the block and hands its hidden turtle back to the callee for reuse by a new block"""
+        self.remove()
+        return self._turtle
+
     def get_xcor(self) -> float:
         """deliver the x-coordinate to outside class callees, since _turtle is private"""
         return self._turtle.xcor()
@@ -42,56 +73,195 @@ class Block:
 
     @property
     def get_width(self) -> float:
-        """returns the block's width based on its shapesize; stretch_len * 20px"""
-        return self._turtle.shapesize()[1] * 20
+        """returns the block's width cached from its shapesize; stretch_len * 20px"""
+        return self._width
 
     @property
     def get_height(self) -> float:
-        """returns the block's height based on its shapesize; stretch_wid * 20px"""
-        return self._turtle.shapesize()[0] * 20
+        """returns the block's height cached from its shapesize; stretch_wid * 20px"""
+        return self._height
+
+
+class BatchedBlock:
+    """
+    - single block within a BlockBatch; owns no turtle but answers the same coordinate queries as Block
+    - x-coordinate is shared with the batch turtle, y-coordinate is fixed per block
+    """
+    def __init__(self, batch: "BlockBatch", y: float) -> None:
+        self._batch = batch
+        self._y: float = y
+        self._width: float = 2 * 20
+        self._height: float = 1 * 20
+
+    def is_off_screen(self, x_wrecking_cor: int) -> bool:
+        """returns true if x-coordinate of the batch is smaller than x_wrecking_coordinate"""
+        return self._batch.is_off_screen(x_wrecking_cor)
+
+    def get_xcor(self) -> float:
+        """deliver the x-coordinate shared by all blocks of the batch"""
+        return self._batch.get_xcor()
+
+    def get_ycor(self) -> float:
+        """deliver the y-coordinate of the block"""
+        return self._y
+
+    @property
+    def get_width(self) -> float:
+        """returns the block's width; same as for Block"""
+        return self._width
+
+    @property
+    def get_height(self) -> float:
+        """returns the block's height; same as for Block"""
+        return self._height
+
+
+class BlockBatch:
+    """
+    - batch of blocks sharing one x-coordinate drawn by a single turtle with a compound shape
+    - compound shape holds one rectangle per block with its y-coordinate as offset and its own random color
+    - the turtle is placed on y=0, so moving the batch is a single goto instead of one per block
+    - optionally takes a hidden turtle from the BlockManager batch pool together with its shape name
+    """
+    def __init__(
+        self,
+        screen: GameScreen,
+        shape_name: str,
+        x: float,
+        y_coordinates: List[float],
+        turtle_obj: Optional[Turtle] = None,
+        rng: Optional[Random] = None
+    ) -> None:
+        self.shape_name: str = shape_name
+        self.blocks: List[BatchedBlock] = [BatchedBlock(self, y) for y in y_coordinates]
+        # turtle shape coordinates are rotated by the heading 0: shape (x, y) is drawn at screen (y, -x)
+        components: List[Tuple[Tuple, Tuple[int, int, int]]] = []
+        for block in self.blocks:
+            half_width, half_height = block.get_width / 2, block.get_height / 2
+            y: float = block.get_ycor()
+            polygon: Tuple = (
+                (-(y - half_height), -half_width),
+                (-(y - half_height), half_width),
+                (-(y + half_height), half_width),
+                (-(y + half_height), -half_width)
+            )
+            components.append((polygon, random_color(rng)))
+        screen.add_compound_shape(shape_name, components)
+        if turtle_obj is None:
+            turtle_obj = Turtle(undobuffersize=0, visible=False)
+            turtle_obj.penup()
+        self._turtle = turtle_obj
+        # (re)assigning the shape recreates the canvas items matching the amount of components
+        self._turtle.shape(shape_name)
+        self._turtle.goto(x, 0)
+        self._turtle.showturtle()
+
+    def move(self, distance: float) -> None:
+        """move all blocks of the batch from left to right at once by reducing x-coordinate by distance per tick"""
+        self._turtle.goto(self._turtle.xcor() - distance, 0)
+
+    def is_off_screen(self, x_wrecking_cor: int) -> bool:
+        """returns true if x-coordinate is smaller than x_wrecking_coordinate"""
+        return self._turtle.xcor() < x_wrecking_cor
+
+    def get_xcor(self) -> float:
+        """deliver the x-coordinate shared by all blocks of the batch"""
+        return self._turtle.xcor()
+
+    def recycle(self) -> Turtle:
+        """hides the batch and hands its turtle back to the callee for reuse by a new batch"""
+        self._turtle.hideturtle()
+        self._turtle.clear()
+        return self._turtle
 
 
 class BlockManager:
     """
     - core logic creating blocks, steering and removing them
-    - game iterations are dictated by screen updating, steered by the self.speed variable setting value for time.sleep
+    - game iterations are fixed simulation ticks; game speed is steered by self.distance in px per tick
     - every game iteration it is checked, if a new batch of blocks is generated
     - a batch of blocks is distributed non-overlapping along the y-axis with identical x-coordinate
     - multiple batches have a min. distance non-overlapping between them along the x-axis
     - block batches are generated at a defined genesis point at right side out of screen running from right to left
     - block batches going over the screen on the left side are wrecked
     - when player levels up difficulty increases by changing some params
+    - turtles of wrecked blocks are kept hidden in a pool and reused for new blocks instead of creating new turtles
+    - this way the amount of turtles registered at the screen is bound by the peak amount of blocks on screen
+    - coordinates and half extents of all blocks are cached in preallocated numpy arrays in block_container order;
+      wrecking and swept collision checks work on these arrays instead of asking every turtle
+    - blocks are additionally indexed by lane with x-ordered lists; the collision check only looks at the blocks in
+      the lanes and the x window of the player box, the spawn-gap check only at blocks right of the gap line
+    - optionally every batch is drawn by a single turtle with a compound shape (compound_batches=True)
+    - this way the Tk calls per tick scale with the amount of batches instead of the amount of blocks
+    - optionally batches come from a SpawnGenerator guaranteeing that the player can get through
     """
     def __init__(
         self,
         screen: GameScreen,
-        speed: float = 0.2,
-        distance: int = 5,
-        block_batch_max: int = 3,
-        block_batch_min: int = 0,
-        block_batch_x_gap: float = 80,
-        block_batch_y_gap: float = 25,
+        distance: Optional[float] = None,
+        block_batch_max: Optional[int] = None,
+        block_batch_min: Optional[int] = None,
+        block_batch_x_gap: Optional[float] = None,
+        block_batch_y_gap: Optional[float] = None,
+        turtle_pool_size: int = 24,
+        compound_batches: bool = False,
+        rng: Optional[Random] = None,
+        schedule: Optional[DifficultySchedule] = None,
+        spawner: Optional[SpawnGenerator] = None
     ) -> None:
         # screen object containing some relevant metadata, e.g. boundaries
         self.screen = screen
+        # optional seeded random generator for reproducible block batches and colors; global random module if none
+        self.rng: Optional[Random] = rng
+        # optional generator of batches the player can get through; create_block_batch if none
+        self.spawner: Optional[SpawnGenerator] = spawner
+        # start values and per-level changes of the parameters below; explicit arguments override the start values
+        self.schedule: DifficultySchedule = schedule if schedule is not None else DifficultySchedule()
+        schedule = self.schedule
         # central container with all instantiated block objects from block class
         self.block_container: List[Block] = []
-        # value for time.sleep in main game loop dictating game speed
-        self.speed: float = speed
-        # distance in px of every block moving forward one time
-        self.distance: int = distance
+        # distance in px of every block moving forward per simulation tick dictating game speed
+        # default 0.5px per tick at 50 ticks per second equals the former 5px per 0.2s frame
+        self.distance: float = distance if distance is not None else schedule.distance
         # value for upper boundary of new generated block batch; increases with game difficulty
-        self.block_batch_max: int = block_batch_max
+        self.block_batch_max: int = block_batch_max if block_batch_max is not None else schedule.block_batch_max
         # value for bottom boundary of new generated block batch; increases with game difficulty
-        self.block_batch_min: int = block_batch_min
+        self.block_batch_min: int = block_batch_min if block_batch_min is not None else schedule.block_batch_min
         # gap in px along x-axis between block batches
-        self.block_batch_x_gap: float = block_batch_x_gap
+        self.block_batch_x_gap: float = block_batch_x_gap if block_batch_x_gap is not None else schedule.block_batch_x_gap
         # gap in px along y-axis between single block within a batch
-        self.block_batch_y_gap: float = block_batch_y_gap
+        self.block_batch_y_gap: float = block_batch_y_gap if block_batch_y_gap is not None else schedule.block_batch_y_gap
         # genesis x cor for new block batches; beyond the screen on the right side
         self.x_genesis_cor: int = int((screen.width / 2) + 20)
         # block going beyond this x cor (out of screen) are wrecked
         self.x_wrecking_cor: int = int(-(screen.width / 2) - 20)
+        # cached coordinates and half extents of all blocks in block_container order for vectorized collision checks
+        # only the first len(self._array_blocks) slots are valid; the capacity doubles on demand
+        self._block_xs: np.ndarray = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self._block_ys: np.ndarray = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self._block_half_widths: np.ndarray = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self._block_half_heights: np.ndarray = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        # blocks of the valid array slots; differs from block_container only if it was changed from outside
+        self._array_blocks: List = []
+        # amount of blocks at the end of block_container added since the last move; they did not exist before this tick
+        self.spawned: int = 0
+        # spatial index mapping lanes (y-coordinates) to x-ordered blocks for collision and spawn-gap queries
+        self.lanes: LaneIndex = LaneIndex()
+        # draw every block batch with a single compound shape turtle instead of one turtle per block
+        self.compound_batches: bool = compound_batches
+        # active block batches; only used for compound batches
+        self._batches: List[BlockBatch] = []
+        # hidden turtles of removed blocks ready for reuse; pre-warmed to prevent turtle creation while playing
+        self._turtle_pool: List[Turtle] = []
+        # hidden batch turtles with their registered compound shape names ready for reuse
+        self._batch_pool: List[Tuple[str, Turtle]] = []
+        self._batch_shape_counter: int = 0
+        for _ in range(turtle_pool_size):
+            if compound_batches:
+                self._batch_pool.append((self._new_batch_shape_name(), Turtle(undobuffersize=0, visible=False)))
+                self._batch_pool[-1][1].penup()
+            else:
+                self._turtle_pool.append(Block.create_turtle())
         # add first batch of blocks on initiating blocks manager
         self.add_blocks()
 
@@ -103,60 +273,140 @@ class BlockManager:
         - if this distance / gap is big enough, the creation of a further block batch is triggered
         - this way the overlapping of blocks along the x-axis is prevented
         """
-        if (
-                not self.block_container
-                or max(block.get_xcor() for block in self.block_container) < self.x_genesis_cor - self.block_batch_x_gap
-        ):
-            block_batch: List[Tuple[int, int]] = create_block_batch(
+        gap_line: float = self.x_genesis_cor - self.block_batch_x_gap
+        self._sync_lanes()
+        # lane index delivers the blocks possibly right of the gap line; their exact x-coordinates decide, so rounding
+        # of the index keys may not shift the spawn tick
+        candidates: List = self.lanes.query(gap_line, float("inf"), float("-inf"), float("inf"))
+        if not any(block.get_xcor() >= gap_line for block in candidates):
+            block_batch: List[Tuple[int, int]] = self._next_batch()
+            self.render_blocks(block_batch)
+
+    def _next_batch(self) -> List[Tuple[int, int]]:
+        """coordinates of the next block batch from the spawner or create_block_batch"""
+        if self.spawner is not None:
+            return self.spawner.next_batch(
                 self.block_batch_min,
                 self.block_batch_max,
                 self.block_batch_y_gap,
-                self.x_genesis_cor,
-                self.screen
+                self.block_batch_x_gap,
+                self.distance
             )
-            self.render_blocks(block_batch)
+        return create_block_batch(
+            self.block_batch_min,
+            self.block_batch_max,
+            self.block_batch_y_gap,
+            self.x_genesis_cor,
+            self.screen,
+            self.rng
+        )
 
     def render_blocks(self, block_coordinates: List[Tuple[int, int]]) -> None:
-        """takes list of tuple block-coordinates as input; creates blocks as turtle objects for each tuple"""
-        for x, y in block_coordinates:
-            new_block: Block = Block(x, y)
+        """
+        - takes list of tuple block-coordinates as input; creates blocks as turtle objects for each tuple
+        - for compound batches one batch turtle is created per distinct x-coordinate instead
+        """
+        self._sync_collision_arrays()
+        new_blocks: List = []
+        batched_blocks: Optional[List[BatchedBlock]] = (
+            self._render_batches(block_coordinates) if self.compound_batches else None
+        )
+        for i, (x, y) in enumerate(block_coordinates):
+            if batched_blocks is not None:
+                new_block = batched_blocks[i]
+            else:
+                pooled_turtle: Optional[Turtle] = self._turtle_pool.pop() if self._turtle_pool else None
+                new_block = Block(x, y, turtle_obj=pooled_turtle, rng=self.rng)
             self.block_container.append(new_block)
+            new_blocks.append(new_block)
+            self.lanes.insert(x, y, new_block.get_width / 2, new_block.get_height / 2, new_block)
+        # write the new blocks into the free slots of the cached collision arrays
+        start, end = len(self._array_blocks), len(self._array_blocks) + len(new_blocks)
+        if end > len(self._block_xs):
+            self._grow(end)
+        self._block_xs[start:end] = [x for x, _ in block_coordinates]
+        self._block_ys[start:end] = [y for _, y in block_coordinates]
+        self._block_half_widths[start:end] = [block.get_width / 2 for block in new_blocks]
+        self._block_half_heights[start:end] = [block.get_height / 2 for block in new_blocks]
+        self._array_blocks.extend(new_blocks)
+        self.spawned += len(new_blocks)
+
+    def _render_batches(self, block_coordinates: List[Tuple[int, int]]) -> List[BatchedBlock]:
+        """creates one compound shape batch per distinct x-coordinate; returns its blocks in the order of the input"""
+        y_coordinates_per_x: Dict[float, List[float]] = {}
+        for x, y in block_coordinates:
+            y_coordinates_per_x.setdefault(x, []).append(y)
+        blocks_per_x: Dict[float, Iterator[BatchedBlock]] = {}
+        for x, y_coordinates in y_coordinates_per_x.items():
+            shape_name, turtle_obj = self._batch_pool.pop() if self._batch_pool else (self._new_batch_shape_name(), None)
+            batch: BlockBatch = BlockBatch(self.screen, shape_name, x, y_coordinates, turtle_obj, self.rng)
+            self._batches.append(batch)
+            blocks_per_x[x] = iter(batch.blocks)
+        return [next(blocks_per_x[x]) for x, _ in block_coordinates]
+
+    def _new_batch_shape_name(self) -> str:
+        """unique name for the compound shape of a new batch turtle; the name stays with the turtle when pooled"""
+        self._batch_shape_counter += 1
+        return f"block_batch_{id(self)}_{self._batch_shape_counter}"
 
     def move_blocks(self) -> None:
         """move all blocks in the car_container forward by reducing the x-coordinate"""
-        for block in self.block_container:
-            block.move(self.distance)
+        if self.compound_batches:
+            for batch in self._batches:
+                batch.move(self.distance)
+        else:
+            for block in self.block_container:
+                block.move(self.distance)
+        self._block_xs[:len(self._array_blocks)] -= self.distance
+        self.lanes.advance(self.distance)
+        self.spawned = 0
 
     def wreck_blocks(self) -> None:
         """delete all blocks crossing the left screen border; determined by the x-wrecking-coordinate as boundary"""
-        for block in self.block_container:
-            # check if blocks need to be wrecked due to crossing the left screen border
-            if block.is_off_screen(self.x_wrecking_cor):
-                block.remove()
-        # filter out blocks that are wrecked and rebuild the container
-        self.block_container = [block for block in self.block_container if not block.is_off_screen(self.x_wrecking_cor)]
+        # blocks crossing the left screen border are found on the cached x-coordinates in one array operation
+        block_xs: np.ndarray = self.collision_arrays()[0]
+        keep: np.ndarray = block_xs >= self.x_wrecking_cor
+        if keep.all():
+            return
+        for block, kept in zip(self.block_container, keep.tolist()):
+            if not kept:
+                self.lanes.remove(block.get_xcor(), block.get_ycor(), block)
+                if not self.compound_batches:
+                    self._turtle_pool.append(block.recycle())
+        # batches are wrecked as a whole since all their blocks share the x-coordinate
+        if self.compound_batches:
+            for batch in self._batches:
+                if batch.is_off_screen(self.x_wrecking_cor):
+                    self._batch_pool.append((batch.shape_name, batch.recycle()))
+            self._batches = [batch for batch in self._batches if not batch.is_off_screen(self.x_wrecking_cor)]
+        # filter out blocks that are wrecked and compact the container and the cached collision arrays
+        remaining: int = int(keep.sum())
+        for name in ("_block_xs", "_block_ys", "_block_half_widths", "_block_half_heights"):
+            array: np.ndarray = getattr(self, name)
+            array[:remaining] = array[:len(keep)][keep]
+        self.block_container = [block for block, kept in zip(self.block_container, keep.tolist()) if kept]
+        self._array_blocks = list(self.block_container)
 
     def reset(self) -> None:
-        """ delete all blocks and reset difficulty for game restart"""
-        for block in self.block_container:
-            block.remove()
+        """ delete all blocks and reset difficulty for game restart; turtles of the blocks go back into the pool"""
+        if self.compound_batches:
+            for batch in self._batches:
+                self._batch_pool.append((batch.shape_name, batch.recycle()))
+            self._batches.clear()
+        else:
+            for block in self.block_container:
+                self._turtle_pool.append(block.recycle())
         self.block_container.clear()
-        self.block_batch_max = 3
-        self.block_batch_min = 0
-        self.speed = 0.2
-        self.block_batch_x_gap = 80
-        self.block_batch_y_gap = 25
+        self.spawned = 0
+        self.lanes.clear()
+        self._rebuild_collision_arrays()
+        self.schedule.reset(self)
+        if self.spawner is not None:
+            self.spawner.reset()
 
     def increase_difficulty(self, level: int) -> None:
-        """ increase game difficulty when player levels up for delivered level"""
-        self.speed *= 0.95
-        if level >= 3:
-            self.block_batch_max += 1
-        if level >= 5:
-            self.block_batch_x_gap *= 0.95
-            self.block_batch_y_gap *= 0.95
-        if level >= 7:
-            self.block_batch_min += 1
+        """ increase game difficulty when player levels up for delivered level according to the schedule"""
+        self.schedule.increase(self, level)
 
     def update_blocks(self) -> None:
         """ wrapper for move, add and wreck blocks"""
@@ -164,3 +414,88 @@ class BlockManager:
         self.add_blocks()
         self.wreck_blocks()
 
+    @property
+    def count(self) -> int:
+        """amount of active blocks; same interface as ArrayBlockManager"""
+        return len(self.block_container)
+
+    @property
+    def turtle_count(self) -> int:
+        """amount of block turtles registered at the screen; active blocks / batches plus hidden turtles in the pools"""
+        if self.compound_batches:
+            return len(self._batches) + len(self._batch_pool)
+        return len(self.block_container) + len(self._turtle_pool)
+
+    def _grow(self, required: int) -> None:
+        """doubles the capacity of the cached collision arrays until the required amount of blocks fits in"""
+        capacity: int = len(self._block_xs)
+        while capacity < required:
+            capacity *= 2
+        count: int = len(self._array_blocks)
+        for name in ("_block_xs", "_block_ys", "_block_half_widths", "_block_half_heights"):
+            new: np.ndarray = np.zeros(capacity, dtype=np.float64)
+            new[:count] = getattr(self, name)[:count]
+            setattr(self, name, new)
+
+    def _rebuild_collision_arrays(self) -> None:
+        """rewrites the cached collision arrays from the block objects in block_container"""
+        count: int = len(self.block_container)
+        self._array_blocks = []
+        if count > len(self._block_xs):
+            self._grow(count)
+        self._block_xs[:count] = [block.get_xcor() for block in self.block_container]
+        self._block_ys[:count] = [block.get_ycor() for block in self.block_container]
+        self._block_half_widths[:count] = [block.get_width / 2 for block in self.block_container]
+        self._block_half_heights[:count] = [block.get_height / 2 for block in self.block_container]
+        self._array_blocks = list(self.block_container)
+
+    def _sync_collision_arrays(self) -> None:
+        """
+        - rebuilds the cached collision arrays if block_container was changed without the manager methods
+        - compares the blocks by identity, so a removal plus an add of the same amount is detected too
+        """
+        if self._array_blocks != self.block_container:
+            self._rebuild_collision_arrays()
+
+    def collision_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """delivers views on the cached x / y-coordinates and half widths / heights of all blocks"""
+        self._sync_collision_arrays()
+        count: int = len(self._array_blocks)
+        return (
+            self._block_xs[:count], self._block_ys[:count],
+            self._block_half_widths[:count], self._block_half_heights[:count]
+        )
+
+    def _sync_lanes(self) -> None:
+        """rebuilds the lane index from the block objects if block_container was changed without the manager methods"""
+        if self.lanes.size != len(self.block_container):
+            self.lanes.clear()
+            for block in self.block_container:
+                self.lanes.insert(block.get_xcor(), block.get_ycor(), block.get_width / 2, block.get_height / 2, block)
+
+    def blocks_near(self, x: float, y: float, half_width: float, half_height: float) -> List[Block]:
+        """
+        - delivers the blocks which can overlap the box around the center x / y with the given half extents
+        - only lanes overlapping the box and within a lane only blocks in the x window of the box are looked at
+        """
+        self._sync_lanes()
+        return self.lanes.query(x - half_width, x + half_width, y - half_height, y + half_height)
+
+    def check_collision(self, player) -> bool:
+        """
+        - bounding box collision of the player against the blocks near the player box; same results as ArrayBlockManager
+        - only the one or two lanes and the x window of the player box are looked at instead of all blocks
+        """
+        nearby: List[Block] = self.blocks_near(
+            player.get_xcor(), player.get_ycor(), player.get_width() / 2, player.get_height() / 2
+        )
+        return check_collision(player, nearby)
+
+    def swept_collision(self, player, player_dx: float, player_dy: float) -> Optional[float]:
+        """
+        - swept collision of the player against all blocks over the last tick; same interface as ArrayBlockManager
+        - blocks spawned after the move are only checked at their end positions
+        - returns the time of impact as fraction of the tick or none
+        """
+        moved: int = max(0, self.count - self.spawned)
+        return swept_collision_time(player, player_dx, player_dy, *self.collision_arrays(), -self.distance, moved=moved)
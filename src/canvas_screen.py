@@ -0,0 +1,176 @@
+from src.screen import SHAPE_PATHS, TEXT_ALIGNMENT, FONT_TYPE, FONT_STYLE
+from src.hud import CanvasLabel
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from tkinter import simpledialog
+import tkinter
+import time
+
+
+class CanvasScreen:
+    """
+    - alternative to GameScreen drawing straight onto a tk canvas without any turtle bookkeeping
+    - same size, boundaries, lines and descriptions as GameScreen; canvas uses the centered turtle coordinates
+    - draws the state of a HeadlessPlayer and an ArrayBlockManager which are registered with track()
+    - canvas items are created once and updated with coords / itemconfigure; block items are pooled and hidden
+    - updates are batched per frame: the state is synced in update_screen once, however many ticks ran before
+    """
+    def __init__(
+        self,
+        width: int = 600,
+        height: int = 600,
+        title: str = "ROAD RAGE ROYAL"
+    ) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.title: str = title
+        self.top_boundary: int = int((self.height / 2) - 50)
+        self.bottom_boundary: int = int(-(self.height / 2) + 60)
+        self.left_boundary: int = int(-(self.width / 2)) + 2
+        self.right_boundary: int = int(self.width / 2) - 4
+        # durations of the start-up phases in seconds; same phases as GameScreen.startup_times
+        self.startup_times: Dict[str, float] = {}
+        start: float = time.perf_counter()
+        self._root = tkinter.Tk()
+        self._root.title(title)
+        self._root.resizable(False, False)
+        self._canvas = tkinter.Canvas(self._root, width=width, height=height, bg="white", highlightthickness=0)
+        # origin in the center and y pointing down like the canvas of turtle; turtle y maps to canvas -y
+        self._canvas.configure(scrollregion=(-width / 2, -height / 2, width / 2, height / 2))
+        self._canvas.xview_moveto(0)
+        self._canvas.yview_moveto(0)
+        self._canvas.pack()
+        # gifs loaded once per shape path; tk images need to be referenced to stay alive
+        window_created: float = time.perf_counter()
+        self._images: Dict[str, tkinter.PhotoImage] = {}
+        for path in SHAPE_PATHS:
+            self._image(path)
+        shapes_registered: float = time.perf_counter()
+        self.draw_lines()
+        self.write_descriptions()
+        self.startup_times = {
+            "window": window_created - start,
+            "shapes": shapes_registered - window_created,
+            "decorations": time.perf_counter() - shapes_registered
+        }
+        # game objects drawn on every update; set by track()
+        self._player = None
+        self._blocks = None
+        self._player_item: Optional[int] = None
+        self._player_shape: Optional[str] = None
+        self._player_visible: bool = True
+        # rectangle items of the blocks; item i shows block slot i of the block manager
+        self._block_items: List[int] = []
+        self._block_colors: List[Optional[str]] = []
+        self._visible_blocks: int = 0
+
+    def _image(self, path: str) -> tkinter.PhotoImage:
+        """delivers the tk image of a gif; loads it on first use"""
+        if path not in self._images:
+            self._images[path] = tkinter.PhotoImage(master=self._root, file=path)
+        return self._images[path]
+
+    def draw_lines(self) -> None:
+        """draws start line at bottom boundary and finish line at top boundary"""
+        for y in (self.bottom_boundary, self.top_boundary):
+            self._canvas.create_line(self.left_boundary, -y, self.right_boundary, -y, fill="black")
+
+    def write_descriptions(self) -> None:
+        """writes the texts "safe zone" and "target area" at the same positions as GameScreen"""
+        font: Tuple = (FONT_TYPE, 25, FONT_STYLE)
+        CanvasLabel(self._canvas, 150, -280, TEXT_ALIGNMENT, font).write("SAFE ZONE")
+        CanvasLabel(self._canvas, 120, 260, TEXT_ALIGNMENT, font).write("TARGET AREA")
+
+    def create_label(self, x: float, y: float, align: str, font: Tuple) -> CanvasLabel:
+        """creates a text item for the HUD, e.g. for Scoreboard and Highscore"""
+        return CanvasLabel(self._canvas, x, y, align, font)
+
+    def track(self, player, blocks) -> None:
+        """registers the player and the block manager whose state is drawn on every screen update"""
+        self._player = player
+        self._blocks = blocks
+
+    def attach_event_listeners(self, bindings: Dict[str, Callable]) -> None:
+        """binds the key releases like turtle.onkey; binding a key again replaces its handler"""
+        for key, action in bindings.items():
+            self._canvas.bind(f"<KeyRelease-{key}>", lambda event, action=action: action())
+        self._canvas.focus_force()
+
+    def attach_key_listeners(self, keys: Iterable[str], on_press: Callable, on_release: Callable) -> None:
+        """binds presses and releases of the keys like GameScreen.attach_key_listeners"""
+        for key in keys:
+            self._canvas.bind(f"<KeyPress-{key}>", lambda event, key=key: on_press(key))
+            self._canvas.bind(f"<KeyRelease-{key}>", lambda event, key=key: on_release(key))
+        self._canvas.focus_force()
+
+    def update_screen(self) -> None:
+        """syncs the canvas items with the state of the tracked objects and lets tk redraw"""
+        if self._player is not None:
+            self._draw_player()
+        if self._blocks is not None:
+            self._draw_blocks()
+        self._root.update()
+
+    def turtle_count(self) -> int:
+        """no turtles at all; same interface as GameScreen"""
+        return 0
+
+    def canvas_item_count(self) -> int:
+        """amount of items on the tk canvas, e.g. for memory reports"""
+        return len(self._canvas.find_all())
+
+    def process_events(self) -> None:
+        """handles pending tk events like key presses without syncing the tracked objects"""
+        self._root.update()
+
+    def _draw_player(self) -> None:
+        """moves the player image; image and state are only changed on changes, e.g. on collisions or blinking"""
+        player = self._player
+        if self._player_item is None:
+            self._player_item = self._canvas.create_image(player.x, -player.y, image=self._image(player.shape))
+            self._player_shape = player.shape
+            return
+        self._canvas.coords(self._player_item, player.x, -player.y)
+        if player.shape != self._player_shape:
+            self._canvas.itemconfigure(self._player_item, image=self._image(player.shape))
+            self._player_shape = player.shape
+        if player.visible != self._player_visible:
+            self._canvas.itemconfigure(self._player_item, state="normal" if player.visible else "hidden")
+            self._player_visible = player.visible
+
+    def _draw_blocks(self) -> None:
+        """
+        - moves one pooled rectangle per block; new rectangles are only created when more blocks than ever are shown
+        - colors are only reconfigured when the block in a slot changed; rectangles of unused slots are hidden
+        """
+        blocks = self._blocks
+        count: int = blocks.count
+        canvas = self._canvas
+        while len(self._block_items) < count:
+            self._block_items.append(canvas.create_rectangle(0, 0, 0, 0, width=1, state="hidden"))
+            self._block_colors.append(None)
+        xs: List[float] = blocks.xs.tolist()
+        ys: List[float] = blocks.ys.tolist()
+        half_widths: List[float] = (blocks.widths / 2).tolist()
+        half_heights: List[float] = (blocks.heights / 2).tolist()
+        colors: List[List[int]] = blocks.colors.tolist()
+        for i in range(count):
+            item: int = self._block_items[i]
+            x, y, half_width, half_height = xs[i], ys[i], half_widths[i], half_heights[i]
+            canvas.coords(item, x - half_width, -y - half_height, x + half_width, -y + half_height)
+            color: str = "#%02x%02x%02x" % tuple(colors[i])
+            if color != self._block_colors[i]:
+                canvas.itemconfigure(item, fill=color, outline=color)
+                self._block_colors[i] = color
+            if i >= self._visible_blocks:
+                canvas.itemconfigure(item, state="normal")
+        for i in range(count, self._visible_blocks):
+            canvas.itemconfigure(self._block_items[i], state="hidden")
+        self._visible_blocks = count
+
+    def show_prompt(self, headline: str, prompt: str) -> Optional[str]:
+        """shows input with headline and prompt on screen; returns received answer as str or None if canceled"""
+        return simpledialog.askstring(headline, prompt, parent=self._root)
+
+    def close(self) -> None:
+        """destroys the tk window"""
+        self._root.destroy()
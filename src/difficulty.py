@@ -0,0 +1,62 @@
+from typing import Dict
+
+
+class DifficultySchedule:
+    """
+    - start values and per-level changes of the block parameters; shared by BlockManager and ArrayBlockManager
+    - on every level up the distance per tick is divided by the speed factor (0.95 = ~5.3% faster)
+    - from batch_max_level on every level up adds batch_max_step to the max. amount of blocks per batch
+    - from gap_level on every level up multiplies the x- and y-gaps by the gap factor
+    - from batch_min_level on every level up adds batch_min_step to the min. amount of blocks per batch
+    - defaults are the rules of the game; other schedules can be tuned headless with src.tuning
+    """
+    def __init__(
+        self,
+        distance: float = 0.5,
+        block_batch_max: int = 3,
+        block_batch_min: int = 0,
+        block_batch_x_gap: float = 80,
+        block_batch_y_gap: float = 25,
+        speed_factor: float = 0.95,
+        batch_max_level: int = 3,
+        batch_max_step: int = 1,
+        gap_level: int = 5,
+        gap_factor: float = 0.95,
+        batch_min_level: int = 7,
+        batch_min_step: int = 1
+    ) -> None:
+        self.distance: float = distance
+        self.block_batch_max: int = block_batch_max
+        self.block_batch_min: int = block_batch_min
+        self.block_batch_x_gap: float = block_batch_x_gap
+        self.block_batch_y_gap: float = block_batch_y_gap
+        self.speed_factor: float = speed_factor
+        self.batch_max_level: int = batch_max_level
+        self.batch_max_step: int = batch_max_step
+        self.gap_level: int = gap_level
+        self.gap_factor: float = gap_factor
+        self.batch_min_level: int = batch_min_level
+        self.batch_min_step: int = batch_min_step
+
+    def reset(self, blocks) -> None:
+        """sets the start values of the schedule on a block manager"""
+        blocks.distance = self.distance
+        blocks.block_batch_max = self.block_batch_max
+        blocks.block_batch_min = self.block_batch_min
+        blocks.block_batch_x_gap = self.block_batch_x_gap
+        blocks.block_batch_y_gap = self.block_batch_y_gap
+
+    def increase(self, blocks, level: int) -> None:
+        """changes the parameters of a block manager for the delivered new level"""
+        blocks.distance /= self.speed_factor
+        if level >= self.batch_max_level:
+            blocks.block_batch_max += self.batch_max_step
+        if level >= self.gap_level:
+            blocks.block_batch_x_gap *= self.gap_factor
+            blocks.block_batch_y_gap *= self.gap_factor
+        if level >= self.batch_min_level:
+            blocks.block_batch_min += self.batch_min_step
+
+    def to_dict(self) -> Dict:
+        """all parameters of the schedule, e.g. for reports"""
+        return dict(vars(self))
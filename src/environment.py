@@ -0,0 +1,171 @@
+"""
+- gym-style environment for agents playing the game headless: reset(seed) and step(action) instead of tk key events
+- wraps the Simulation, i.e. the player, array block manager, collision check, goal check and level up of the game
+- observations are preallocated numpy arrays filled in place every step; no arrays are allocated per step
+- usage:
+    python3 -m src.environment [--steps 100000] [--seed 0]
+"""
+from src.simulation import Simulation
+from src.batch_simulation import NO_ACTION, UP, DOWN, RIGHT, LEFT
+from src.difficulty import DifficultySchedule
+from typing import Dict, Optional, Tuple
+from random import Random
+import argparse
+import time
+import numpy as np
+
+# action names of the Simulation per action code; same codes as in BatchSimulation
+ACTIONS: Tuple[Optional[str], ...] = (None, "Up", "Down", "Right", "Left")
+# initial block rows of the observation; the default schedule exceeds them from about level 18 on
+MAX_BLOCKS: int = 256
+# columns of the block and player rows in the observation
+OBSERVATION_COLUMNS: Tuple[str, ...] = ("x", "y", "width", "height")
+OBSERVATION_DTYPE = np.float32
+
+
+class GameEnv:
+    """
+    - environment with the reset / step interface of gymnasium, without depending on it
+    - an action is one of NO_ACTION, UP, DOWN, RIGHT, LEFT per tick; one step is one tick of the game
+    - reward is the amount of levels cleared in the step; terminated is true after a collision
+    - truncated is true after max_steps steps if set; both end the episode until reset() is called
+    - observation is a dict of arrays allocated once and overwritten by every reset and step:
+      "player" (4,) and "blocks" (max_blocks, 4) with x, y, width and height, "mask" (max_blocks,) of valid rows
+    - keep a copy of an observation to compare it with later ones
+    - more blocks than max_blocks double the block rows; the new "blocks" and "mask" arrays replace the old ones in
+      the same observation dict, so read them from the dict after every step instead of keeping the arrays
+    - grow_blocks=False keeps the shape fixed instead; the oldest blocks (leftmost, leaving the screen next) are left
+      out first and info["blocks_dropped"] tells how many
+    - render() draws the state into an rgb frame of the offscreen Rasterizer
+    """
+    def __init__(
+        self,
+        max_blocks: int = MAX_BLOCKS,
+        max_steps: Optional[int] = None,
+        schedule: Optional[DifficultySchedule] = None,
+        solvable: bool = False,
+        swept: bool = False,
+        frame_size: int = 84,
+        grow_blocks: bool = True
+    ) -> None:
+        self.simulation: Simulation = Simulation(schedule=schedule, solvable=solvable, swept=swept)
+        self.max_blocks: int = max_blocks
+        self.grow_blocks: bool = grow_blocks
+        self.max_steps: Optional[int] = max_steps
+        self.frame_size: int = frame_size
+        self.steps: int = 0
+        self.done: bool = False
+        self._player: np.ndarray = np.zeros(len(OBSERVATION_COLUMNS), dtype=OBSERVATION_DTYPE)
+        self._blocks: np.ndarray = np.zeros((max_blocks, len(OBSERVATION_COLUMNS)), dtype=OBSERVATION_DTYPE)
+        self._mask: np.ndarray = np.zeros(max_blocks, dtype=bool)
+        self.observation: Dict[str, np.ndarray] = {"player": self._player, "blocks": self._blocks, "mask": self._mask}
+        # rows filled by the last observation; only these are cleared again
+        self._filled: int = 0
+        # blocks left out of the last observation with grow_blocks=False
+        self._dropped: int = 0
+        # created on the first render() call only; training without pixels never imports the rasterizer
+        self._rasterizer = None
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """starts a new episode; the same seed and actions reproduce the episode"""
+        self.simulation.reset(seed)
+        self.steps = 0
+        self.done = False
+        self._observe()
+        return self.observation, self._info()
+
+    def step(self, action: int) -> Tuple[Dict[str, np.ndarray], int, bool, bool, Dict]:
+        """
+        - advances the game by one tick with the action
+        - returns observation, reward, terminated, truncated and info like gymnasium
+        """
+        if self.done:
+            raise RuntimeError("episode is over; call reset() first")
+        simulation: Simulation = self.simulation
+        level: int = simulation.level
+        running: bool = simulation.step(ACTIONS[action])
+        self.steps += 1
+        terminated: bool = not running
+        truncated: bool = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        self.done = terminated or truncated
+        self._observe()
+        return self.observation, simulation.level - level, terminated, truncated, self._info()
+
+    def render(self) -> np.ndarray:
+        """rgb frame (frame_size, frame_size, 3) of the current state; the buffer is reused by the next call"""
+        if self._rasterizer is None:
+            from src.rasterizer import Rasterizer
+            self._rasterizer = Rasterizer(self.frame_size, self.frame_size, screen=self.simulation.screen)
+        return self._rasterizer.render(self.simulation.player, self.simulation.blocks)
+
+    def _observe(self) -> None:
+        """writes player and block state into the observation arrays"""
+        simulation: Simulation = self.simulation
+        player = simulation.player
+        self._player[:] = (player.x, player.y, player.width, player.height)
+        blocks = simulation.blocks
+        if blocks.count > self.max_blocks and self.grow_blocks:
+            self._grow(blocks.count)
+        count: int = min(blocks.count, self.max_blocks)
+        # blocks are stored from old to new; the newest ones coming in from the right are kept
+        first: int = blocks.count - count
+        rows: np.ndarray = self._blocks
+        rows[count:self._filled] = 0
+        self._mask[count:self._filled] = False
+        if count:
+            np.copyto(rows[:count, 0], blocks.xs[first:], casting="same_kind")
+            np.copyto(rows[:count, 1], blocks.ys[first:], casting="same_kind")
+            np.copyto(rows[:count, 2], blocks.widths[first:], casting="same_kind")
+            np.copyto(rows[:count, 3], blocks.heights[first:], casting="same_kind")
+            self._mask[:count] = True
+        self._filled = count
+        self._dropped = first
+
+    def _grow(self, required: int) -> None:
+        """doubles the block rows until the required amount fits in and puts the new arrays into the observation"""
+        self.max_blocks = max(1, self.max_blocks)
+        while self.max_blocks < required:
+            self.max_blocks *= 2
+        self._blocks = np.zeros((self.max_blocks, len(OBSERVATION_COLUMNS)), dtype=OBSERVATION_DTYPE)
+        self._mask = np.zeros(self.max_blocks, dtype=bool)
+        self._filled = 0
+        self.observation["blocks"], self.observation["mask"] = self._blocks, self._mask
+
+    def _info(self) -> Dict:
+        """level, ticks and amount of blocks of the game and amount of blocks left out of the observation"""
+        simulation: Simulation = self.simulation
+        return {
+            "level": simulation.level,
+            "ticks": simulation.ticks,
+            "block_count": simulation.blocks.count,
+            "blocks_dropped": self._dropped
+        }
+
+
+def benchmark(steps: int = 100000, seed: int = 0) -> float:
+    """plays episodes with a random agent for steps steps and returns the steps per second; crashes reset the env"""
+    env: GameEnv = GameEnv()
+    rng: Random = Random(seed)
+    # mostly no key, some up and a few sideways / down presses like in batch_simulation.benchmark
+    actions = rng.choices((NO_ACTION, UP, DOWN, RIGHT, LEFT), weights=(80, 12, 2, 3, 3), k=steps)
+    env.reset(seed)
+    start: float = time.perf_counter()
+    for step, action in enumerate(actions):
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset(seed + step)
+    return steps / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """command line entry point measuring the steps per second on one core"""
+    parser = argparse.ArgumentParser(description="measure the environment of Road Rage Royal")
+    parser.add_argument("--steps", type=int, default=100000, help="steps to play (default 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the episodes and the agent (default 0)")
+    args = parser.parse_args()
+    throughput: float = benchmark(args.steps, args.seed)
+    print(f"{args.steps} steps: {throughput:,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+- minimal gif reader and writer on numpy arrays without any imaging library
+- read_gif decodes the first image of a gif, e.g. the sprites in assets, into an rgba array
+- write_gif encodes rgb or grayscale frames as looping animated gif, e.g. frames of the offscreen rasterizer
+"""
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+
+# marks the end of the gif data stream
+TRAILER: int = 0x3B
+# rgb frames are quantized to 3 bits red, 3 bits green and 2 bits blue; grayscale frames keep all 256 levels
+RGB332_PALETTE: np.ndarray = np.array(
+    [((index >> 5) * 255 // 7, ((index >> 2) & 7) * 255 // 7, (index & 3) * 255 // 3) for index in range(256)],
+    dtype=np.uint8
+)
+GRAY_PALETTE: np.ndarray = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+# written codes are 9 bits wide; a clear code every 254 pixels keeps the code table below 512 entries
+LITERALS_PER_CLEAR: int = 254
+
+
+def read_gif(path: str) -> np.ndarray:
+    """decodes the first image of a gif into an rgba array of the logical screen size; transparent pixels get alpha 0"""
+    with open(path, "rb") as file:
+        data: bytes = file.read()
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError(f"{path} is no gif file")
+    width, height = int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+    flags: int = data[10]
+    position: int = 13
+    palette: Optional[np.ndarray] = None
+    if flags & 0x80:
+        palette, position = _read_palette(data, position, flags)
+    transparent: Optional[int] = None
+    while position < len(data) and data[position] != TRAILER:
+        block: int = data[position]
+        if block == 0x21:
+            label: int = data[position + 1]
+            if label == 0xF9 and data[position + 3] & 1:
+                transparent = data[position + 6]
+            position = _skip_sub_blocks(data, position + 2)
+        elif block == 0x2C:
+            left = int.from_bytes(data[position + 1:position + 3], "little")
+            top = int.from_bytes(data[position + 3:position + 5], "little")
+            image_width = int.from_bytes(data[position + 5:position + 7], "little")
+            image_height = int.from_bytes(data[position + 7:position + 9], "little")
+            image_flags: int = data[position + 9]
+            position += 10
+            if image_flags & 0x80:
+                palette, position = _read_palette(data, position, image_flags)
+            if palette is None:
+                raise ValueError(f"{path} has no color table")
+            min_code_size: int = data[position]
+            compressed, position = _read_sub_blocks(data, position + 1)
+            indices: np.ndarray = np.array(
+                _lzw_decode(compressed, min_code_size)[:image_width * image_height], dtype=np.uint8
+            ).reshape(image_height, image_width)
+            if image_flags & 0x40:
+                indices = _deinterlace(indices)
+            image: np.ndarray = np.zeros((height, width, 4), dtype=np.uint8)
+            region: np.ndarray = image[top:top + image_height, left:left + image_width]
+            region[..., :3] = palette[indices]
+            region[..., 3] = 255 if transparent is None else np.where(indices == transparent, 0, 255)
+            return image
+        else:
+            raise ValueError(f"{path} has an unknown block {block:#x}")
+    raise ValueError(f"{path} has no image")
+
+
+def write_gif(path: str, frames: Iterable[np.ndarray], frame_duration: float = 0.02) -> int:
+    """
+    - writes rgb (height, width, 3) or grayscale (height, width) uint8 frames as animated gif looping forever
+    - frame_duration in seconds; gif stores it in hundredths of a second
+    - returns the amount of written frames
+    """
+    written: int = 0
+    delay: int = max(1, round(frame_duration * 100))
+    with open(path, "wb") as file:
+        for frame in frames:
+            if not written:
+                height, width = frame.shape[:2]
+                palette: np.ndarray = GRAY_PALETTE if frame.ndim == 2 else RGB332_PALETTE
+                file.write(b"GIF89a" + width.to_bytes(2, "little") + height.to_bytes(2, "little") + bytes([0xF7, 0, 0]))
+                file.write(palette.tobytes())
+                # netscape extension: loop forever
+                file.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+            file.write(b"\x21\xF9\x04\x00" + delay.to_bytes(2, "little") + b"\x00\x00")
+            file.write(b"\x2C\x00\x00\x00\x00" + width.to_bytes(2, "little") + height.to_bytes(2, "little") + b"\x00")
+            file.write(b"\x08" + _sub_blocks(_lzw_encode(_palette_indices(frame))) + b"\x00")
+            written += 1
+        file.write(bytes([TRAILER]))
+    return written
+
+
+def _palette_indices(frame: np.ndarray) -> np.ndarray:
+    """palette index per pixel; grayscale levels are their own index, rgb is quantized to 3-3-2 bits"""
+    if frame.ndim == 2:
+        return frame.ravel()
+    return ((frame[..., 0] & 0xE0) | ((frame[..., 1] >> 3) & 0x1C) | (frame[..., 2] >> 6)).ravel()
+
+
+def _lzw_encode(indices: np.ndarray) -> bytes:
+    """
+    - lzw stream of 9 bit codes with minimum code size 8 emitting every index as literal
+    - no string table lookups at all; the encoding is a few array operations and every decoder reads it
+    """
+    pixels: int = len(indices)
+    chunks: int = -(-pixels // LITERALS_PER_CLEAR)
+    # clear code in front of every chunk of literals and the end code at the end
+    codes: np.ndarray = np.full(pixels + chunks + 1, 256, dtype=np.uint16)
+    positions: np.ndarray = np.arange(pixels)
+    codes[positions + positions // LITERALS_PER_CLEAR + 1] = indices
+    codes[-1] = 257
+    bits: np.ndarray = ((codes[:, None] >> np.arange(9, dtype=np.uint16)) & 1).astype(np.uint8).ravel()
+    return np.packbits(bits, bitorder="little").tobytes()
+
+
+def _lzw_decode(data: bytes, min_code_size: int) -> List[int]:
+    """decodes a gif lzw stream into palette indices"""
+    clear: int = 1 << min_code_size
+    end: int = clear + 1
+    code_size: int = min_code_size + 1
+    table: List[Tuple[int, ...]] = [(index,) for index in range(clear)] + [(), ()]
+    previous: Optional[Tuple[int, ...]] = None
+    output: List[int] = []
+    bit_buffer, bit_count = 0, 0
+    for byte in data:
+        bit_buffer |= byte << bit_count
+        bit_count += 8
+        while bit_count >= code_size:
+            code: int = bit_buffer & ((1 << code_size) - 1)
+            bit_buffer >>= code_size
+            bit_count -= code_size
+            if code == clear:
+                table = table[:end + 1]
+                code_size = min_code_size + 1
+                previous = None
+                continue
+            if code == end:
+                return output
+            if code < len(table):
+                entry: Tuple[int, ...] = table[code]
+                if previous is not None:
+                    table.append(previous + entry[:1])
+            elif previous is not None:
+                entry = previous + previous[:1]
+                table.append(entry)
+            else:
+                raise ValueError("corrupt lzw stream")
+            output.extend(entry)
+            previous = entry
+            if len(table) == 1 << code_size and code_size < 12:
+                code_size += 1
+    return output
+
+
+def _read_palette(data: bytes, position: int, flags: int) -> Tuple[np.ndarray, int]:
+    """color table following a descriptor with its size in the lowest 3 bits of the flags"""
+    size: int = 3 * (2 << (flags & 7))
+    palette: np.ndarray = np.frombuffer(data[position:position + size], dtype=np.uint8).reshape(-1, 3)
+    return palette, position + size
+
+
+def _read_sub_blocks(data: bytes, position: int) -> Tuple[bytes, int]:
+    """joined data of the sub-blocks starting at position and the position after the terminator"""
+    chunks: List[bytes] = []
+    while data[position]:
+        chunks.append(data[position + 1:position + 1 + data[position]])
+        position += 1 + data[position]
+    return b"".join(chunks), position + 1
+
+
+def _skip_sub_blocks(data: bytes, position: int) -> int:
+    """position after the terminator of the sub-blocks starting at position"""
+    return _read_sub_blocks(data, position)[1]
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    """splits data into sub-blocks of max. 255 bytes with a length byte each"""
+    return b"".join(bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255))
+
+
+def _deinterlace(indices: np.ndarray) -> np.ndarray:
+    """rows of interlaced images are stored in 4 passes: every 8th row from 0 and 4, every 4th from 2, odd rows"""
+    rows: List[int] = (
+        list(range(0, len(indices), 8)) + list(range(4, len(indices), 8))
+        + list(range(2, len(indices), 4)) + list(range(1, len(indices), 2))
+    )
+    result: np.ndarray = np.empty_like(indices)
+    result[rows] = indices
+    return result
@@ -1,20 +1,27 @@
-from src.screen import GameScreen
-from src.player import Player
-from random import randint, sample
-from typing import List, Tuple
-import time
+from src.animation import AnimationScheduler, EXPLOSION_DURATION
+from random import Random
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import random
+import numpy as np
+# only imported for type hints; the headless simulation and its worker processes run without importing turtle / tk
+if TYPE_CHECKING:
+    from src.screen import GameScreen
+    from src.player import Player
 # needed for fine-tuning for collision detection function (visible crash)
 OVERLAP_MARGIN: int = 2
 
 
-def random_color() -> Tuple[int, int, int]:
+def random_color(rng: Optional[Random] = None) -> Tuple[int, int, int]:
     """
     - generates a random RGB color tuple of not too bright colors on the white background
+    - args:
+        rng: optional seeded random generator for reproducible runs; global random module if none
     - returns:
         Tuple[int, int, int]: a tuple of three integers representing RGB values
     """
+    generator = rng if rng is not None else random
     while True:
-        r, g, b = randint(0, 255), randint(0, 255), randint(0, 255)
+        r, g, b = generator.randint(0, 255), generator.randint(0, 255), generator.randint(0, 255)
         if r < 220 or g < 220 or b < 220:
             return r, g, b
 
@@ -24,7 +31,8 @@ def create_block_batch(
         block_batch_max: int,
         block_batch_y_gap: float,
         x_genesis: int,
-        screen: GameScreen
+        screen: "GameScreen",
+        rng: Optional[Random] = None
 ) -> List[Tuple[int, int]]:
     """
     generate a list of tuples with random y-coordinates & constant x-genesis coordinate for a block batch ensuring that:
@@ -38,20 +46,22 @@ def create_block_batch(
     - "block_batch_y_gap": min. space between every y-coordinates
     - "x_genesis": x-genesis-coordinate right beyond the visible screen where the blocks are generated
     - "screen": instance of GameScreen
+    - "rng": optional seeded random generator for reproducible runs; global random module if none
     return:
     - a list of tuples with block coordinates for the batch
     """
+    generator = rng if rng is not None else random
     # define the amount of blocks to be generated for the batch randomly within the range
-    amount_blocks: int = randint(block_batch_min, block_batch_max)
+    amount_blocks: int = generator.randint(block_batch_min, block_batch_max)
     # create list of all possible y coordinates
     possible_y_coordinates = list(range(screen.bottom_boundary + 12, screen.top_boundary - 12, int(block_batch_y_gap)))
     # Randomly sample the required amount; ensure no more samples are drawn than possible y-coordinates
-    block_batch_y_coordinates = sample(possible_y_coordinates, min(amount_blocks, len(possible_y_coordinates)))
+    block_batch_y_coordinates = generator.sample(possible_y_coordinates, min(amount_blocks, len(possible_y_coordinates)))
     # using the y-coordinates create the tuples with constant x-genesis-coordinate
     return [(x_genesis, y_cor) for y_cor in block_batch_y_coordinates]
 
 
-def check_collision(player: Player, block_container) -> bool:
+def check_collision(player: "Player", block_container) -> bool:
     """
     - bounding box collision detection to check if any of the blocks collides with the player
     - overlapping margin added to ensure the rectangles are close to each other visibly at collisions
@@ -83,8 +93,108 @@ def check_collision(player: Player, block_container) -> bool:
     return False
 
 
-def collision_animation(player: Player, screen: GameScreen) -> None:
-    """replaces player with an explosion effect for 0.5s"""
+def check_collision_vectorized(
+        player: "Player",
+        block_xs: np.ndarray,
+        block_ys: np.ndarray,
+        block_half_widths: np.ndarray,
+        block_half_heights: np.ndarray
+) -> bool:
+    """
+    - vectorized version of check_collision testing the player box against all block boxes in one numpy operation
+    - same bounding boxes and overlap margin semantics as check_collision, delivering identical results
+    args:
+    - player object
+    - arrays with x- and y-coordinates (centers) and half widths / heights of all blocks
+    returns:
+    - true for collision with any block
+    - otherwise false
+    """
+    if not len(block_xs):
+        return False
+    player_right: float = player.get_xcor() + (player.get_width() / 2) - OVERLAP_MARGIN
+    player_left: float = player.get_xcor() - (player.get_width() / 2) + OVERLAP_MARGIN
+    player_top: float = player.get_ycor() + (player.get_height() / 2) - OVERLAP_MARGIN
+    player_bottom: float = player.get_ycor() - (player.get_height() / 2) + OVERLAP_MARGIN
+    return bool(np.any(
+        (player_right > block_xs - block_half_widths) &
+        (player_left < block_xs + block_half_widths) &
+        (player_top > block_ys - block_half_heights) &
+        (player_bottom < block_ys + block_half_heights)
+    ))
+
+
+def swept_collision_time(
+        player: "Player",
+        player_dx: float,
+        player_dy: float,
+        block_xs: np.ndarray,
+        block_ys: np.ndarray,
+        block_half_widths: np.ndarray,
+        block_half_heights: np.ndarray,
+        block_dx: float,
+        block_dy: float = 0.0,
+        moved: Optional[int] = None
+) -> Optional[float]:
+    """
+    - swept (continuous) version of check_collision_vectorized for the movement of player and blocks over one tick
+    - player and blocks move linearly from their positions before the tick to their current positions
+    - this way blocks can not tunnel through the player, however big the displacements per tick are
+    - same bounding boxes and overlap margin semantics as check_collision; touching edges are no collision
+    - blocks spawned in the tick did not exist before; they are not projected back but only checked at the end
+    args:
+    - player object at its position after the tick and its displacement in this tick
+    - arrays with x- and y-coordinates (centers after the tick) and half widths / heights of all blocks
+    - displacement of all blocks in this tick, e.g. -distance along the x-axis
+    - optional amount of leading blocks moved in this tick; the blocks behind them were spawned in it; all if none
+    returns:
+    - time of impact as fraction of the tick between 0 (start) and 1 (end) of the earliest colliding block
+    - none if no block collides within the tick
+    """
+    if moved is not None and moved < len(block_xs):
+        impact: Optional[float] = swept_collision_time(
+            player, player_dx, player_dy, block_xs[:moved], block_ys[:moved], block_half_widths[:moved],
+            block_half_heights[:moved], block_dx, block_dy
+        )
+        if impact is None and check_collision_vectorized(
+            player, block_xs[moved:], block_ys[moved:], block_half_widths[moved:], block_half_heights[moved:]
+        ):
+            return 1.0
+        return impact
+    if not len(block_xs):
+        return None
+    # movement of the blocks relative to the player; distances between the centers at the start of the tick
+    velocity_x: float = block_dx - player_dx
+    velocity_y: float = block_dy - player_dy
+    start_xs: np.ndarray = block_xs - velocity_x - player.get_xcor()
+    start_ys: np.ndarray = block_ys - velocity_y - player.get_ycor()
+    # boxes overlap while the distance of the centers along an axis is below the sum of the half extents
+    reach_xs: np.ndarray = block_half_widths + player.get_width() / 2 - OVERLAP_MARGIN
+    reach_ys: np.ndarray = block_half_heights + player.get_height() / 2 - OVERLAP_MARGIN
+    entry_x, exit_x = _overlap_interval(start_xs, reach_xs, velocity_x)
+    entry_y, exit_y = _overlap_interval(start_ys, reach_ys, velocity_y)
+    entry: np.ndarray = np.maximum(np.maximum(entry_x, entry_y), 0.0)
+    exit_: np.ndarray = np.minimum(np.minimum(exit_x, exit_y), 1.0)
+    hits: np.ndarray = entry < exit_
+    if not hits.any():
+        return None
+    return float(entry[hits].min())
+
+
+def _overlap_interval(starts: np.ndarray, reaches: np.ndarray, velocity: float) -> Tuple[np.ndarray, np.ndarray]:
+    """times in which the distances starts + t * velocity are within -reaches and reaches along one axis"""
+    if velocity == 0:
+        inside: np.ndarray = np.abs(starts) < reaches
+        return np.where(inside, -np.inf, np.inf), np.where(inside, np.inf, -np.inf)
+    first: np.ndarray = (-reaches - starts) / velocity
+    second: np.ndarray = (reaches - starts) / velocity
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def collision_animation(player: "Player", animations: AnimationScheduler, duration: float = EXPLOSION_DURATION) -> None:
+    """
+    - replaces player with an explosion effect; shown with the next frame
+    - the explosion is held for duration seconds by the animation scheduler instead of sleeping in the tk event loop
+    """
     player.update_shape("assets/explosion.gif")
-    screen.update_screen()
-    time.sleep(1)
+    animations.schedule("explosion", duration)
@@ -1,17 +1,38 @@
 import sqlite3
 import logging
-from threading import Lock
+from threading import Condition, Lock, Thread
+from typing import Iterable, List, Optional, Tuple
 import os
+import time
+
+# max. seconds close() waits for the background writer to flush the pending highscore and runs
+FLUSH_TIMEOUT: float = 2.0
+# highscore delivered if the db cannot be read; every reached level is higher
+FALLBACK_HIGHSCORE: int = 0
+# width in seconds of the duration buckets runs per level are counted in; a power of two keeps the bounds exact
+DURATION_BUCKET: float = 1.0
+# leaderboard entry: player name, reached level, duration of the run in seconds, unix timestamp of the run end
+Run = Tuple[str, int, float, float]
 
 
 class HighscoreDB:
-    """singleton database class for managing the highscore with sqlite3 on one instance"""
+    """
+    - singleton database class for managing the highscore with sqlite3 on one instance
+    - optional write-behind mode: the highscore is cached in memory and written by a background thread
+    - in write-behind mode reads are served from memory and updates only hand the value over to the writer
+    - pending updates are coalesced; the writer only writes the latest score, never every single one
+    - leaderboard table with one entry per finished run; ranked by level (higher first), then duration (shorter first)
+    - a covering index in ranking order serves top-N queries by reading only the first N index entries
+    - runs per level and per level and duration bucket are counted in separate tables maintained by triggers
+    - rank queries sum these few rows for the higher levels and the faster buckets of the same level and count only
+      the runs within the bucket of the queried duration in the index, so they stay fast with millions of entries
+    """
     # class variable to store the single instance across all instances
     _instance = None
     # ensures single thread for DB connection
     _lock = Lock()
 
-    def __new__(cls, db_path: str = "data/prod.highscore.db"):
+    def __new__(cls, db_path: str = "data/prod.highscore.db", write_behind: bool = False):
         """calling __new__ special method (overriding __init__) to ensure only one instance is created"""
         with cls._lock:
             # create instance only if no one exists yet
@@ -21,10 +42,50 @@ class HighscoreDB:
                 cls._instance.db_pass = db_path
                 # trigger persisted connection to the DB; check_same_thread flag to allow multiple threads to sqlite db
                 cls._instance._connection = sqlite3.connect(cls._instance.db_pass, check_same_thread=False)
+                # serializes the usage of the connection between the calling thread and the writer thread
+                cls._instance._connection_lock = Lock()
+                cls._instance._writer = None
+                # finished runs not inserted yet by the writer thread
+                cls._instance._pending_runs: List[Run] = []
                 # init the db on the object
                 cls._instance._init_db()
+            # write-behind can be switched on for an already existing instance
+            if write_behind and cls._instance._writer is None:
+                cls._instance._start_writer()
             return cls._instance
 
+    def _start_writer(self) -> None:
+        """caches the current highscore and starts the background writer thread"""
+        self._cached_highscore: int = self._read_highscore()
+        # latest highscore not written yet; none if nothing is pending
+        self._pending: Optional[int] = None
+        self._stopping: bool = False
+        self._pending_changed = Condition()
+        # daemon thread: never keeps the app alive; close() flushes it with a bounded wait
+        self._writer: Optional[Thread] = Thread(target=self._write_pending, name="highscore-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def write_behind(self) -> bool:
+        """true if updates are written by the background writer thread"""
+        return self._writer is not None
+
+    def _write_pending(self) -> None:
+        """writer thread loop: waits for pending highscores and writes the latest one until close() is called"""
+        while True:
+            with self._pending_changed:
+                while self._pending is None and not self._pending_runs and not self._stopping:
+                    self._pending_changed.wait()
+                pending, self._pending = self._pending, None
+                runs, self._pending_runs = self._pending_runs, []
+                stopping: bool = self._stopping
+            if pending is not None:
+                self._write_highscore(pending)
+            if runs:
+                self._insert_runs(runs)
+            if stopping and pending is None and not runs:
+                return
+
     def _init_db(self) -> None:
         """initializes the database and ensures the highscore table exists"""
         try:
@@ -40,36 +101,246 @@ class HighscoreDB:
                 con.execute("""
                     INSERT OR IGNORE INTO global_highscore (id, score) VALUES (1, 1)
                 """)
+                con.execute("""
+                    CREATE TABLE IF NOT EXISTS leaderboard (
+                    id INTEGER PRIMARY KEY,
+                    player TEXT NOT NULL,
+                    level INTEGER NOT NULL,
+                    duration REAL NOT NULL,
+                    created_at REAL NOT NULL
+                    )
+                """)
+                # ranking order incl. all selected columns; top-N queries never touch the table itself
+                con.execute("""
+                    CREATE INDEX IF NOT EXISTS leaderboard_ranking
+                    ON leaderboard (level DESC, duration, id, player, created_at)
+                """)
+                con.execute("""
+                    CREATE TABLE IF NOT EXISTS leaderboard_level_counts (
+                    level INTEGER PRIMARY KEY,
+                    runs INTEGER NOT NULL
+                    )
+                """)
+                con.execute("""
+                    CREATE TABLE IF NOT EXISTS leaderboard_bucket_counts (
+                    level INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    runs INTEGER NOT NULL,
+                    PRIMARY KEY (level, bucket)
+                    ) WITHOUT ROWID
+                """)
+                # counts runs of leaderboards created before the bucket counts existed; no-op once filled
+                con.execute(f"""
+                    INSERT INTO leaderboard_bucket_counts (level, bucket, runs)
+                    SELECT level, CAST(duration / {DURATION_BUCKET} AS INTEGER), COUNT(*) FROM leaderboard
+                    WHERE NOT EXISTS (SELECT 1 FROM leaderboard_bucket_counts)
+                    GROUP BY 1, 2
+                """)
+                # triggers are recreated; the ones of older versions do not maintain the bucket counts
+                con.execute("DROP TRIGGER IF EXISTS leaderboard_count_insert")
+                con.execute("DROP TRIGGER IF EXISTS leaderboard_count_delete")
+                con.execute(f"""
+                    CREATE TRIGGER leaderboard_count_insert AFTER INSERT ON leaderboard
+                    BEGIN
+                        INSERT INTO leaderboard_level_counts (level, runs) VALUES (NEW.level, 1)
+                        ON CONFLICT (level) DO UPDATE SET runs = runs + 1;
+                        INSERT INTO leaderboard_bucket_counts (level, bucket, runs)
+                        VALUES (NEW.level, CAST(NEW.duration / {DURATION_BUCKET} AS INTEGER), 1)
+                        ON CONFLICT (level, bucket) DO UPDATE SET runs = runs + 1;
+                    END
+                """)
+                con.execute(f"""
+                    CREATE TRIGGER leaderboard_count_delete AFTER DELETE ON leaderboard
+                    BEGIN
+                        UPDATE leaderboard_level_counts SET runs = runs - 1 WHERE level = OLD.level;
+                        UPDATE leaderboard_bucket_counts SET runs = runs - 1
+                        WHERE level = OLD.level AND bucket = CAST(OLD.duration / {DURATION_BUCKET} AS INTEGER);
+                    END
+                """)
         except sqlite3.Error as e:
             logging.error(f"Database initialization failed: {e}")
 
     def get_highscore(self) -> int:
-        """reads the highscore from DB and returns it as int"""
+        """returns the highscore as int; read from DB or from memory in write-behind mode"""
+        if self.write_behind:
+            return self._cached_highscore
+        return self._read_highscore()
+
+    def _read_highscore(self) -> int:
+        """reads the highscore from DB and returns it as int; FALLBACK_HIGHSCORE if the DB cannot be read"""
         try:
-            with self._connection as con:
+            with self._connection_lock, self._connection as con:
                 return con.execute("""
                     SELECT score FROM global_highscore
                     WHERE id = 1
                 """).fetchone()[0]
         except sqlite3.Error as e:
             logging.error(f"Database reading failed: {e}")
+            return FALLBACK_HIGHSCORE
 
     def update_highscore(self, new_highscore: int) -> None:
-        """updates the highscore value in the db if delivered argument is higher than current DB value"""
+        """
+        - updates the highscore value in the db if delivered argument is higher than current DB value
+        - in write-behind mode the value is cached and handed over to the writer thread without waiting for sqlite
+        """
+        if self.write_behind:
+            if new_highscore > self._cached_highscore:
+                self._cached_highscore = new_highscore
+                with self._pending_changed:
+                    self._pending = new_highscore
+                    self._pending_changed.notify()
+            return
         try:
             if new_highscore > self.get_highscore():
-                with self._connection as con:
-                    con.execute("""
-                    UPDATE global_highscore SET score = ? WHERE id = 1
-                    """, (new_highscore,))
+                self._write_highscore(new_highscore)
         except sqlite3.Error as e:
             logging.error(f"Database writing failed: {e}")
 
-    def close(self) -> None:
-        """closes the database connection triggered by __del__ object destruction when app is terminated"""
+    def _write_highscore(self, new_highscore: int) -> None:
+        """writes the highscore; the condition in the statement keeps a higher value written in between"""
+        try:
+            with self._connection_lock, self._connection as con:
+                con.execute("""
+                UPDATE global_highscore SET score = ? WHERE id = 1 AND score < ?
+                """, (new_highscore, new_highscore))
+        except sqlite3.Error as e:
+            logging.error(f"Database writing failed: {e}")
+
+    def add_run(self, player: str, level: int, duration: float, created_at: Optional[float] = None) -> None:
+        """
+        - adds a finished run to the leaderboard; timestamp defaults to now
+        - in write-behind mode the run is queued and inserted by the writer thread together with other pending runs
+        """
+        run: Run = (player, level, duration, created_at if created_at is not None else time.time())
+        if self.write_behind:
+            with self._pending_changed:
+                self._pending_runs.append(run)
+                self._pending_changed.notify()
+            return
+        self.add_runs([run])
+
+    def add_runs(self, runs: Iterable[Run], retain: Optional[int] = None) -> None:
+        """
+        - inserts many runs in a single transaction; much faster than one commit per run
+        - optional retain prunes all entries ranked beyond the delivered amount afterwards
+        """
+        self._insert_runs(runs)
+        if retain is not None:
+            self.prune_leaderboard(retain)
+
+    def _insert_runs(self, runs: Iterable[Run]) -> None:
+        """inserts the runs with one executemany in one transaction"""
+        try:
+            with self._connection_lock, self._connection as con:
+                con.executemany("""
+                INSERT INTO leaderboard (player, level, duration, created_at) VALUES (?, ?, ?, ?)
+                """, runs)
+        except sqlite3.Error as e:
+            logging.error(f"Database writing failed: {e}")
+
+    def top_runs(self, amount: int = 10) -> List[Run]:
+        """delivers the best runs in ranking order; runs pending in the writer thread are not included yet"""
+        try:
+            with self._connection_lock, self._connection as con:
+                return con.execute("""
+                    SELECT player, level, duration, created_at FROM leaderboard INDEXED BY leaderboard_ranking
+                    ORDER BY level DESC, duration, id
+                    LIMIT ?
+                """, (amount,)).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Database reading failed: {e}")
+            return []
+
+    def rank_of(self, level: int, duration: float) -> int:
+        """
+        - rank a new run with the delivered level and duration would have in the order of top_runs
+        - 1 + runs reaching a higher level (summed from the counts per level) + runs of the same level with a shorter
+          or equal duration; equal durations rank by insertion order, so existing runs stay in front
+        - runs of the same level in faster buckets are summed from the bucket counts; only the runs within the bucket
+          of the duration are counted in the ranking index; 0 if the db cannot be read
+        """
+        bucket: int = int(duration // DURATION_BUCKET)
+        try:
+            with self._connection_lock, self._connection as con:
+                higher: int = con.execute("""
+                    SELECT COALESCE(SUM(runs), 0) FROM leaderboard_level_counts WHERE level > ?
+                """, (level,)).fetchone()[0]
+                faster_buckets: int = con.execute("""
+                    SELECT COALESCE(SUM(runs), 0) FROM leaderboard_bucket_counts WHERE level = ? AND bucket < ?
+                """, (level, bucket)).fetchone()[0]
+                same_bucket: int = con.execute("""
+                    SELECT COUNT(*) FROM leaderboard INDEXED BY leaderboard_ranking
+                    WHERE level = ? AND duration >= ? AND duration <= ?
+                """, (level, bucket * DURATION_BUCKET, duration)).fetchone()[0]
+                return 1 + higher + faster_buckets + same_bucket
+        except sqlite3.Error as e:
+            logging.error(f"Database reading failed: {e}")
+            return 0
+
+    def leaderboard_size(self) -> int:
+        """amount of runs in the leaderboard; summed from the counts per level; 0 if the db cannot be read"""
+        try:
+            with self._connection_lock, self._connection as con:
+                return con.execute("SELECT COALESCE(SUM(runs), 0) FROM leaderboard_level_counts").fetchone()[0]
+        except sqlite3.Error as e:
+            logging.error(f"Database reading failed: {e}")
+            return 0
+
+    def prune_leaderboard(self, retain: int) -> None:
+        """deletes all runs ranked beyond the delivered amount; the cut-off run is looked up in the ranking index"""
+        try:
+            with self._connection_lock, self._connection as con:
+                cut_off: Optional[Tuple] = con.execute("""
+                    SELECT level, duration, id FROM leaderboard INDEXED BY leaderboard_ranking
+                    ORDER BY level DESC, duration, id
+                    LIMIT 1 OFFSET ?
+                """, (retain,)).fetchone()
+                if cut_off is None:
+                    return
+                # delete the cut-off run and everything ranked behind it
+                con.execute("""
+                    DELETE FROM leaderboard
+                    WHERE level < ?1
+                    OR (level = ?1 AND (duration > ?2 OR (duration = ?2 AND id >= ?3)))
+                """, cut_off)
+                con.execute("DELETE FROM leaderboard_level_counts WHERE runs = 0")
+                con.execute("DELETE FROM leaderboard_bucket_counts WHERE runs = 0")
+        except sqlite3.Error as e:
+            logging.error(f"Database writing failed: {e}")
+
+    def _stop_writer(self, timeout: float) -> bool:
+        """
+        - stops the writer thread after it has written the pending highscore and runs; waits max. timeout seconds
+        - returns false if the writer did not finish in time; true otherwise or without write-behind mode
+        """
+        writer: Optional[Thread] = getattr(self, "_writer", None)
+        if writer is None:
+            return True
+        with self._pending_changed:
+            self._stopping = True
+            self._pending_changed.notify()
+        writer.join(timeout)
+        if writer.is_alive():
+            logging.error(f"Highscore writer did not finish within {timeout}s")
+            return False
+        self._writer = None
+        return True
+
+    def close(self, timeout: float = FLUSH_TIMEOUT) -> None:
+        """
+        - flushes the pending highscore with a bounded wait and closes the database connection
+        - triggered by __del__ object destruction when app is terminated
+        - connection is left open if the writer hangs; it is a daemon thread and ends with the app
+        - a closed instance is dropped as singleton, so the next call of HighscoreDB connects again
+        """
+        if not self._stop_writer(timeout):
+            return
         if hasattr(self, "_connection") and self._connection:
             self._connection.close()
             self._connection = None
+        # no class lock here: close also runs from __del__, which may interrupt __new__ holding the lock
+        if type(self)._instance is self:
+            type(self)._instance = None
 
     def __del__(self):
         """ensures database connection is closed on object destruction"""
@@ -0,0 +1,96 @@
+from typing import Any, Callable, Dict, Tuple
+import time
+
+# tk anchors of text items matching the alignments of turtle.write
+ANCHORS: Dict[str, str] = {"left": "sw", "center": "s", "right": "se"}
+# min. seconds between two refreshes of the performance counters
+REFRESH_INTERVAL: float = 0.5
+
+
+class CanvasLabel:
+    """
+    - single text item created once on a tk canvas in turtle coordinates
+    - writing replaces the text of the item in place instead of deleting and recreating it like turtle.write
+    - works on the canvas of the turtle screen as well as on the canvas of CanvasScreen
+    """
+    def __init__(
+        self,
+        canvas,
+        x: float,
+        y: float,
+        align: str = "left",
+        font: Tuple = ("Courier", 25, "normal")
+    ) -> None:
+        self._canvas = canvas
+        self.text: str = ""
+        # same placement as turtle.write: 1px left of x, y flipped since canvas y-axis points down
+        self._item = canvas.create_text(x - 1, -y, text="", anchor=ANCHORS[align], font=font)
+
+    def write(self, text: str) -> None:
+        """shows the text; unchanged texts cause no tk call"""
+        if text != self.text:
+            self._canvas.itemconfigure(self._item, text=text)
+            self.text = text
+
+
+class PerfHud:
+    """
+    - live performance counters in a single HUD label: frames per second, mean tick time and amount of active blocks
+    - ticks and frames are counted by wrappers installed once on the tick and render methods of the game
+    - label is refreshed at most every refresh interval in seconds, independent of the frame rate
+    - this way the text redraw costs at most one tk call per interval instead of one per frame
+    """
+    def __init__(
+        self,
+        label,
+        block_count: Callable[[], int],
+        refresh_interval: float = REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        self.label = label
+        # callable delivering the current amount of blocks, e.g. the count of the block manager
+        self._block_count: Callable[[], int] = block_count
+        self.refresh_interval: float = refresh_interval
+        self._clock: Callable[[], float] = clock
+        # counters since the last refresh
+        self._frames: int = 0
+        self._ticks: int = 0
+        self._tick_time: float = 0.0
+        self._last_refresh: float = clock()
+
+    def wrap_tick(self, tick: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        - returns a callable executing the tick and adding its duration to the tick time
+        - ticks take no arguments; like FrameProfiler.wrap the wrapper takes none either, so nothing is packed per call
+        """
+        clock: Callable[[], float] = self._clock
+
+        def timed_tick():
+            start: float = clock()
+            result = tick()
+            self._tick_time += clock() - start
+            self._ticks += 1
+            return result
+        return timed_tick
+
+    def wrap_frame(self, render: Callable[[], Any]) -> Callable[[], Any]:
+        """returns a zero-argument callable executing the render method, counting the frame and refreshing when due"""
+        clock: Callable[[], float] = self._clock
+
+        def counted_frame():
+            result = render()
+            self._frames += 1
+            now: float = clock()
+            if now - self._last_refresh >= self.refresh_interval:
+                self.refresh(now)
+            return result
+        return counted_frame
+
+    def refresh(self, now: float) -> None:
+        """writes the counters collected since the last refresh to the label and starts counting anew"""
+        elapsed: float = now - self._last_refresh
+        fps: float = self._frames / elapsed if elapsed > 0 else 0.0
+        tick_ms: float = 1000 * self._tick_time / self._ticks if self._ticks else 0.0
+        self.label.write(f"FPS {fps:.0f}  tick {tick_ms:.2f} ms  blocks {self._block_count()}")
+        self._frames, self._ticks, self._tick_time = 0, 0, 0.0
+        self._last_refresh = now
@@ -0,0 +1,76 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set, Tuple
+
+# ticks between two moves of a held key; 5 ticks = 10 moves per second at 50 ticks per second
+DEFAULT_REPEAT_TICKS: int = 5
+
+
+class InputQueue:
+    """
+    - buffers the key presses and releases of the tk callbacks; the callbacks only append an event, they never move
+    - the game drains the queue once per tick before the collision check and applies the resulting moves
+    - a new key press moves once in the next tick, even if the key was released again before that tick
+    - a held key moves every repeat_ticks ticks; the key repeat rate of the os has no effect on the movement
+    - key repeats of the os (another press or a release immediately followed by a press) are coalesced into the hold
+    - moves of one tick are delivered in the order of the keys, e.g. for deterministic recordings
+    """
+    def __init__(self, keys: Iterable[str], repeat_ticks: int = DEFAULT_REPEAT_TICKS) -> None:
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.repeat_ticks: int = max(1, repeat_ticks)
+        # key with pressed state in the order the callbacks delivered them
+        self._events: Deque[Tuple[str, bool]] = deque()
+        # held keys with the amount of ticks since their last move
+        self._held: Dict[str, int] = {}
+
+    def press(self, key: str) -> None:
+        """key press callback"""
+        self._events.append((key, True))
+
+    def release(self, key: str) -> None:
+        """key release callback"""
+        self._events.append((key, False))
+
+    @property
+    def held(self) -> Tuple[str, ...]:
+        """keys held down after the last drain"""
+        return tuple(key for key in self.keys if key in self._held)
+
+    def clear(self) -> None:
+        """drops buffered events and held keys, e.g. on a restart of the game"""
+        self._events.clear()
+        self._held.clear()
+
+    def drain(self) -> List[str]:
+        """
+        - coalesces all events buffered since the last drain into the moves of this tick
+        - releases only take effect at the end of the drain; a press of the same key in between keeps holding it
+        """
+        pressed: Set[str] = set()
+        released: Set[str] = set()
+        while self._events:
+            key, down = self._events.popleft()
+            if key not in self.keys:
+                continue
+            if not down:
+                if key in self._held:
+                    released.add(key)
+            elif key in released:
+                # release and press in the same tick: key repeat of the os, the key is still held
+                released.discard(key)
+            elif key not in self._held:
+                self._held[key] = 0
+                pressed.add(key)
+        moves: List[str] = []
+        for key in self.keys:
+            if key not in self._held:
+                continue
+            if key in pressed:
+                moves.append(key)
+            else:
+                self._held[key] += 1
+                if self._held[key] >= self.repeat_ticks:
+                    self._held[key] = 0
+                    moves.append(key)
+            if key in released:
+                del self._held[key]
+        return moves
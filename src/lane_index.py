@@ -0,0 +1,91 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional
+
+
+class LaneIndex:
+    """
+    - spatial index bucketing blocks by their y-coordinate (= lane) with x-ordered lists per lane
+    - blocks are only spawned on a discrete set of lanes and all blocks move by the same distance per tick
+    - therefore x-coordinates are stored relative to the total travelled distance; the keys never change while moving
+    - this way moving all blocks is a single addition and the order within every lane stays sorted for bisecting
+    - queries only look at lanes overlapping the queried box and within a lane only at blocks in the queried x window
+    """
+    def __init__(self) -> None:
+        # maps lane y-coordinate to sorted list of x-keys and the items in the same order
+        self._keys: Dict[float, List[float]] = {}
+        self._items: Dict[float, List[Any]] = {}
+        # sorted list of all lane y-coordinates containing at least one item
+        self._lanes: List[float] = []
+        # total distance all items moved to the left since the index was created
+        self._travelled: float = 0.0
+        # biggest half extents of all items ever inserted; used to widen the query box
+        self._max_half_width: float = 0.0
+        self._max_half_height: float = 0.0
+        self.size: int = 0
+
+    def insert(self, x: float, y: float, half_width: float, half_height: float, item: Any) -> None:
+        """inserts an item with center coordinates and half extents into its lane"""
+        if y not in self._keys:
+            insort(self._lanes, y)
+            self._keys[y] = []
+            self._items[y] = []
+        key: float = x + self._travelled
+        keys: List[float] = self._keys[y]
+        position: int = bisect_right(keys, key)
+        keys.insert(position, key)
+        self._items[y].insert(position, item)
+        self._max_half_width = max(self._max_half_width, half_width)
+        self._max_half_height = max(self._max_half_height, half_height)
+        self.size += 1
+
+    def remove(self, x: float, y: float, item: Any) -> None:
+        """removes an item by its current coordinates; lanes getting empty are dropped"""
+        keys: Optional[List[float]] = self._keys.get(y)
+        if keys is None:
+            return
+        items: List[Any] = self._items[y]
+        # items are found by identity within the neighbourhood of the key to be robust against float rounding
+        start: int = bisect_left(keys, x + self._travelled - 1)
+        for position in range(start, len(keys)):
+            if items[position] is item:
+                del keys[position]
+                del items[position]
+                self.size -= 1
+                break
+        if not keys:
+            del self._keys[y]
+            del self._items[y]
+            self._lanes.pop(bisect_left(self._lanes, y))
+
+    def advance(self, distance: float) -> None:
+        """moves all items to the left by the distance; keys are untouched"""
+        self._travelled += distance
+
+    def clear(self) -> None:
+        """removes all items from the index"""
+        self._keys.clear()
+        self._items.clear()
+        self._lanes.clear()
+        self.size = 0
+
+    def max_x(self) -> Optional[float]:
+        """current x-coordinate of the rightmost item; none if the index is empty"""
+        if not self._lanes:
+            return None
+        return max(keys[-1] for keys in self._keys.values()) - self._travelled
+
+    def query(self, left: float, right: float, bottom: float, top: float) -> List[Any]:
+        """
+        - returns all items whose boxes can overlap the box given by its left, right, bottom and top border
+        - result is a superset of the overlapping items; exact checks are left to the callee
+        """
+        # widen the box by the biggest half extents and 1px tolerance for float rounding of the keys
+        lane_start: int = bisect_left(self._lanes, bottom - self._max_half_height - 1)
+        lane_end: int = bisect_right(self._lanes, top + self._max_half_height + 1)
+        key_left: float = left - self._max_half_width - 1 + self._travelled
+        key_right: float = right + self._max_half_width + 1 + self._travelled
+        candidates: List[Any] = []
+        for lane in self._lanes[lane_start:lane_end]:
+            keys: List[float] = self._keys[lane]
+            candidates.extend(self._items[lane][bisect_left(keys, key_left):bisect_right(keys, key_right)])
+        return candidates
@@ -2,25 +2,137 @@ from src.player import Player
 from src.block_manager import BlockManager
 from src.scoreboard import Scoreboard, Highscore
 from src.screen import GameScreen
-from src.helpers import check_collision, collision_animation
+from src.helpers import collision_animation
+from src.simulation import HeadlessPlayer, ArrayBlockManager
+from src.replay import Recording, run_path
+from src.profiler import FrameProfiler
+from src.hud import PerfHud
+from src.telemetry import TelemetryWriter
+from src.input_queue import InputQueue
+from src.spawn_generator import SpawnGenerator
+from src.animation import AnimationScheduler, blink, LEVEL_FLASH_DURATION, LEVEL_FLASH_BLINKS
+from src.animation import TELEPORT_DURATION, TELEPORT_BLINKS
+from random import Random
+import argparse
+import random
 import time
 from turtle import Screen
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# fixed rate of simulation ticks per second; block speed is expressed in px per tick
+TICKS_PER_SECOND: int = 50
+# upper bound for the elapsed time of one loop iteration; prevents endless catching up after e.g. a dragged window
+MAX_FRAME_TIME: float = 0.25
+# rendering backends selectable on start-up; turtle is the default
+RENDERERS: List[str] = ["turtle", "canvas"]
+# game loop runtimes selectable on start-up; sync is the default
+RUNTIMES: List[str] = ["sync", "asyncio"]
+# position and font of the performance counters in the safe zone at the bottom left
+PERF_HUD_X: int = -287
+PERF_HUD_Y: int = -290
+PERF_HUD_FONT: Tuple = ("Courier", 10, "normal")
 
 
 class Game:
-    """manages the entire game lifecycle, including initialization, running the game loop, and restarting the game"""
-    def __init__(self) -> None:
-        self.screen: Screen = GameScreen()
-        self.player: Player = Player(self.screen)
-        self.blocks: BlockManager = BlockManager(self.screen)
-        self.scoreboard: Scoreboard = Scoreboard()
-        self.highscore: Highscore = Highscore()
+    """
+    - manages the entire game lifecycle, including initialization, running the game loop, and restarting the game
+    - every run is seeded; with a record path the seed and all key presses per tick are recorded for replays;
+      the first run is saved to the record path, further runs to numbered paths next to it (run.2.rrr, run.3.rrr, ...)
+    - with a trace path the phases of every frame are timed and exported as chrome trace on game over and on F9
+    - block batches come from a SpawnGenerator; every batch leaves the player a way through to the goal
+    - renderer "canvas" draws turtle-free game objects straight onto a tk canvas (CanvasScreen) instead of turtles
+    - compound_batches draws every block batch of the turtle renderer with one compound shape turtle
+    - HUD texts are canvas items updated in place; optional perf HUD shows fps, tick time and block count
+    - with a telemetry path level, block count, player position and frame time of every tick go to a ring file
+    - runtime "asyncio" runs tick, rendering and tk event pump as tasks on one event loop (AsyncRuntime); i/o at the
+      end of a run and on F9 goes to an executor
+    - explosion, level flash and player blink after the teleport are keyframes of the animation scheduler, run once
+      per frame; nothing sleeps in the tk event loop, the run ends after the explosion was shown
+    - key callbacks only buffer presses and releases in the input queue; it is drained once per tick before the
+      collision check, held keys move the player every few ticks regardless of the key repeat rate of the os
+    """
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        record_path: Optional[str] = None,
+        trace_path: Optional[str] = None,
+        renderer: str = "turtle",
+        perf_hud: bool = False,
+        player_name: str = "player",
+        telemetry_path: Optional[str] = None,
+        runtime: str = "sync",
+        compound_batches: bool = False
+    ) -> None:
+        if renderer not in RENDERERS:
+            raise ValueError(f"unknown renderer {renderer}; choose one of {RENDERERS}")
+        if runtime not in RUNTIMES:
+            raise ValueError(f"unknown runtime {runtime}; choose one of {RUNTIMES}")
+        # seeded random generator for block batches and colors; random seed if none is delivered
+        self.seed: int = seed if seed is not None else random.getrandbits(32)
+        self.rng: Random = Random(self.seed)
+        # name of the player the finished runs are added to the leaderboard with
+        self.player_name: str = player_name
+        # file path to save the recording of every run to; no recording if none
+        self.record_path: Optional[str] = record_path
+        self.recording: Recording = Recording(self.seed)
+        # amount of recordings saved in this session; numbers the file of the next one
+        self.recorded_runs: int = 0
+        # amount of simulation ticks completed in the current run; timestamp for recorded key presses
+        self.ticks: int = 0
+        # replays apply recorded key presses instead of recording them and skip the collision animation
+        self.replaying: bool = False
+        # file path to export the chrome trace of the phase timers to; no profiling if none
+        self.trace_path: Optional[str] = trace_path
+        self.profiler: Optional[FrameProfiler] = FrameProfiler() if trace_path else None
+        # memory-mapped ring file receiving one record per tick; no telemetry if none
+        self.telemetry: Optional[TelemetryWriter] = TelemetryWriter(telemetry_path) if telemetry_path else None
+        self.renderer: str = renderer
+        if renderer == "canvas":
+            # imported here; tkinter is only needed for the canvas renderer
+            from src.canvas_screen import CanvasScreen
+            self.screen = CanvasScreen()
+            # same game rules without turtles; the canvas screen draws their state once per frame
+            self.player = HeadlessPlayer(self.screen)
+            self.blocks = ArrayBlockManager(
+                self.screen, rng=self.rng, spawner=SpawnGenerator(self.screen, self.rng, player=self.player)
+            )
+            self.screen.track(self.player, self.blocks)
+        else:
+            self.screen: Screen = GameScreen()
+            self.player: Player = Player(self.screen)
+            self.blocks: BlockManager = BlockManager(
+                self.screen, compound_batches=compound_batches, rng=self.rng,
+                spawner=SpawnGenerator(self.screen, self.rng, player=self.player)
+            )
+        # non-blocking animations like the explosion; keyframes are run once per frame
+        self.animations: AnimationScheduler = AnimationScheduler()
+        self.scoreboard: Scoreboard = Scoreboard(label_factory=self.screen.create_label)
+        # sqlite is written by a background thread; level ups never wait for the disk
+        self.highscore: Highscore = Highscore(label_factory=self.screen.create_label, write_behind=True)
+        # live performance counters at the bottom left of the screen; no counting at all if disabled
+        self.perf_hud: Optional[PerfHud] = None
+        if perf_hud:
+            label = self.screen.create_label(PERF_HUD_X, PERF_HUD_Y, "left", PERF_HUD_FONT)
+            self.perf_hud = PerfHud(label, lambda: self.blocks.count)
+            self._tick = self.perf_hud.wrap_tick(self._tick)
+            self._render = self.perf_hud.wrap_frame(self._render)
+        if self.profiler is not None:
+            self._instrument(self.profiler)
+        # event loop runtime replacing the synchronous loop of run; none for the synchronous loop
+        self.async_runtime = None
+        if runtime == "asyncio":
+            # imported here; asyncio is only needed for this runtime
+            from src.async_runtime import AsyncRuntime
+            self.async_runtime = AsyncRuntime(self)
+        # key presses and releases buffered by the key callbacks until the next tick
+        self.input: InputQueue = InputQueue(self._keybindings())
         # add event listeners for keys as dict with bound methods to player object
         self._attach_controls()
         # update screen initially
         self.screen.update_screen()
         self.running = True
+        # duration of a single simulation tick in seconds
+        self.tick_duration: float = 1 / TICKS_PER_SECOND
 
     def play(self) -> None:
         """starts the game and handles the restart logic"""
@@ -31,55 +143,200 @@ class Game:
                 break
             # reset the game objects for further round
             self.reset()
+        # flush the highscore still pending in the background writer
+        self.highscore.close()
+        if self.async_runtime is not None:
+            self.async_runtime.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
 
     def run(self) -> None:
         """
         - runs the game loop until the game ends due to an end state
-        - continuously execute game loop with time delay and updating screen
+        - fixed timestep loop: elapsed real time is collected in an accumulator and consumed in fixed simulation ticks
+        - simulation ticks run at a deterministic rate independent of the time rendering takes
+        - rendering happens once per loop iteration; under load several ticks run per frame and frames are dropped
+        - loop sleeps until the next tick is due instead of spinning
+        """
+        if self.async_runtime is not None:
+            self.async_runtime.run()
+            return
+        accumulator: float = 0.0
+        previous_time: float = time.perf_counter()
+        while self.running:
+            current_time: float = time.perf_counter()
+            frame_time: float = current_time - previous_time
+            accumulator += min(frame_time, MAX_FRAME_TIME)
+            previous_time = current_time
+            accumulator = self._catch_up(accumulator, frame_time)
+            self._render()
+            # idle until the next tick is due
+            time.sleep(max(0.0, self.tick_duration - accumulator))
+        self._save_recording()
+        self._save_run()
+        self._export_trace()
+        self._finish_animations()
+
+    def _finish_animations(self) -> None:
+        """renders frames until running animations like the explosion are done; tk events are handled meanwhile"""
+        while self.animations.running:
+            self._render()
+            deadline: Optional[float] = self.animations.next_deadline
+            if deadline is not None:
+                time.sleep(min(self.tick_duration, max(0.0, deadline - time.perf_counter())))
+
+    def _catch_up(self, accumulator: float, frame_time: float) -> float:
+        """runs all ticks due since the last frame; returns the remaining accumulated time"""
+        while accumulator >= self.tick_duration and self.running:
+            self._tick()
+            accumulator -= self.tick_duration
+            if self.telemetry is not None:
+                self._record_telemetry(frame_time)
+        return accumulator
+
+    def replay(self, recording: Recording, render: bool = True) -> None:
+        """
+        - re-runs a recorded session with the seed and key presses of the recording as fast as possible
+        - no sleeping between the ticks; updating the screen after every tick is optional
+        """
+        self.reset(seed=recording.seed)
+        self.replaying = True
+        actions_per_tick: Dict[int, List[str]] = recording.events_per_tick()
+        moves: Dict[str, Callable] = self._keybindings()
+        end_tick: int = recording.end_tick or max(actions_per_tick, default=0) + 1
+        while self.running and self.ticks < end_tick:
+            for action in actions_per_tick.get(self.ticks, []):
+                moves[action]()
+            self._tick()
+            if render:
+                self.screen.update_screen()
+        self.replaying = False
+
+    def _tick(self) -> None:
+        """
+        - one simulation tick with fixed duration
+        - apply the key input buffered since the last tick; replays apply the recorded moves themselves
         - update the blocks by moving them, adding new batches (when conditions met) and removing ones beyond screen
         - check for end state "player <> block collisions"
         - check if player levels up by reaching top boundary
         """
-        while self.running:
-            # get value from block class dictating game speed
-            time.sleep(self.blocks.speed)
-            self.screen.update_screen()
-            self._update_game_state()
-            # check for game end state: if player collides with block, end run loop
-            if check_collision(self.player, self.blocks.block_container):
-                self._handle_collisions()
-                break
-            # check if turtle crossed upper boundary (=goal area); if yes level up
-            if self._player_reached_goal():
-                self._level_up()
+        if not self.replaying:
+            self._apply_input()
+        self.ticks += 1
+        self._update_game_state()
+        # check for game end state: if player collides with block, end run loop
+        if self._collides():
+            self._handle_collisions()
+            return
+        # check if turtle crossed upper boundary (=goal area); if yes level up
+        if self._player_reached_goal():
+            self._level_up()
 
-    def reset(self) -> None:
-        """resets the game state for a new game session"""
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        - resets the game state for a new game session
+        - every session is seeded anew and starts with a first block batch like a freshly started game
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.recording = Recording(self.seed)
+        self.ticks = 0
         self.blocks.reset()
+        self.blocks.add_blocks()
+        self.animations.clear()
         self.player.reset()
         self.scoreboard.reset_level()
+        self.input.clear()
         self._attach_controls()
         # restart game loop
         self.running = True
 
-    def _attach_controls(self) -> None:
-        """attach event handlers to player on init game and restart game"""
-        keybindings: Dict = {
+    def _keybindings(self) -> Dict[str, Callable]:
+        """maps the keys to the bound movement methods of the player"""
+        return {
             "Up": self.player.move_up,
             "Down": self.player.move_down,
             "Right": self.player.move_right,
             "Left": self.player.move_left
         }
-        # use dict as arg to bind keys
-        self.screen.attach_event_listeners(keybindings)
+
+    def _attach_controls(self) -> None:
+        """attach event handlers on init game and restart game; movement keys only feed the input queue"""
+        self.screen.attach_key_listeners(self.input.keys, self.input.press, self.input.release)
+        if self.profiler is not None:
+            export: Callable = self._export_trace
+            if self.async_runtime is not None:
+                export = self.async_runtime.offload(export)
+            self.screen.attach_event_listeners({"F9": export})
+
+    def _apply_input(self) -> None:
+        """drains the input queue once per tick; every move is recorded with the amount of completed ticks"""
+        moves: Dict[str, Callable] = self._keybindings()
+        for key in self.input.drain():
+            self.recording.add(self.ticks, key)
+            moves[key]()
+
+    def _save_recording(self) -> None:
+        """saves the recording of the finished run with its end tick to its own file if a record path is set"""
+        self.recording.end_tick = self.ticks
+        if self.record_path and not self.replaying:
+            self.recorded_runs += 1
+            self.recording.save(run_path(self.record_path, self.recorded_runs))
+
+    def _instrument(self, profiler: FrameProfiler) -> None:
+        """
+        - replaces the phase methods of this instance once by timed wrappers recording into the profiler
+        - without profiler the methods stay untouched; the loop runs without any timing overhead
+        """
+        self._tick = profiler.wrap("tick", self._tick)
+        self._apply_input = profiler.wrap("input", self._apply_input)
+        self._update_game_state = profiler.wrap("update_blocks", self._update_game_state)
+        self._collides = profiler.wrap("check_collision", self._collides)
+        self._render = profiler.wrap("update_screen", self._render)
+        self._level_up = profiler.wrap("level_up", self._level_up)
+        self._save_highscore = profiler.wrap("highscore_write", self._save_highscore)
+
+    def _export_trace(self) -> None:
+        """writes the chrome trace of the buffered phase timings if profiling is enabled"""
+        if self.profiler is not None and self.trace_path:
+            self.profiler.export(self.trace_path)
+
+    def _render(self) -> None:
+        """runs the due keyframes of the animations and draws the current state; called once per frame"""
+        self.animations.run_due()
+        self.screen.update_screen()
+
+    def _record_telemetry(self, frame_time: float) -> None:
+        """writes the state after the tick and the duration of the frame the tick ran in to the telemetry file"""
+        self.telemetry.write(
+            self.ticks,
+            self.scoreboard.level,
+            self.blocks.count,
+            self.player.get_xcor(),
+            self.player.get_ycor(),
+            frame_time * 1000
+        )
+
+    def _save_run(self) -> None:
+        """adds the finished run with its level and played time to the leaderboard; replays are not added"""
+        if not self.replaying:
+            self.highscore.add_run(self.player_name, self.scoreboard.level, self.ticks / TICKS_PER_SECOND)
 
     def _update_game_state(self) -> None:
-        """handles game state updates per frame (block movement, adding/removing blocks)"""
+        """handles game state updates per tick (block movement, adding/removing blocks)"""
         self.blocks.update_blocks()
 
+    def _collides(self) -> bool:
+        """
+        - checks for player <> block collisions
+        - BlockManager only looks at the lane indexed blocks near the player, ArrayBlockManager at all blocks at once
+        """
+        return self.blocks.check_collision(self.player)
+
     def _handle_collisions(self) -> None:
         """handles logic when the player collides with a block; sets running flag to false"""
-        collision_animation(self.player, self.screen)
+        if not self.replaying:
+            collision_animation(self.player, self.animations)
         self.running = False
 
     def _player_reached_goal(self) -> bool:
@@ -89,10 +346,23 @@ class Game:
     def _level_up(self) -> None:
         """handles leveling up logic, updating scores, and increasing difficulty"""
         self.scoreboard.increase_level()
-        # update highscore if necessary for new reached level
-        self.highscore.update_highscore(self.scoreboard.level)
+        self._save_highscore()
         self.player.reset_position()
         self.blocks.increase_difficulty(self.scoreboard.level)
+        if not self.replaying:
+            # the teleport itself is immediate for the collision checks; the blinks only show it
+            self.animations.play("level", blink(self.scoreboard.render_level, LEVEL_FLASH_DURATION, LEVEL_FLASH_BLINKS))
+            self.animations.play("teleport", blink(self.player.set_visible, TELEPORT_DURATION, TELEPORT_BLINKS))
+
+    def _save_highscore(self) -> None:
+        """updates highscore if necessary for new reached level; a new highscore flashes; replays write no highscores"""
+        if self.replaying:
+            return
+        previous: int = self.highscore.highscore
+        self.highscore.update_highscore(self.scoreboard.level)
+        if self.highscore.highscore > previous:
+            flash: List = blink(self.highscore.render_highscore, LEVEL_FLASH_DURATION, LEVEL_FLASH_BLINKS)
+            self.animations.play("highscore", flash)
 
     def _ask_restart(self) -> bool:
         """prompts the player to restart the game"""
@@ -105,7 +375,33 @@ class Game:
 
 def main() -> None:
     """init game screen and objects, sets up event listeners, runs game loop"""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Road Rage Royal")
+    parser.add_argument("--seed", type=int, help="seed for reproducible block batches of the first run")
+    parser.add_argument(
+        "--record", metavar="PATH",
+        help="record seed and key presses of every run to this file; restarts to numbered files (PATH.2, ...)"
+    )
+    parser.add_argument("--trace", metavar="PATH", help="time the frame phases and export a chrome trace to this file")
+    parser.add_argument("--renderer", choices=RENDERERS, default="turtle", help="rendering backend (default turtle)")
+    parser.add_argument("--perf-hud", action="store_true", help="show live fps, tick time and block count")
+    parser.add_argument("--name", default="player", help="player name for the leaderboard (default player)")
+    parser.add_argument("--telemetry", metavar="PATH", help="stream per-tick metrics to this memory-mapped ring file")
+    parser.add_argument("--runtime", choices=RUNTIMES, default="sync", help="game loop runtime (default sync)")
+    parser.add_argument(
+        "--compound-batches", action="store_true", help="draw every block batch with one turtle (turtle renderer)"
+    )
+    args = parser.parse_args()
+    game = Game(
+        seed=args.seed,
+        record_path=args.record,
+        trace_path=args.trace,
+        renderer=args.renderer,
+        perf_hud=args.perf_hud,
+        player_name=args.name,
+        telemetry_path=args.telemetry,
+        runtime=args.runtime,
+        compound_batches=args.compound_batches
+    )
     game.play()
 
 
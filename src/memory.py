@@ -0,0 +1,149 @@
+"""
+- memory report of long game sessions: traced python allocations, live turtles and tk canvas items
+- tracemalloc snapshots are compared to a baseline snapshot; the biggest growths are reported per source line
+- soak() plays a seeded game for many ticks with a random player and samples the report at fixed intervals
+- usage:
+    python3 -m src.memory [--ticks 100000] [--renderer canvas] [--top 10]
+"""
+from random import Random
+from typing import List, NamedTuple, Optional, Tuple
+import argparse
+import tracemalloc
+
+# frames kept per traced allocation; one frame is enough to group the growth by source line
+TRACE_FRAMES: int = 1
+# ticks played before the baseline snapshot; pools, caches and shapes are warmed up by then
+WARMUP_TICKS: int = 5000
+# ticks between two rendered frames of the soak; like a frame every few ticks under load
+RENDER_INTERVAL: int = 10
+# ticks between two key presses of the random player
+PRESS_INTERVAL: int = 5
+
+
+class MemoryReport(NamedTuple):
+    """one sample of the memory report; bytes of the traced python allocations"""
+    ticks: int
+    traced_bytes: int
+    peak_bytes: int
+    growth_bytes: int
+    turtles: int
+    canvas_items: int
+    top_growth: Tuple[Tuple[str, int], ...]
+
+
+class MemoryMonitor:
+    """
+    - traces python allocations with tracemalloc from start() on and compares snapshots to the baseline of start()
+    - counts turtles registered at the screen and items on the tk canvas; both never shrink if objects leak
+    - tracing has overhead; the monitor is only created for reports and soak tests, never in a normal game
+    """
+    def __init__(self, screen, top: int = 10) -> None:
+        self.screen = screen
+        self.top: int = top
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        # tracing started by this monitor and stopped again by stop()
+        self._started: bool = False
+
+    def start(self) -> None:
+        """starts tracing if not running yet and takes the baseline snapshot"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started = True
+        tracemalloc.reset_peak()
+        self._baseline = self._snapshot()
+
+    def report(self, ticks: int = 0) -> MemoryReport:
+        """current sample with the biggest growths since the baseline per source line"""
+        snapshot: tracemalloc.Snapshot = self._snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        growth: int = 0
+        top_growth: List[Tuple[str, int]] = []
+        if self._baseline is not None:
+            differences = snapshot.compare_to(self._baseline, "lineno")
+            growth = sum(difference.size_diff for difference in differences)
+            top_growth = [
+                (str(difference.traceback), difference.size_diff) for difference in differences[:self.top]
+                if difference.size_diff > 0
+            ]
+        return MemoryReport(
+            ticks, traced, peak, growth, self.screen.turtle_count(), self.screen.canvas_item_count(), tuple(top_growth)
+        )
+
+    def stop(self) -> None:
+        """stops tracing if this monitor started it"""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self._baseline = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """snapshot without the allocations of tracemalloc itself"""
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ])
+
+
+def soak(
+    ticks: int = 100000,
+    renderer: str = "turtle",
+    seed: int = 0,
+    samples: int = 10,
+    warmup_ticks: int = WARMUP_TICKS,
+    top: int = 10
+) -> List[MemoryReport]:
+    """
+    - plays a seeded game for warmup_ticks plus ticks; a random player presses mostly up, crashed games restart
+    - returns the baseline report after the warm-up and samples more reports spread over the ticks
+    """
+    # imported here; the report itself does not need the game
+    from src.main import Game
+    game = Game(seed=seed, renderer=renderer)
+    rng: Random = Random(seed)
+    monitor: MemoryMonitor = MemoryMonitor(game.screen, top)
+    reports: List[MemoryReport] = []
+    sample_interval: int = max(1, ticks // max(1, samples))
+    try:
+        for tick in range(warmup_ticks + ticks):
+            if tick == warmup_ticks:
+                monitor.start()
+                reports.append(monitor.report(0))
+            if tick % PRESS_INTERVAL == 0:
+                key: str = rng.choice(("Up", "Up", "Up", "Left", "Right", "Down"))
+                game.input.press(key)
+                game.input.release(key)
+            game._tick()
+            if tick % RENDER_INTERVAL == 0:
+                game._render()
+            if not game.running:
+                game.reset(seed=rng.getrandbits(32))
+            played: int = tick + 1 - warmup_ticks
+            if played > 0 and played % sample_interval == 0:
+                reports.append(monitor.report(played))
+    finally:
+        monitor.stop()
+        game.highscore.close()
+    return reports
+
+
+def main() -> None:
+    """command line entry point printing the samples of a soak run and the biggest growths"""
+    parser = argparse.ArgumentParser(description="memory report of a long Road Rage Royal session")
+    parser.add_argument("--ticks", type=int, default=100000, help="ticks to play after the warm-up (default 100000)")
+    parser.add_argument("--renderer", choices=["turtle", "canvas"], default="turtle", help="rendering backend")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the game and the random player (default 0)")
+    parser.add_argument("--top", type=int, default=10, help="source lines with the biggest growth (default 10)")
+    args = parser.parse_args()
+    reports: List[MemoryReport] = soak(args.ticks, args.renderer, args.seed, top=args.top)
+    print("   ticks   traced KiB   growth KiB  turtles  canvas items")
+    for report in reports:
+        print(f"{report.ticks:>8}  {report.traced_bytes / 1024:>11.1f}  {report.growth_bytes / 1024:>11.1f}  "
+              f"{report.turtles:>7}  {report.canvas_items:>12}")
+    print("biggest growth since the baseline:")
+    for line, size in reports[-1].top_growth:
+        print(f"{size / 1024:>9.1f} KiB  {line}")
+
+
+if __name__ == "__main__":
+    main()
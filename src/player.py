@@ -22,7 +22,8 @@ class Player:
         direction: int = 90,
         move_distance: int = 10
     ) -> None:
-        self._turtle_player = Turtle()
+        # no undo history; the default buffer keeps the last 1000 moves of the turtle
+        self._turtle_player = Turtle(undobuffersize=0)
         self._turtle_player.shape("assets/car.gif")
         self._turtle_player.penup()
         self._turtle_player.goto(start_x, start_y)
@@ -85,6 +86,14 @@ class Player:
         """reset player position and shape after collision and player wants further round"""
         self.reset_position()
         self._turtle_player.shape("assets/car.gif")
+        self._turtle_player.showturtle()
+
+    def set_visible(self, visible: bool) -> None:
+        """shows or hides the player, e.g. for blinking animations; collisions are checked either way"""
+        if visible:
+            self._turtle_player.showturtle()
+        else:
+            self._turtle_player.hideturtle()
 
     def get_ycor(self) -> float:
         """deliver the y-coordinate to outside class callees, since _turtle_player is private"""
@@ -0,0 +1,96 @@
+from array import array
+from typing import Any, Callable, Dict, List
+import json
+import time
+
+# default amount of samples kept in the ring buffer; oldest samples are overwritten
+DEFAULT_CAPACITY: int = 65536
+
+
+class FrameProfiler:
+    """
+    - low overhead phase timers for the game loop keeping samples in a fixed-size ring buffer
+    - phases are timed by wrapping the callables once on setup; without profiler nothing is wrapped at all
+    - buffers are preallocated arrays; recording a sample writes three slots and does not grow any container
+    - samples are exported as chrome trace-event json (chrome://tracing, perfetto) on demand
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity: int = capacity
+        # phase ids, start timestamps and durations in ns of the samples; slot = sample number % capacity
+        self._phase_ids = array("B", bytes(capacity))
+        self._starts = array("q", bytes(8 * capacity))
+        self._durations = array("q", bytes(8 * capacity))
+        # total amount of samples recorded so far
+        self.recorded: int = 0
+        self._phase_names: List[str] = []
+        self._phase_lookup: Dict[str, int] = {}
+        # timestamp all trace timestamps are relative to
+        self._origin_ns: int = time.perf_counter_ns()
+
+    def _phase_id(self, name: str) -> int:
+        """delivers the id of a phase name; registers unknown names"""
+        if name not in self._phase_lookup:
+            if len(self._phase_names) >= 256:
+                raise ValueError("profiler supports max. 256 phases")
+            self._phase_lookup[name] = len(self._phase_names)
+            self._phase_names.append(name)
+        return self._phase_lookup[name]
+
+    def record(self, phase_id: int, start_ns: int, end_ns: int) -> None:
+        """writes one sample into the ring buffer overwriting the oldest one when full"""
+        slot: int = self.recorded % self.capacity
+        self._phase_ids[slot] = phase_id
+        self._starts[slot] = start_ns
+        self._durations[slot] = end_ns - start_ns
+        self.recorded += 1
+
+    def wrap(self, name: str, function: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        - returns a callable executing the function and recording its duration as sample of the named phase
+        - phases are methods without arguments; the wrapper takes none either, so no argument tuple or dict is
+          packed per call
+        """
+        phase_id: int = self._phase_id(name)
+        record: Callable = self.record
+        clock: Callable = time.perf_counter_ns
+
+        def timed():
+            start: int = clock()
+            result = function()
+            record(phase_id, start, clock())
+            return result
+        return timed
+
+    def samples(self) -> List[Dict]:
+        """delivers the buffered samples from oldest to newest with phase name, start and duration in ns"""
+        amount: int = min(self.recorded, self.capacity)
+        first: int = self.recorded - amount
+        result: List[Dict] = []
+        for number in range(first, self.recorded):
+            slot: int = number % self.capacity
+            result.append({
+                "phase": self._phase_names[self._phase_ids[slot]],
+                "start_ns": self._starts[slot],
+                "duration_ns": self._durations[slot]
+            })
+        return result
+
+    def trace_events(self) -> Dict:
+        """buffered samples as chrome trace-event json object with complete events in microseconds"""
+        events: List[Dict] = [
+            {
+                "name": sample["phase"],
+                "ph": "X",
+                "ts": (sample["start_ns"] - self._origin_ns) / 1000,
+                "dur": sample["duration_ns"] / 1000,
+                "pid": 1,
+                "tid": 1
+            }
+            for sample in self.samples()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        """writes the chrome trace-event json of the buffered samples to path"""
+        with open(path, "w") as file:
+            json.dump(self.trace_events(), file)
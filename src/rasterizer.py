@@ -0,0 +1,177 @@
+"""
+- offscreen renderer drawing the headless game state into numpy frame buffers; no tk, no display
+- frames are rgb (height, width, 3) or grayscale (height, width) uint8 arrays at any resolution, e.g. 84x84 for bots
+- static parts (background, boundary lines, zones) are drawn once; a frame copies them and draws blocks and player
+- usage:
+    python3 -m src.rasterizer [--frames 5000] [--size 84] [--grayscale] [--gif frames.gif]
+"""
+from src.simulation import HeadlessScreen, Simulation
+from src.gif import read_gif, write_gif
+from typing import Dict, List, Optional, Tuple
+from random import Random
+import argparse
+import time
+import numpy as np
+
+# colors of the static parts; the zone texts of GameScreen are drawn as light bands of the safe zone and target area
+BACKGROUND_COLOR: Tuple[int, int, int] = (255, 255, 255)
+LINE_COLOR: Tuple[int, int, int] = (0, 0, 0)
+ZONE_COLOR: Tuple[int, int, int] = (235, 235, 235)
+# luminance weights in 1/256 (bt.601), sum 256; integer math keeps grayscale conversion exact and fast
+LUMA_WEIGHTS: np.ndarray = np.array([77, 150, 29], dtype=np.uint16)
+
+
+def to_grayscale(pixels: np.ndarray) -> np.ndarray:
+    """luminance of rgb uint8 pixels in the last axis as uint8"""
+    return ((pixels.astype(np.uint16) * LUMA_WEIGHTS).sum(axis=-1) >> 8).astype(np.uint8)
+
+
+class Rasterizer:
+    """
+    - draws HeadlessPlayer and ArrayBlockManager state (e.g. of a Simulation) into one preallocated frame buffer
+    - game coordinates are scaled to the frame size; y points up in the game and down in the frame
+    - block rectangles are filled with one slice assignment each; their pixel bounds are computed for all at once
+    - player sprites are decoded from the gifs once, scaled to the frame and pasted through their alpha mask
+    - render() returns the same buffer every call; copy the frame to keep it beyond the next call
+    """
+    def __init__(
+        self,
+        width: int = 84,
+        height: int = 84,
+        grayscale: bool = False,
+        screen: Optional[HeadlessScreen] = None
+    ) -> None:
+        self.screen = screen if screen is not None else HeadlessScreen()
+        self.width: int = width
+        self.height: int = height
+        self.grayscale: bool = grayscale
+        self._scale_x: float = width / self.screen.width
+        self._scale_y: float = height / self.screen.height
+        self.background: np.ndarray = self._draw_background()
+        self.frame: np.ndarray = self.background.copy()
+        # scaled pixels and alpha mask per shape name
+        self._sprites: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def render(self, player, blocks) -> np.ndarray:
+        """draws background, blocks and the visible player into the frame buffer and returns it"""
+        frame: np.ndarray = self.frame
+        np.copyto(frame, self.background)
+        if blocks.count:
+            self._draw_blocks(blocks)
+        if player.visible:
+            self._draw_sprite(player.shape, player.x, player.y)
+        return frame
+
+    def to_column(self, x) -> np.ndarray:
+        """frame column of game x-coordinates"""
+        return np.floor((np.asarray(x) + self.screen.width / 2) * self._scale_x).astype(np.int64)
+
+    def to_row(self, y) -> np.ndarray:
+        """frame row of game y-coordinates"""
+        return np.floor((self.screen.height / 2 - np.asarray(y)) * self._scale_y).astype(np.int64)
+
+    def _draw_blocks(self, blocks) -> None:
+        """fills the rectangles of all blocks; blocks smaller than a pixel still cover one"""
+        xs, ys, half_widths, half_heights = blocks.xs, blocks.ys, blocks.widths / 2, blocks.heights / 2
+        left: np.ndarray = self.to_column(xs - half_widths)
+        right: np.ndarray = np.maximum(self.to_column(xs + half_widths), left + 1)
+        top: np.ndarray = self.to_row(ys + half_heights)
+        bottom: np.ndarray = np.maximum(self.to_row(ys - half_heights), top + 1)
+        np.clip(left, 0, self.width, out=left)
+        np.clip(right, 0, self.width, out=right)
+        np.clip(top, 0, self.height, out=top)
+        np.clip(bottom, 0, self.height, out=bottom)
+        colors: np.ndarray = to_grayscale(blocks.colors) if self.grayscale else blocks.colors
+        frame: np.ndarray = self.frame
+        bounds = zip(left.tolist(), right.tolist(), top.tolist(), bottom.tolist(), colors.tolist())
+        for x0, x1, y0, y1, color in bounds:
+            frame[y0:y1, x0:x1] = color
+
+    def _draw_sprite(self, shape: str, x: float, y: float) -> None:
+        """pastes the sprite of the shape centered at the game coordinates; parts outside the frame are cut off"""
+        pixels, mask = self._sprite(shape)
+        sprite_height, sprite_width = mask.shape
+        top: int = int(self.to_row(y)) - sprite_height // 2
+        left: int = int(self.to_column(x)) - sprite_width // 2
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + sprite_height, self.height), min(left + sprite_width, self.width)
+        if y0 >= y1 or x0 >= x1:
+            return
+        region: Tuple[slice, slice] = (slice(y0 - top, y1 - top), slice(x0 - left, x1 - left))
+        np.copyto(self.frame[y0:y1, x0:x1], pixels[region], where=mask[region] if self.grayscale
+                  else mask[region][..., None])
+
+    def _sprite(self, shape: str) -> Tuple[np.ndarray, np.ndarray]:
+        """scaled pixels and alpha mask of a shape; decoded and scaled on first use"""
+        if shape not in self._sprites:
+            image: np.ndarray = read_gif(shape)
+            image_height, image_width = image.shape[:2]
+            # gifs are drawn in their own size by turtle, so they scale like the rest of the screen
+            sprite_height: int = max(1, round(image_height * self._scale_y))
+            sprite_width: int = max(1, round(image_width * self._scale_x))
+            rows: np.ndarray = ((np.arange(sprite_height) + 0.5) * image_height / sprite_height).astype(np.int64)
+            columns: np.ndarray = ((np.arange(sprite_width) + 0.5) * image_width / sprite_width).astype(np.int64)
+            scaled: np.ndarray = image[rows[:, None], columns]
+            pixels: np.ndarray = to_grayscale(scaled[..., :3]) if self.grayscale else scaled[..., :3].copy()
+            self._sprites[shape] = (pixels, scaled[..., 3] > 0)
+        return self._sprites[shape]
+
+    def _draw_background(self) -> np.ndarray:
+        """white frame with the zone bands below the start line and above the finish line and both lines"""
+        screen = self.screen
+        frame: np.ndarray = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        frame[:] = BACKGROUND_COLOR
+        left, right = int(self.to_column(screen.left_boundary)), int(self.to_column(screen.right_boundary)) + 1
+        top_row, bottom_row = int(self.to_row(screen.top_boundary)), int(self.to_row(screen.bottom_boundary))
+        frame[:top_row] = ZONE_COLOR
+        frame[bottom_row + 1:] = ZONE_COLOR
+        frame[[top_row, bottom_row], max(left, 0):min(right, self.width)] = LINE_COLOR
+        return to_grayscale(frame) if self.grayscale else frame
+
+
+def benchmark(
+    frames: int = 5000,
+    size: int = 84,
+    grayscale: bool = False,
+    seed: int = 0,
+    gif_path: Optional[str] = None
+) -> float:
+    """
+    - plays a seeded Simulation with a random player and renders every tick; returns the frames per second
+    - only rendering is timed; crashed games restart with the next seed
+    - with gif_path the frames are written to an animated gif afterwards
+    """
+    simulation: Simulation = Simulation(seed=seed)
+    rasterizer: Rasterizer = Rasterizer(size, size, grayscale, simulation.screen)
+    rng: Random = Random(seed)
+    kept: List[np.ndarray] = []
+    elapsed: float = 0.0
+    for tick in range(frames):
+        action: Optional[str] = rng.choice(("Up", "Up", "Left", "Right", "Down")) if tick % 5 == 0 else None
+        if not simulation.step(action):
+            simulation.reset(seed + tick)
+        start: float = time.perf_counter()
+        frame: np.ndarray = rasterizer.render(simulation.player, simulation.blocks)
+        elapsed += time.perf_counter() - start
+        if gif_path is not None:
+            kept.append(frame.copy())
+    if gif_path is not None:
+        write_gif(gif_path, kept, 1 / 50)
+    return frames / elapsed
+
+
+def main() -> None:
+    """command line entry point measuring the frames per second"""
+    parser = argparse.ArgumentParser(description="measure the offscreen rasterizer of Road Rage Royal")
+    parser.add_argument("--frames", type=int, default=5000, help="frames to render (default 5000)")
+    parser.add_argument("--size", type=int, default=84, help="width and height of the frames in px (default 84)")
+    parser.add_argument("--grayscale", action="store_true", help="render grayscale instead of rgb frames")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulation and the player (default 0)")
+    parser.add_argument("--gif", default=None, help="writes the frames to this animated gif")
+    args = parser.parse_args()
+    fps: float = benchmark(args.frames, args.size, args.grayscale, args.seed, args.gif)
+    print(f"{args.frames} frames of {args.size}x{args.size}: {fps:,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+- deterministic replay of recorded game runs
+- a recording holds the seed of the run and a tick-stamped log of all key presses in a compact binary file
+- replaying re-runs the session without sleeping as fast as the CPU allows; headless or rendered with turtle
+- usage:
+    python3 -m src.replay path/to/run.rrr [--render]
+"""
+from src.simulation import Simulation
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import os
+import struct
+import time
+
+# key names in the order of their one-byte codes within recording files; same keys as in Game._attach_controls
+ACTIONS: Tuple[str, ...] = ("Up", "Down", "Right", "Left")
+# file header: magic bytes, format version, seed, tick of the game end, amount of events
+HEADER_FORMAT: str = "<4sBQII"
+MAGIC: bytes = b"RRRC"
+# version 2: runs of Game spawn their block batches with a SpawnGenerator
+VERSION: int = 2
+# single event: tick in which the key was pressed (= amount of ticks completed before) and action code
+EVENT_FORMAT: str = "<IB"
+
+
+def run_path(path: str, run: int) -> str:
+    """file path of the recording of the run-th run of a session: the path itself for run 1, e.g. last.2.rrr for run 2"""
+    if run <= 1:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{run}{extension}"
+
+
+class Recording:
+    """seed and tick-stamped input events of one game run; saved to and loaded from a compact binary file"""
+    def __init__(self, seed: int, events: Optional[List[Tuple[int, str]]] = None, end_tick: int = 0) -> None:
+        self.seed: int = seed
+        # list of (tick, action) in the order the keys were pressed
+        self.events: List[Tuple[int, str]] = events if events is not None else []
+        # amount of ticks of the run; 0 while the run is not finished
+        self.end_tick: int = end_tick
+
+    def add(self, tick: int, action: str) -> None:
+        """records a key press before the tick following the delivered amount of completed ticks"""
+        self.events.append((tick, action))
+
+    def events_per_tick(self) -> Dict[int, List[str]]:
+        """groups the actions by tick keeping their order"""
+        grouped: Dict[int, List[str]] = {}
+        for tick, action in self.events:
+            grouped.setdefault(tick, []).append(action)
+        return grouped
+
+    def save(self, path: str) -> None:
+        """writes header and all events as packed binary records to the file at path"""
+        with open(path, "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.seed, self.end_tick, len(self.events)))
+            file.write(b"".join(struct.pack(EVENT_FORMAT, tick, ACTIONS.index(action)) for tick, action in self.events))
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        """reads a recording file written by save; raises ValueError for files of unknown format"""
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+        header_size: int = struct.calcsize(HEADER_FORMAT)
+        if len(data) < header_size:
+            raise ValueError(f"{path} is no recording file")
+        magic, version, seed, end_tick, amount = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is no recording file of version {VERSION}")
+        events_end: int = header_size + amount * struct.calcsize(EVENT_FORMAT)
+        events: List[Tuple[int, str]] = [
+            (tick, ACTIONS[code]) for tick, code in struct.iter_unpack(EVENT_FORMAT, data[header_size:events_end])
+        ]
+        return cls(seed, events, end_tick)
+
+
+def replay(
+    recording: Recording,
+    on_tick: Optional[Callable[[Simulation], None]] = None,
+    max_ticks: Optional[int] = None
+) -> Simulation:
+    """
+    - re-runs the recorded session headless with the Simulation without sleeping
+    - recorded key presses are applied between the ticks exactly as they happened in Game
+    - optional on_tick callable receives the simulation after every tick, e.g. to render or inspect the state
+    - runs until the collision, the recorded end tick or max_ticks is reached; returns the simulation for inspection
+    """
+    simulation: Simulation = Simulation(seed=recording.seed, solvable=True)
+    actions_per_tick: Dict[int, List[str]] = recording.events_per_tick()
+    # without recorded end the run is replayed until the last key press had its effect
+    end_tick: int = recording.end_tick or max(actions_per_tick, default=0) + 1
+    if max_ticks is not None:
+        end_tick = min(end_tick, max_ticks)
+    while simulation.running and simulation.ticks < end_tick:
+        for action in actions_per_tick.get(simulation.ticks, []):
+            simulation.act(action)
+        simulation.step()
+        if on_tick is not None:
+            on_tick(simulation)
+    return simulation
+
+
+def main() -> None:
+    """command line entry point replaying a recording file and printing the result"""
+    parser = argparse.ArgumentParser(description="replay a recorded Road Rage Royal run")
+    parser.add_argument("path", help="recording file written with run.py --record")
+    parser.add_argument("--render", action="store_true", help="show the replay in the turtle window")
+    args = parser.parse_args()
+    recording: Recording = Recording.load(args.path)
+    start: float = time.perf_counter()
+    if args.render:
+        # imported here; the turtle window is only needed for rendered replays
+        from src.main import Game
+        game = Game(seed=recording.seed)
+        try:
+            game.replay(recording)
+        finally:
+            # flushes the write-behind highscore db; replays themselves write no highscores
+            game.highscore.close()
+        level, ticks, crashed = game.scoreboard.level, game.ticks, not game.running
+    else:
+        simulation: Simulation = replay(recording)
+        level, ticks, crashed = simulation.level, simulation.ticks, not simulation.running
+    elapsed: float = time.perf_counter() - start
+    print(f"seed {recording.seed}: level {level} after {ticks} ticks, crashed: {crashed}")
+    print(f"replayed in {elapsed:.3f}s ({ticks / elapsed if elapsed else 0:.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
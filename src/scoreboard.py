@@ -1,63 +1,91 @@
 from src.highscore_db import HighscoreDB
 from turtle import Turtle
+from typing import Callable, Optional
 
 
 class Scoreboard:
-    """manage the scoreboard logic showing the level of the current game; start values -70 and 257 by testing"""
+    """
+    - manage the scoreboard logic showing the level of the current game; start values -70 and 257 by testing
+    - text is written by a turtle; optional label factory creates a label object with write(text) instead
+    """
     def __init__(
         self,
         start_x: int = -70,
         start_y: int = 257,
         text_alignment: str = "left",
-        font_type: str = "Courier"
+        font_type: str = "Courier",
+        label_factory: Optional[Callable] = None
     ) -> None:
         self.level: int = 1
         self.text_alignment = text_alignment
         self.font_type = font_type
-        self._turtle = Turtle()
-        self._turtle.penup()
-        self._turtle.hideturtle()
-        self._turtle.goto(start_x, start_y)
+        self._turtle: Optional[Turtle] = None
+        self._label = None
+        if label_factory is not None:
+            self._label = label_factory(start_x, start_y, text_alignment, (font_type, 30, "bold"))
+        else:
+            self._turtle = Turtle(undobuffersize=0)
+            self._turtle.penup()
+            self._turtle.hideturtle()
+            self._turtle.goto(start_x, start_y)
         self.render_level()
 
-    def render_level(self) -> None:
-        """render the current level to the UI"""
-        level: str = f"Level {self.level}"
-        self._turtle.write(level, align=self.text_alignment, font=(self.font_type, 30, "bold"))
+    def render_level(self, visible: bool = True) -> None:
+        """render the current level to the UI; hidden e.g. for flashing it"""
+        level: str = f"Level {self.level}" if visible else ""
+        if self._label is not None:
+            self._label.write(level)
+        elif visible:
+            self._turtle.write(level, align=self.text_alignment, font=(self.font_type, 30, "bold"))
+        else:
+            self._turtle.clear()
 
     def increase_level(self) -> None:
         """update level counter and UI"""
         self.level += 1
-        self._turtle.clear()
+        if self._turtle is not None:
+            self._turtle.clear()
         self.render_level()
 
     def reset_level(self) -> None:
         """reset level after game restart"""
         self.level: int = 1
-        self._turtle.clear()
+        if self._turtle is not None:
+            self._turtle.clear()
         self.render_level()
 
 
 class Highscore:
-    """manages the highscore logic showing and updating the highscore over all games played using sqlite3 DB"""
+    """
+    - manages the highscore logic showing and updating the highscore over all games played using sqlite3 DB
+    - text is written by a turtle; optional label factory creates a label object with write(text) instead
+    """
     def __init__(
         self,
         start_x: int = -287,
         start_y: int = 260,
         text_alignment: str = "left",
         font_type: str = "Courier",
-        file_path: str = "data/prod.highscore.db"
+        file_path: str = "data/prod.highscore.db",
+        label_factory: Optional[Callable] = None,
+        write_behind: bool = False
     ) -> None:
         # initiate & set up sqlite3 DB initially with default value 1 if not already existing
-        self.db = HighscoreDB(file_path)
+        # with write-behind new highscores are written by a background thread of the DB
+        self.db = HighscoreDB(file_path, write_behind=write_behind)
         # reads highscore from DB
         self.highscore = self.db.get_highscore()
         self.text_alignment = text_alignment
         self.font_type = font_type
-        self._turtle = Turtle()
-        self._turtle.penup()
-        self._turtle.hideturtle()
-        self._turtle.goto(start_x, start_y)
+        self._turtle: Optional[Turtle] = None
+        self._label = None
+        if label_factory is not None:
+            self._label = label_factory(start_x, start_y, text_alignment, (font_type, 25, "normal"))
+        else:
+            self._turtle = Turtle(undobuffersize=0)
+            self._turtle.penup()
+            self._turtle.hideturtle()
+            self._turtle.goto(start_x, start_y)
         self.render_highscore()
 
     def update_highscore(self, level):
@@ -65,10 +93,24 @@ class Highscore:
         if level > self.highscore:
             self.db.update_highscore(level)
             self.highscore = level
-            self._turtle.clear()
+            if self._turtle is not None:
+                self._turtle.clear()
             self.render_highscore()
 
-    def render_highscore(self) -> None:
-        """render the current level to the UI"""
-        highscore: str = f"Highscore {self.highscore}"
-        self._turtle.write(highscore, align=self.text_alignment, font=(self.font_type, 25, "normal"))
+    def add_run(self, player: str, level: int, duration: float) -> None:
+        """adds the finished run to the leaderboard of the DB"""
+        self.db.add_run(player, level, duration)
+
+    def close(self) -> None:
+        """writes a pending highscore and runs with a bounded wait and closes the DB on game exit"""
+        self.db.close()
+
+    def render_highscore(self, visible: bool = True) -> None:
+        """render the current level to the UI; hidden e.g. for flashing it"""
+        highscore: str = f"Highscore {self.highscore}" if visible else ""
+        if self._label is not None:
+            self._label.write(highscore)
+        elif visible:
+            self._turtle.write(highscore, align=self.text_alignment, font=(self.font_type, 25, "normal"))
+        else:
+            self._turtle.clear()
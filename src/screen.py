@@ -1,5 +1,7 @@
-from turtle import Screen, Turtle
-from typing import Optional, Dict
+from src.hud import CanvasLabel
+from turtle import Screen, Turtle, Shape
+from typing import Callable, Optional, Dict, Iterable, List, Tuple
+import time
 
 # custom shapes for turtle objects need to be registered to the screen
 SHAPE_PATHS = [
@@ -23,6 +25,7 @@ class GameScreen:
     - bottom: drawn threshold above screen bottom; player cannot move down before crossing it; no cars appear below
     - left: player can't cross it; cars are wrecked when crossing it; added 2px space by testing for player shape
     - right: player can't cross it; cars are generated beyond it; added 2px space by testing for player shape
+    - the tk window is created on instantiation, never on import; durations of the start-up phases are kept
     """
     def __init__(
         self,
@@ -37,16 +40,23 @@ class GameScreen:
         self.bottom_boundary: int = int(-(self.height / 2) + 60)
         self.left_boundary: int = int(-(self.width / 2)) + 2
         self.right_boundary: int = int(self.width / 2) - 4
-        # add Screen object
+        # durations of the start-up phases in seconds: window, shapes, decorations; e.g. for start-up reports
+        self.startup_times: Dict[str, float] = {}
+        start: float = time.perf_counter()
+        # add Screen object; creates the tk root on first use
         self._turtle_screen = Screen()
         self._turtle_screen.setup(width=width, height=height)
         self._turtle_screen.title(title)
+        # rgb color tuples for blocks and compound shapes
+        self._turtle_screen.colormode(255)
         # disables automatic screen updates
         self._turtle_screen.tracer(0)
+        window_created: float = time.perf_counter()
         # register custom screens
         self.add_shapes(SHAPE_PATHS)
+        shapes_registered: float = time.perf_counter()
         # add turtle object to draw lines & add texts
-        self._turtle_helper = Turtle()
+        self._turtle_helper = Turtle(undobuffersize=0)
         self._turtle_helper.hideturtle()
         # draw lines with helper turtle
         self.draw_lines()
@@ -54,11 +64,27 @@ class GameScreen:
         self.write_descriptions()
         # mark helper for gc
         self._turtle_helper = None
+        self.startup_times = {
+            "window": window_created - start,
+            "shapes": shapes_registered - window_created,
+            "decorations": time.perf_counter() - shapes_registered
+        }
 
     def add_shapes(self, custom_shapes: list[str]) -> None:
         for shape in custom_shapes:
             self._turtle_screen.register_shape(shape)
 
+    def add_compound_shape(self, name: str, components: List[Tuple[Tuple, Tuple[int, int, int]]]) -> None:
+        """registers a compound shape of filled polygons with their rgb colors; re-registering a name replaces it"""
+        shape = Shape("compound")
+        for polygon, color in components:
+            shape.addcomponent(polygon, color, color)
+        self._turtle_screen.register_shape(name, shape)
+
+    def create_label(self, x: float, y: float, align: str, font: Tuple) -> CanvasLabel:
+        """creates a text item on the turtle canvas for the HUD which is updated in place, e.g. for Scoreboard"""
+        return CanvasLabel(self._turtle_screen.getcanvas(), x, y, align, font)
+
     def draw_lines(self):
         # draw start line at bottom boundary
         self._turtle_helper.teleport(self.left_boundary, self.bottom_boundary)
@@ -83,10 +109,33 @@ class GameScreen:
         for key, action in bindings.items():
             self._turtle_screen.onkey(action, key)
 
+    def attach_key_listeners(self, keys: Iterable[str], on_press: Callable, on_release: Callable) -> None:
+        """adds and activates listeners delivering presses and releases of the keys, e.g. to an InputQueue"""
+        self._turtle_screen.listen()
+        for key in keys:
+            self._turtle_screen.onkeypress(lambda key=key: on_press(key), key)
+            self._turtle_screen.onkeyrelease(lambda key=key: on_release(key), key)
+
     def update_screen(self) -> None:
         """since auto screen update is deactivated by .tracer(0) in init, screen needs to be updated manually"""
         self._turtle_screen.update()
 
+    def turtle_count(self) -> int:
+        """amount of turtles registered at the screen; turtles are never unregistered, e.g. for memory reports"""
+        return len(self._turtle_screen.turtles())
+
+    def canvas_item_count(self) -> int:
+        """amount of items on the tk canvas, e.g. for memory reports"""
+        return len(self._turtle_screen.getcanvas().find_all())
+
+    def process_events(self) -> None:
+        """handles pending tk events like key presses without redrawing the turtles"""
+        self._turtle_screen.getcanvas().update()
+
     def show_prompt(self, headline: str, prompt: str) -> Optional[str]:
         """shows input with headline and prompt on screen; returns received answer as str or None if canceled"""
         return self._turtle_screen.textinput(headline, prompt)
+
+    def close(self) -> None:
+        """closes the turtle window and destroys the tk root"""
+        self._turtle_screen.bye()
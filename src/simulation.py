@@ -0,0 +1,397 @@
+from src.helpers import random_color, create_block_batch, check_collision_vectorized, swept_collision_time
+from src.difficulty import DifficultySchedule
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from random import Random
+import numpy as np
+
+if TYPE_CHECKING:
+    # only needed for type hints; spawn_generator imports the block dimensions of this module
+    from src.spawn_generator import SpawnGenerator
+
+# initial amount of block slots allocated in the arrays; doubles on demand
+INITIAL_CAPACITY: int = 64
+# block dimensions in px matching the stretched "square" turtle shape of Block (stretch_wid=1, stretch_len=2)
+BLOCK_WIDTH: float = 40
+BLOCK_HEIGHT: float = 20
+# gif of the player car; registered as turtle shape by GameScreen
+PLAYER_SHAPE: str = "assets/car.gif"
+
+
+class HeadlessScreen:
+    """
+    - pure-data stand-in for GameScreen holding only the geometry used by the game logic
+    - boundaries are calculated with the identical formulas as in GameScreen, but no Tk window is created
+    """
+    def __init__(self, width: int = 600, height: int = 600) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.top_boundary: int = int((self.height / 2) - 50)
+        self.bottom_boundary: int = int(-(self.height / 2) + 60)
+        self.left_boundary: int = int(-(self.width / 2)) + 2
+        self.right_boundary: int = int(self.width / 2) - 4
+
+    def update_screen(self) -> None:
+        """nothing to render without display; keeps the interface of GameScreen"""
+        pass
+
+
+class HeadlessPlayer:
+    """
+    - pure-data version of Player storing the position as plain ints instead of a turtle
+    - movement rules and boundary checks are identical to Player
+    """
+    def __init__(
+        self,
+        screen,
+        start_x: int = 0,
+        start_y: int = -265,
+        width: int = 15,
+        height: int = 30,
+        move_distance: int = 10
+    ) -> None:
+        self.x: int = start_x
+        self.y: int = start_y
+        # gif drawn by renderers; same shape names as the turtle shapes of Player
+        self.shape: str = PLAYER_SHAPE
+        # drawn by renderers only if visible, e.g. hidden while blinking
+        self.visible: bool = True
+        self.start_x = start_x
+        self.start_y = start_y
+        self.width = width
+        self.height = height
+        self.move_distance = move_distance
+        self.top_boundary = screen.top_boundary
+        self.bottom_boundary = screen.bottom_boundary
+        self.right_boundary = screen.right_boundary
+        self.left_boundary = screen.left_boundary
+
+    def move_up(self) -> None:
+        """moves the player upwards; crossing the top boundary is handled by the level up"""
+        self.y = int(self.y) + self.move_distance
+
+    def move_down(self) -> None:
+        """moves the player downwards; moving below the start threshold at bottom boundary not allowed"""
+        new_y: int = int(self.y) - self.move_distance
+        if new_y >= self.bottom_boundary + (self.height / 2):
+            self.y = new_y
+
+    def move_right(self) -> None:
+        """moves the player right; moving beyond the right screen boundary not allowed"""
+        new_x: int = int(self.x) + self.move_distance
+        if new_x <= self.right_boundary - (self.width / 2):
+            self.x = new_x
+
+    def move_left(self) -> None:
+        """moves the player left; moving beyond the left screen boundary not allowed"""
+        new_x: int = int(self.x) - self.move_distance
+        if new_x >= self.left_boundary + (self.width / 2):
+            self.x = new_x
+
+    def reset_position(self) -> None:
+        """puts the player back to the start position"""
+        self.x, self.y = self.start_x, self.start_y
+
+    def reset(self) -> None:
+        """reset player position and shape after collision"""
+        self.reset_position()
+        self.shape = PLAYER_SHAPE
+        self.visible = True
+
+    def get_ycor(self) -> float:
+        """deliver the y-coordinate in the same way as Player"""
+        return self.y
+
+    def get_xcor(self) -> float:
+        """deliver the x-coordinate in the same way as Player"""
+        return self.x
+
+    def get_width(self) -> int:
+        """deliver width in the same way as Player"""
+        return self.width
+
+    def get_height(self) -> int:
+        """deliver height in the same way as Player"""
+        return self.height
+
+    def update_shape(self, shape: str) -> None:
+        """update player shape in case of collisions in the same way as Player"""
+        self.shape = shape
+
+    def set_visible(self, visible: bool) -> None:
+        """shows or hides the player in the same way as Player"""
+        self.visible = visible
+
+
+class ArrayBlockManager:
+    """
+    - headless version of BlockManager holding all block state in numpy arrays (structure-of-arrays)
+    - x / y centers, widths, heights and rgb colors live in separate arrays; only the first self.count slots are valid
+    - spawn, move, wreck and difficulty rules are identical to BlockManager, but no turtle is touched
+    - renderers can read the array views (xs, ys, widths, heights, colors) to draw the state on top
+    - optionally batches come from a SpawnGenerator guaranteeing that the player can get through
+    """
+    def __init__(
+        self,
+        screen,
+        distance: Optional[float] = None,
+        block_batch_max: Optional[int] = None,
+        block_batch_min: Optional[int] = None,
+        block_batch_x_gap: Optional[float] = None,
+        block_batch_y_gap: Optional[float] = None,
+        capacity: int = INITIAL_CAPACITY,
+        rng: Optional[Random] = None,
+        schedule: Optional[DifficultySchedule] = None,
+        spawner: Optional["SpawnGenerator"] = None
+    ) -> None:
+        self.screen = screen
+        self.rng: Optional[Random] = rng
+        # optional generator of batches the player can get through; create_block_batch if none
+        self.spawner: Optional["SpawnGenerator"] = spawner
+        # start values and per-level changes of the parameters below; explicit arguments override the start values
+        self.schedule: DifficultySchedule = schedule if schedule is not None else DifficultySchedule()
+        schedule = self.schedule
+        self.distance: float = distance if distance is not None else schedule.distance
+        self.block_batch_max: int = block_batch_max if block_batch_max is not None else schedule.block_batch_max
+        self.block_batch_min: int = block_batch_min if block_batch_min is not None else schedule.block_batch_min
+        self.block_batch_x_gap: float = block_batch_x_gap if block_batch_x_gap is not None else schedule.block_batch_x_gap
+        self.block_batch_y_gap: float = block_batch_y_gap if block_batch_y_gap is not None else schedule.block_batch_y_gap
+        self.x_genesis_cor: int = int((screen.width / 2) + 20)
+        self.x_wrecking_cor: int = int(-(screen.width / 2) - 20)
+        # amount of valid blocks at the beginning of the arrays
+        self.count: int = 0
+        # amount of blocks at the end of the arrays added since the last move; they did not exist before this tick
+        self.spawned: int = 0
+        self._x = np.zeros(capacity, dtype=np.float64)
+        self._y = np.zeros(capacity, dtype=np.float64)
+        self._width = np.zeros(capacity, dtype=np.float64)
+        self._height = np.zeros(capacity, dtype=np.float64)
+        self._color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.add_blocks()
+
+    @property
+    def xs(self) -> np.ndarray:
+        """view on the x-coordinates of all active blocks"""
+        return self._x[:self.count]
+
+    @property
+    def ys(self) -> np.ndarray:
+        """view on the y-coordinates of all active blocks"""
+        return self._y[:self.count]
+
+    @property
+    def widths(self) -> np.ndarray:
+        """view on the widths of all active blocks"""
+        return self._width[:self.count]
+
+    @property
+    def heights(self) -> np.ndarray:
+        """view on the heights of all active blocks"""
+        return self._height[:self.count]
+
+    @property
+    def colors(self) -> np.ndarray:
+        """view on the rgb colors of all active blocks with shape (count, 3)"""
+        return self._color[:self.count]
+
+    def _grow(self, required: int) -> None:
+        """doubles the capacity of all arrays until the required amount of blocks fits in"""
+        capacity: int = len(self._x)
+        while capacity < required:
+            capacity *= 2
+        for name in ("_x", "_y", "_width", "_height", "_color"):
+            old: np.ndarray = getattr(self, name)
+            new: np.ndarray = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add_blocks(self) -> None:
+        """adds a new block batch if no blocks exist or the rightmost block is far enough from the genesis point"""
+        if not self.count or self.xs.max() < self.x_genesis_cor - self.block_batch_x_gap:
+            if self.spawner is not None:
+                block_batch: List[Tuple[int, int]] = self.spawner.next_batch(
+                    self.block_batch_min,
+                    self.block_batch_max,
+                    self.block_batch_y_gap,
+                    self.block_batch_x_gap,
+                    self.distance
+                )
+            else:
+                block_batch = create_block_batch(
+                    self.block_batch_min,
+                    self.block_batch_max,
+                    self.block_batch_y_gap,
+                    self.x_genesis_cor,
+                    self.screen,
+                    self.rng
+                )
+            self.render_blocks(block_batch)
+
+    def render_blocks(self, block_coordinates: List[Tuple[int, int]]) -> None:
+        """takes list of tuple block-coordinates as input; appends a block to the arrays for each tuple"""
+        amount: int = len(block_coordinates)
+        if not amount:
+            return
+        if self.count + amount > len(self._x):
+            self._grow(self.count + amount)
+        start, end = self.count, self.count + amount
+        self._x[start:end] = [x for x, _ in block_coordinates]
+        self._y[start:end] = [y for _, y in block_coordinates]
+        self._width[start:end] = BLOCK_WIDTH
+        self._height[start:end] = BLOCK_HEIGHT
+        self._color[start:end] = [random_color(self.rng) for _ in range(amount)]
+        self.count = end
+        self.spawned += amount
+
+    def move_blocks(self) -> None:
+        """move all blocks forward by reducing the x-coordinates in place"""
+        self._x[:self.count] -= self.distance
+        self.spawned = 0
+
+    def wreck_blocks(self) -> None:
+        """delete all blocks crossing the left screen border by compacting the arrays"""
+        keep: np.ndarray = self.xs >= self.x_wrecking_cor
+        remaining: int = int(keep.sum())
+        if remaining == self.count:
+            return
+        for name in ("_x", "_y", "_width", "_height", "_color"):
+            array: np.ndarray = getattr(self, name)
+            array[:remaining] = array[:self.count][keep]
+        self.count = remaining
+
+    def reset(self) -> None:
+        """delete all blocks and reset difficulty for game restart"""
+        self.count = 0
+        self.spawned = 0
+        self.schedule.reset(self)
+        if self.spawner is not None:
+            self.spawner.reset()
+
+    def increase_difficulty(self, level: int) -> None:
+        """increase game difficulty when player levels up for delivered level according to the schedule"""
+        self.schedule.increase(self, level)
+
+    def update_blocks(self) -> None:
+        """wrapper for move, add and wreck blocks"""
+        self.move_blocks()
+        self.add_blocks()
+        self.wreck_blocks()
+
+    def collision_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """delivers x / y-coordinates and half widths / heights of all blocks for vectorized collision checks"""
+        return self.xs, self.ys, self.widths / 2, self.heights / 2
+
+    def check_collision(self, player) -> bool:
+        """bounding box collision of the player box against all block boxes in one array operation"""
+        return check_collision_vectorized(player, *self.collision_arrays())
+
+    def swept_collision(self, player, player_dx: float, player_dy: float) -> Optional[float]:
+        """
+        - swept collision of the player against all blocks over the last tick; blocks moved by distance to the left
+        - blocks spawned after the move are only checked at their end positions
+        - returns the time of impact as fraction of the tick or none
+        """
+        moved: int = max(0, self.count - self.spawned)
+        return swept_collision_time(player, player_dx, player_dy, *self.collision_arrays(), -self.distance, moved=moved)
+
+
+class Simulation:
+    """
+    - turtle-free game core combining HeadlessScreen, HeadlessPlayer and ArrayBlockManager
+    - one call of step() equals one simulation tick of Game.run, but without sleeping or rendering
+    - runs the game logic at thousands of ticks per second without display, e.g. for soak tests and bots
+    - a seed makes block batches and colors reproducible; identical seed and inputs reproduce a run of Game
+    - optional difficulty schedule replaces the start values and level up rules of the game
+    - solvable=True spawns the batches with a SpawnGenerator guaranteeing that the player can get through
+    - swept=True checks collisions over the whole movement of player and blocks within a tick instead of the end
+      positions only; no block tunnels through the player, so bigger distances per tick allow fewer ticks
+    """
+    def __init__(
+        self,
+        screen: Optional[HeadlessScreen] = None,
+        seed: Optional[int] = None,
+        schedule: Optional[DifficultySchedule] = None,
+        solvable: bool = False,
+        swept: bool = False
+    ) -> None:
+        self.screen = screen if screen is not None else HeadlessScreen()
+        self.seed: Optional[int] = seed
+        self.rng: Random = Random(seed)
+        self.player: HeadlessPlayer = HeadlessPlayer(self.screen)
+        spawner: Optional["SpawnGenerator"] = None
+        if solvable:
+            # imported here; spawn_generator imports the block dimensions of this module
+            from src.spawn_generator import SpawnGenerator
+            spawner = SpawnGenerator(self.screen, self.rng, player=self.player)
+        self.blocks: ArrayBlockManager = ArrayBlockManager(self.screen, rng=self.rng, schedule=schedule, spawner=spawner)
+        self.level: int = 1
+        self.ticks: int = 0
+        self.running: bool = True
+        self.swept: bool = swept
+        # fraction of the last tick at which the player collided in swept mode; none without collision
+        self.impact_time: Optional[float] = None
+        # maps action names to the bound movement methods of the player; same keys as in Game._attach_controls
+        self._actions: Dict = {
+            "Up": self.player.move_up,
+            "Down": self.player.move_down,
+            "Right": self.player.move_right,
+            "Left": self.player.move_left
+        }
+
+    def step(self, action: Optional[str] = None) -> bool:
+        """
+        - advances the game by one tick; optional action is one of "Up", "Down", "Right", "Left"
+        - same order as in Game._tick: update blocks, check collision, check goal
+        - swept mode wrecks the blocks only after the check; a block passing the player and the left border within
+          the tick still collides
+        - returns true while the game is running, false after a collision
+        """
+        if not self.running:
+            return False
+        start_x, start_y = self.player.x, self.player.y
+        if action is not None:
+            self.act(action)
+        self.ticks += 1
+        if self.swept:
+            self.blocks.move_blocks()
+            self.blocks.add_blocks()
+            self.impact_time = self.blocks.swept_collision(self.player, self.player.x - start_x, self.player.y - start_y)
+            self.blocks.wreck_blocks()
+            collided: bool = self.impact_time is not None
+        else:
+            self.blocks.update_blocks()
+            collided = self.blocks.check_collision(self.player)
+        if collided:
+            self.running = False
+            return False
+        if self.player_reached_goal():
+            self.level_up()
+        return True
+
+    def act(self, action: str) -> None:
+        """moves the player immediately like a key press between two ticks in Game"""
+        self._actions[action]()
+
+    def player_reached_goal(self) -> bool:
+        """checks if the player has reached the top boundary"""
+        return self.player.get_ycor() > self.screen.top_boundary + 10
+
+    def level_up(self) -> None:
+        """increases level, puts the player back to start and increases difficulty"""
+        self.level += 1
+        self.player.reset_position()
+        self.blocks.increase_difficulty(self.level)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        - resets the simulation for a new game session; same as Game.reset
+        - the random generator is re-seeded and the first batch is added like on a fresh start
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        self.blocks.reset()
+        self.blocks.add_blocks()
+        self.player.reset()
+        self.level = 1
+        self.ticks = 0
+        self.running = True
+        self.impact_time = None
@@ -0,0 +1,318 @@
+from src.simulation import BLOCK_HEIGHT, BLOCK_WIDTH
+from src.helpers import OVERLAP_MARGIN
+from src.input_queue import DEFAULT_REPEAT_TICKS
+from collections import deque
+from math import ceil, floor
+from random import Random
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+import random
+
+# default amount of batches generated ahead of time
+DEFAULT_LOOKAHEAD: int = 8
+# ticks between two moves of the modelled player; same schedule as a held key in the InputQueue of Game
+DEFAULT_TICKS_PER_MOVE: int = DEFAULT_REPEAT_TICKS
+# random candidates tried per batch before the batch is thinned out around the reachable frontier
+DEFAULT_MAX_ATTEMPTS: int = 8
+# cells per key press the highest reachable cell has to climb at least since the start; 1.0 = climbing non-stop
+DEFAULT_MIN_CLIMB_RATE: float = 0.5
+
+
+class LaneTable(NamedTuple):
+    """possible y-coordinates of a block batch for one y-gap and the player cells each of them blocks as bitmask"""
+    ys: Tuple[int, ...]
+    masks: Tuple[int, ...]
+
+
+class Occupancy(NamedTuple):
+    """travelled distance in which a batch overlaps the player column and the player cells it blocks meanwhile"""
+    start: float
+    end: float
+    mask: int
+
+
+class SearchState(NamedTuple):
+    """state of the reachability search; snapshot before every buffered batch to discard the buffer again"""
+    reachable: int
+    position: float
+    spawn: float
+    restart: float
+    occupancies: Tuple[Occupancy, ...]
+    height: int
+    crossings: int
+
+
+class SpawnGenerator:
+    """
+    - drop-in replacement for create_block_batch generating only batches the player can get through
+    - lane table (possible y-coordinates and blocked player cells per lane) is computed once per y-gap and cached
+    - batches are generated ahead of time into a lookahead buffer; changed difficulty parameters discard the buffer
+    - reachability is searched on a time-expanded grid: player cells are move_distance apart along the y-axis of the
+      start column, one time step is one key press every ticks_per_move ticks; up, stay and allowed down moves
+    - with a player, start position, size and move distance are read from it
+    - all batches, buffered or not, are searched along the start column, never along the column the player is in
+      while they are generated; the player is put back to the start column on every level up and restart, so staying
+      in it always leads through, however the player moves sideways meanwhile
+    - time is measured as distance travelled by the blocks like in LaneIndex, so speed changes keep the grid valid
+    - the reachable cells are bitmasks of an int; adding a batch only advances the search by the steps of this batch
+    - a batch is accepted if the highest reachable cell neither falls back nor falls below a minimal climb rate since
+      the start; otherwise it is resampled and finally thinned out between the highest reachable cell and that line
+    - thinned batches are topped up to block_batch_min with lanes that keep the reachable cells of the thinned batch
+    - this way the goal is reachable at least every (cells / min_climb_rate) key presses
+    - reaching the goal counts as crossing; the search then restarts from the start position like after a level up
+    - changed parameters mean a level up: the search restarts from the start position as well
+    """
+    def __init__(
+        self,
+        screen,
+        rng: Optional[Random] = None,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        ticks_per_move: int = DEFAULT_TICKS_PER_MOVE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        min_climb_rate: float = DEFAULT_MIN_CLIMB_RATE,
+        start_x: int = 0,
+        start_y: int = -265,
+        player_width: int = 15,
+        player_height: int = 30,
+        move_distance: int = 10,
+        player=None
+    ) -> None:
+        if player is not None:
+            start_x, start_y, move_distance = player.start_x, player.start_y, player.move_distance
+            player_width, player_height = player.width, player.height
+        self.player = player
+        self.rng: Optional[Random] = rng
+        self.lookahead: int = lookahead
+        self.ticks_per_move: int = ticks_per_move
+        self.max_attempts: int = max_attempts
+        self.min_climb_rate: float = min_climb_rate
+        self.start_x: int = start_x
+        self.start_y: int = start_y
+        self.move_distance: int = move_distance
+        self.x_genesis_cor: int = int((screen.width / 2) + 20)
+        self.lane_bottom: int = screen.bottom_boundary + 12
+        self.lane_top: int = screen.top_boundary - 12
+        self.overlap_x: float = BLOCK_WIDTH / 2 + player_width / 2 - OVERLAP_MARGIN
+        self.overlap_y: float = BLOCK_HEIGHT / 2 + player_height / 2 - OVERLAP_MARGIN
+        # player cells from the start position up to the first cell beyond the goal
+        goal_y: int = screen.top_boundary + 10
+        self.cells: int = (goal_y - start_y) // move_distance + 2
+        self.goal_cell: int = self.cells - 1
+        self.all_cells: int = (1 << self.cells) - 1
+        # cells the player may move down from; same check as Player.move_down
+        min_y: float = screen.bottom_boundary + (player_height / 2)
+        self.down_cells: int = sum(
+            1 << cell for cell in range(1, self.cells) if start_y + (cell - 1) * move_distance >= min_y
+        )
+        self._lane_tables: Dict[int, LaneTable] = {}
+        # batches generated ahead of time with the search state before each of them
+        self._buffer: Deque[Tuple[List[Tuple[int, int]], SearchState]] = deque()
+        self._parameters: Optional[Tuple] = None
+        # amount of batches resampled and thinned out; e.g. for tuning reports
+        self.resampled: int = 0
+        self.thinned: int = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """restarts the search at the start position and empties the buffer for a new game"""
+        self._buffer.clear()
+        self._parameters = None
+        self._restore(SearchState(1, 0.0, 0.0, 0.0, (), 0, 0))
+
+    @property
+    def crossings(self) -> int:
+        """amount of times the goal became reachable in the searched steps"""
+        return self._crossings
+
+    def lane_table(self, y_gap: int) -> LaneTable:
+        """delivers the lane table of a y-gap; computed on first use"""
+        if y_gap not in self._lane_tables:
+            ys: Tuple[int, ...] = tuple(range(self.lane_bottom, self.lane_top, y_gap))
+            masks: Tuple[int, ...] = tuple(
+                sum(
+                    1 << cell for cell in range(self.cells)
+                    if abs(y - (self.start_y + cell * self.move_distance)) < self.overlap_y
+                )
+                for y in ys
+            )
+            self._lane_tables[y_gap] = LaneTable(ys, masks)
+        return self._lane_tables[y_gap]
+
+    def next_batch(
+        self,
+        block_batch_min: int,
+        block_batch_max: int,
+        block_batch_y_gap: float,
+        block_batch_x_gap: float,
+        distance: float
+    ) -> List[Tuple[int, int]]:
+        """
+        - delivers the next batch as list of block coordinates like create_block_batch
+        - refills the lookahead buffer; buffered batches of other difficulty parameters are discarded first
+        """
+        parameters: Tuple = (block_batch_min, block_batch_max, int(block_batch_y_gap), block_batch_x_gap, distance)
+        if parameters != self._parameters:
+            if self._buffer:
+                self._restore(self._buffer[0][1])
+                self._buffer.clear()
+            if self._parameters is not None:
+                # level up: the player starts again at the start position
+                self._restart_search()
+            self._parameters = parameters
+        while len(self._buffer) < max(1, self.lookahead):
+            state: SearchState = self._snapshot()
+            self._buffer.append((self._generate(*parameters), state))
+        return self._buffer.popleft()[0]
+
+    def _snapshot(self) -> SearchState:
+        return SearchState(
+            self._reachable, self._position, self._spawn, self._restart, tuple(self._occupancies), self._height,
+            self._crossings
+        )
+
+    def _restore(self, state: SearchState) -> None:
+        self._reachable = state.reachable
+        # travelled distance the search reached and the one the next batch spawns at
+        self._position: float = state.position
+        self._spawn: float = state.spawn
+        # travelled distance the player started at the start position the last time
+        self._restart: float = state.restart
+        self._occupancies: List[Occupancy] = list(state.occupancies)
+        self._height = state.height
+        self._crossings = state.crossings
+
+    def _restart_search(self) -> None:
+        """player is back at the start position, e.g. after reaching the goal"""
+        self._reachable, self._height, self._restart = 1, 0, self._position
+
+    def _free_cells(self, start: float, end: float, occupancies: List[Occupancy]) -> int:
+        """bitmask of the cells not blocked by any batch overlapping the player column between start and end"""
+        blocked: int = 0
+        for occupancy in occupancies:
+            if occupancy.start < end and occupancy.end > start:
+                blocked |= occupancy.mask
+        return self.all_cells & ~blocked
+
+    def _expand(self, reachable: int, free: int) -> int:
+        """cells reachable after one more key press: up, stay or down; the start cell is always reachable"""
+        moved: int = reachable | (reachable << 1) | ((reachable & self.down_cells) >> 1)
+        return (moved & free) | 1
+
+    def _advance(self, to_position: float, step: float) -> None:
+        """searches all steps ending before to_position; no later batch can reach the player column within them"""
+        goal: int = 1 << self.goal_cell
+        while self._position + step <= to_position:
+            free: int = self._free_cells(self._position, self._position + step, self._occupancies)
+            self._reachable = self._expand(self._reachable, free)
+            self._position += step
+            if self._reachable & goal:
+                self._crossings += 1
+                self._restart_search()
+        self._occupancies = [occupancy for occupancy in self._occupancies if occupancy.end > self._position]
+
+    def _peek(self, candidate: Occupancy, step: float) -> Tuple[int, bool]:
+        """highest reachable cell after the candidate passed the player column and whether the goal got reachable"""
+        occupancies: List[Occupancy] = self._occupancies + [candidate]
+        reachable: int = self._reachable
+        position: float = self._position
+        goal: int = 1 << self.goal_cell
+        while position < candidate.end:
+            reachable = self._expand(reachable, self._free_cells(position, position + step, occupancies))
+            position += step
+            if reachable & goal:
+                return self.goal_cell, True
+        return reachable.bit_length() - 1, False
+
+    def _generate(
+        self,
+        block_batch_min: int,
+        block_batch_max: int,
+        y_gap: int,
+        block_batch_x_gap: float,
+        distance: float
+    ) -> List[Tuple[int, int]]:
+        """generates one batch with the rules of create_block_batch that passes the reachability check"""
+        generator = self.rng if self.rng is not None else random
+        table: LaneTable = self.lane_table(max(1, y_gap))
+        lanes: List[int] = list(range(len(table.ys)))
+        # blocks travel this distance during one key press of the player
+        step: float = self.ticks_per_move * distance
+        spawn: float = self._spawn
+        start: float = spawn + self.x_genesis_cor - self.start_x - self.overlap_x
+        end: float = spawn + self.x_genesis_cor - self.start_x + self.overlap_x
+        self._advance(start, step)
+        # highest reachable cell required after the pass of this batch
+        required: int = max(
+            self._height, min(self.goal_cell - 1, int(self.min_climb_rate * (end - self._restart) / step))
+        )
+        accepted: Optional[List[int]] = None
+        height: int = 0
+        crossed: bool = False
+        for _ in range(self.max_attempts):
+            amount: int = generator.randint(block_batch_min, block_batch_max)
+            drawn: List[int] = generator.sample(lanes, min(amount, len(lanes)))
+            height, crossed = self._peek(Occupancy(start, end, self._lanes_mask(table, drawn)), step)
+            if crossed or height >= required:
+                accepted = drawn
+                break
+            self.resampled += 1
+        if accepted is None:
+            # keep the cells from the highest reachable cell up to the required one free for the pass of the batch
+            climb: int = ceil((end - self._position) / step) + 1
+            highest: int = self._reachable.bit_length() - 1
+            lowest: int = max(0, highest - 1)
+            band: int = ((1 << (max(required, highest + climb) - lowest + 2)) - 1) << lowest
+            accepted = [lane for lane in drawn if not table.masks[lane] & band]
+            height, crossed = self._peek(Occupancy(start, end, self._lanes_mask(table, accepted)), step)
+            if len(accepted) < block_batch_min:
+                height, crossed = self._top_up(
+                    accepted, block_batch_min, table, band, start, end, step, height, crossed
+                )
+            self.thinned += 1
+        self._height = 0 if crossed else height
+        if accepted:
+            self._occupancies.append(Occupancy(start, end, self._lanes_mask(table, accepted)))
+            # next batch spawns in the first tick this one is further away from the genesis point than the x-gap
+            self._spawn = spawn + (floor(block_batch_x_gap / distance) + 1) * distance
+        else:
+            # empty batch: the spawn check of the block manager triggers again in the next tick
+            self._spawn = spawn + distance
+        return [(self.x_genesis_cor, table.ys[lane]) for lane in accepted]
+
+    def _top_up(
+        self,
+        accepted: List[int],
+        block_batch_min: int,
+        table: LaneTable,
+        band: int,
+        start: float,
+        end: float,
+        step: float,
+        height: int,
+        crossed: bool
+    ) -> Tuple[int, bool]:
+        """
+        - adds random lanes to the thinned batch until it holds block_batch_min lanes, lanes outside the band first
+        - a lane is only added if the goal still gets reachable or the highest reachable cell does not fall back
+        - returns the highest reachable cell and the crossing of the topped up batch
+        """
+        generator = self.rng if self.rng is not None else random
+        lanes: int = len(table.ys)
+        spare: List[int] = [lane for lane in generator.sample(range(lanes), lanes) if lane not in accepted]
+        spare.sort(key=lambda lane: bool(table.masks[lane] & band))
+        for lane in spare:
+            if len(accepted) >= block_batch_min:
+                break
+            candidate: Occupancy = Occupancy(start, end, self._lanes_mask(table, accepted + [lane]))
+            lane_height, lane_crossed = self._peek(candidate, step)
+            if lane_crossed or (not crossed and lane_height >= height):
+                accepted.append(lane)
+                height, crossed = lane_height, lane_crossed
+        return height, crossed
+
+    @staticmethod
+    def _lanes_mask(table: LaneTable, lanes: List[int]) -> int:
+        """cells blocked by the delivered lanes of a lane table"""
+        mask: int = 0
+        for lane in lanes:
+            mask |= table.masks[lane]
+        return mask
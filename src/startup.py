@@ -0,0 +1,60 @@
+"""
+- start-up time report of the game: import, tk window, shape registration, drawing, game objects and first frame
+- no game module is imported before the measurement starts; run it in a fresh interpreter to measure a cold start
+- every module in src can be imported without creating a tk root; the window is created by GameScreen / CanvasScreen
+- usage:
+    python3 -m src.startup [--renderer canvas] [--json]
+"""
+from typing import Dict, List
+import argparse
+import importlib
+import json
+import time
+
+# phases of the report in the order they happen on start-up
+PHASES: List[str] = ["import", "window", "shapes", "decorations", "game_objects", "first_frame"]
+
+
+def measure_startup(renderer: str = "turtle", seed: int = 0) -> Dict[str, float]:
+    """
+    - starts a game like run.py, renders the first frame and closes the window again; durations in seconds
+    - import is only meaningful if src.main was not imported before in this interpreter
+    - game_objects is the creation of the Game without the screen, e.g. player, blocks, HUD and highscore db
+    """
+    start: float = time.perf_counter()
+    main = importlib.import_module("src.main")
+    imported: float = time.perf_counter()
+    game = main.Game(seed=seed, renderer=renderer)
+    created: float = time.perf_counter()
+    game._tick()
+    game._render()
+    first_frame: float = time.perf_counter()
+    screen_times: Dict[str, float] = game.screen.startup_times
+    report: Dict[str, float] = {
+        "import": imported - start,
+        **screen_times,
+        "game_objects": created - imported - sum(screen_times.values()),
+        "first_frame": first_frame - created
+    }
+    report["total"] = first_frame - start
+    game.highscore.close()
+    game.screen.close()
+    return report
+
+
+def main() -> None:
+    """command line entry point printing the start-up phases"""
+    parser = argparse.ArgumentParser(description="report the start-up time of Road Rage Royal")
+    parser.add_argument("--renderer", choices=["turtle", "canvas"], default="turtle", help="rendering backend")
+    parser.add_argument("--json", action="store_true", help="print the report as json, e.g. for bench.py")
+    args = parser.parse_args()
+    report: Dict[str, float] = measure_startup(args.renderer)
+    if args.json:
+        print(json.dumps(report))
+        return
+    for phase in PHASES + ["total"]:
+        print(f"{phase:<13}{report[phase] * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
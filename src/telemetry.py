@@ -0,0 +1,138 @@
+"""
+- per-tick telemetry of game sessions streamed into a memory-mapped ring file
+- the file holds a small header and a fixed amount of fixed-size binary records; the oldest records are overwritten
+- writing a record packs it straight into the mapped memory: no syscall, no buffer allocation, no copy
+- every record carries an increasing sequence number; readers find the newest records by it without any lock
+- the reader can tail the file or convert it to csv / numpy while the game is still writing
+- usage:
+    python3 -m src.telemetry path/to/session.rrt [--tail] [--csv out.csv] [--npy out.npy]
+"""
+from typing import Iterator, Optional
+import argparse
+import mmap
+import struct
+import sys
+import time
+import numpy as np
+
+# file header: magic bytes, format version, record size, amount of record slots
+HEADER_FORMAT: str = "<4sBHI"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+MAGIC: bytes = b"RRRT"
+VERSION: int = 1
+# single record: sequence number (1-based, 0 = empty slot), tick, level, amount of blocks, player x / y, frame time ms
+RECORD_FORMAT: str = "<QIHHfff"
+RECORD_SIZE: int = struct.calcsize(RECORD_FORMAT)
+# numpy view of the records; same layout as RECORD_FORMAT
+RECORD_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("tick", "<u4"),
+    ("level", "<u2"),
+    ("blocks", "<u2"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("frame_ms", "<f4")
+])
+# default amount of record slots; 65536 ticks are 21 minutes at 50 ticks per second
+DEFAULT_CAPACITY: int = 65536
+
+
+class TelemetryWriter:
+    """
+    - writes fixed-size records into a memory-mapped ring file created with its full size up front
+    - the operating system writes the mapped pages back to the file; readers see new records immediately
+    """
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.path: str = path
+        self.capacity: int = capacity
+        # amount of records written so far; sequence number of the last record
+        self.written: int = 0
+        with open(path, "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, RECORD_SIZE, capacity))
+            file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        with open(path, "r+b") as file:
+            self._buffer: Optional[mmap.mmap] = mmap.mmap(file.fileno(), 0)
+        # bound once to save the attribute lookups per tick
+        self._pack_into = struct.Struct(RECORD_FORMAT).pack_into
+
+    def write(self, tick: int, level: int, blocks: int, x: float, y: float, frame_ms: float) -> None:
+        """packs one record into the next slot of the mapped ring"""
+        self.written += 1
+        offset: int = HEADER_SIZE + ((self.written - 1) % self.capacity) * RECORD_SIZE
+        self._pack_into(self._buffer, offset, self.written, tick, level, blocks, x, y, frame_ms)
+
+    def close(self) -> None:
+        """flushes the mapped pages to the file and unmaps it"""
+        if self._buffer is not None:
+            self._buffer.flush()
+            self._buffer.close()
+            self._buffer = None
+
+
+def read_records(path: str, after: int = 0) -> np.ndarray:
+    """
+    - delivers a copy of all records in the file with a sequence number above after, ordered by sequence number
+    - works while the writer is active; a record being written in the same moment may be missing or incomplete
+    """
+    with open(path, "rb") as file:
+        header: bytes = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path} is no telemetry file")
+        magic, version, record_size, capacity = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is no telemetry file of version {VERSION}")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            records: np.ndarray = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+            selected: np.ndarray = records[records["seq"] > after]
+            # copy before the buffer is closed; sorting delivers a new array
+            result: np.ndarray = np.sort(selected, order="seq")
+            del records, selected
+    return result
+
+
+def tail(path: str, interval: float = 0.5) -> Iterator[np.ndarray]:
+    """yields the records written since the last poll every interval seconds; endless until interrupted"""
+    last: int = 0
+    while True:
+        records: np.ndarray = read_records(path, last)
+        if len(records):
+            last = int(records["seq"][-1])
+            yield records
+        time.sleep(interval)
+
+
+def to_csv(records: np.ndarray, file) -> None:
+    """writes the records as csv with a header line to an open text file"""
+    file.write(",".join(RECORD_DTYPE.names) + "\n")
+    for record in records.tolist():
+        file.write(",".join(str(value) for value in record) + "\n")
+
+
+def main() -> None:
+    """command line entry point printing, tailing or converting a telemetry file"""
+    parser = argparse.ArgumentParser(description="read the telemetry of Road Rage Royal sessions")
+    parser.add_argument("path", help="telemetry file written with run.py --telemetry")
+    parser.add_argument("--tail", action="store_true", help="print new records as csv while the game is running")
+    parser.add_argument("--csv", metavar="FILE", help="write all records as csv")
+    parser.add_argument("--npy", metavar="FILE", help="write all records as numpy structured array")
+    args = parser.parse_args()
+    if args.tail:
+        print(",".join(RECORD_DTYPE.names))
+        try:
+            for records in tail(args.path):
+                for record in records.tolist():
+                    print(",".join(str(value) for value in record), flush=True)
+        except KeyboardInterrupt:
+            return
+    records: np.ndarray = read_records(args.path)
+    if args.csv:
+        with open(args.csv, "w") as file:
+            to_csv(records, file)
+    if args.npy:
+        np.save(args.npy, records)
+    if not args.csv and not args.npy:
+        to_csv(records, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+- headless runner playing large numbers of games to tune the difficulty schedule
+- games run with the Simulation in a ProcessPoolExecutor on all cores; no turtle / tk module is imported
+- seeds are split into chunks per worker task and every task only returns a compact result per game
+- a policy decides the key press of the simulated player every press interval ticks, like a human pressing keys
+- reports per level how many games reached it (survival) and how many of those cleared it (clear rate)
+- usage:
+    python3 -m src.tuning --games 10000 --policy dodge [--speed-factor 0.93 --gap-level 4 ...]
+"""
+from src.simulation import Simulation
+from src.difficulty import DifficultySchedule
+from src.helpers import OVERLAP_MARGIN
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+# result of one game: reached level, crashed (false if the game ended by max level or max ticks), played ticks
+GameResult = Tuple[int, bool, int]
+# salt separating the random generator of the policy from the one of the block batches
+POLICY_SEED_SALT: int = 0x5EED
+
+
+def random_policy(simulation: Simulation, rng: Random) -> Optional[str]:
+    """presses a random key; up is pressed more often, so the player moves towards the goal"""
+    return rng.choice(("Up", "Up", "Up", "Left", "Right", "Down", None))
+
+
+def dodge_policy(simulation: Simulation, rng: Random, lookahead: int = 10) -> Optional[str]:
+    """
+    - scripted player moving up whenever the position above stays free for the next lookahead ticks
+    - otherwise stays if the current position stays free, else tries to move down, left or right
+    """
+    player, blocks = simulation.player, simulation.blocks
+    # x-coordinates of all blocks in the coming ticks as (blocks, lookahead) array
+    future_xs: np.ndarray = blocks.xs[:, None] - blocks.distance * np.arange(1, lookahead + 1)
+    ys: np.ndarray = blocks.ys[:, None]
+    half_widths: np.ndarray = (blocks.widths / 2)[:, None] + player.width / 2 - OVERLAP_MARGIN
+    half_heights: np.ndarray = (blocks.heights / 2)[:, None] + player.height / 2 - OVERLAP_MARGIN
+
+    def is_free(x: float, y: float) -> bool:
+        return not np.any((np.abs(future_xs - x) < half_widths) & (np.abs(ys - y) < half_heights))
+
+    step: int = player.move_distance
+    candidates: List[Tuple[Optional[str], float, float]] = [
+        ("Up", player.x, player.y + step),
+        (None, player.x, player.y),
+        ("Down", player.x, player.y - step),
+        ("Left", player.x - step, player.y),
+        ("Right", player.x + step, player.y)
+    ]
+    for action, x, y in candidates:
+        if is_free(x, y):
+            return action
+    return None
+
+
+POLICIES: Dict[str, Callable[[Simulation, Random], Optional[str]]] = {
+    "random": random_policy,
+    "dodge": dodge_policy
+}
+
+
+def play_game(
+    seed: int,
+    schedule: DifficultySchedule,
+    policy: str = "dodge",
+    max_level: int = 20,
+    max_ticks: int = 50000,
+    press_interval: int = 5
+) -> GameResult:
+    """plays one seeded game until the crash, clearing max_level or max_ticks"""
+    simulation: Simulation = Simulation(seed=seed, schedule=schedule)
+    decide: Callable = POLICIES[policy]
+    rng: Random = Random(seed ^ POLICY_SEED_SALT)
+    while simulation.running and simulation.level <= max_level and simulation.ticks < max_ticks:
+        action: Optional[str] = decide(simulation, rng) if simulation.ticks % press_interval == 0 else None
+        simulation.step(action)
+    return simulation.level, not simulation.running, simulation.ticks
+
+
+def _play_chunk(seeds: List[int], schedule: DifficultySchedule, policy: str, max_level: int, max_ticks: int,
+                press_interval: int) -> List[GameResult]:
+    """worker task playing the games of a chunk of seeds"""
+    return [play_game(seed, schedule, policy, max_level, max_ticks, press_interval) for seed in seeds]
+
+
+def level_statistics(results: List[GameResult], max_level: int) -> List[Dict]:
+    """
+    - per level: games reaching it, games crashing in it and games clearing it
+    - survival = reached / all games; clear rate = cleared / reached
+    """
+    games: int = len(results)
+    reached_levels: np.ndarray = np.array([level for level, _, _ in results])
+    crashed: np.ndarray = np.array([crash for _, crash, _ in results], dtype=bool)
+    statistics: List[Dict] = []
+    for level in range(1, max_level + 1):
+        reached: int = int(np.sum(reached_levels >= level))
+        cleared: int = int(np.sum(reached_levels > level))
+        statistics.append({
+            "level": level,
+            "reached": reached,
+            "crashed": int(np.sum((reached_levels == level) & crashed)),
+            "cleared": cleared,
+            "survival": reached / games if games else 0.0,
+            "clear_rate": cleared / reached if reached else 0.0
+        })
+    return statistics
+
+
+def run_tuning(
+    games: int = 1000,
+    schedule: Optional[DifficultySchedule] = None,
+    policy: str = "dodge",
+    workers: Optional[int] = None,
+    seed: int = 0,
+    max_level: int = 20,
+    max_ticks: int = 50000,
+    press_interval: int = 5
+) -> Dict:
+    """plays the games with seeds seed ... seed + games - 1 on all workers and summarizes them per level"""
+    schedule = schedule if schedule is not None else DifficultySchedule()
+    workers = workers or os.cpu_count() or 1
+    seeds: List[int] = list(range(seed, seed + games))
+    # a few chunks per worker balance the load of long and short games
+    chunk_size: int = max(1, -(-games // (workers * 4)))
+    chunks: List[List[int]] = [seeds[i:i + chunk_size] for i in range(0, games, chunk_size)]
+    start: float = time.perf_counter()
+    results: List[GameResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_play_chunk, chunk, schedule, policy, max_level, max_ticks, press_interval)
+            for chunk in chunks
+        ]
+        for future in futures:
+            results.extend(future.result())
+    elapsed: float = time.perf_counter() - start
+    return {
+        "games": games,
+        "policy": policy,
+        "workers": workers,
+        "schedule": schedule.to_dict(),
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "timeouts": sum(1 for level, crashed, _ in results if not crashed and level <= max_level),
+        "levels": level_statistics(results, max_level)
+    }
+
+
+def main() -> None:
+    """command line entry point; every parameter of the difficulty schedule can be passed as option"""
+    parser = argparse.ArgumentParser(description="tune the difficulty schedule of Road Rage Royal headless")
+    parser.add_argument("--games", type=int, default=1000, help="amount of games to play (default 1000)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="dodge", help="simulated player (default dodge)")
+    parser.add_argument("--workers", type=int, help="worker processes (default all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default 0)")
+    parser.add_argument("--max-level", type=int, default=20, help="levels to play at most (default 20)")
+    parser.add_argument("--max-ticks", type=int, default=50000, help="ticks per game at most (default 50000)")
+    parser.add_argument("--press-interval", type=int, default=5, help="ticks between two key presses (default 5)")
+    parser.add_argument("--output", help="write the result as json to this file")
+    annotations: Dict = DifficultySchedule.__init__.__annotations__
+    for name, default in DifficultySchedule().to_dict().items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=annotations[name], default=default, help=f"schedule (default {default})"
+        )
+    args = parser.parse_args()
+    schedule = DifficultySchedule(**{name: getattr(args, name) for name in DifficultySchedule().to_dict()})
+    result: Dict = run_tuning(
+        args.games, schedule, args.policy, args.workers, args.seed, args.max_level, args.max_ticks, args.press_interval
+    )
+    print(f"{result['games']} games in {result['seconds']:.1f}s on {result['workers']} workers "
+          f"({result['games_per_second']:.1f} games/s), {result['timeouts']} timeouts")
+    print("level  reached  survival  clear rate")
+    for level in result["levels"]:
+        print(f"{level['level']:>5}  {level['reached']:>7}  {level['survival']:>8.1%}  {level['clear_rate']:>10.1%}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from src.animation import AnimationScheduler, blink
+import pytest
+
+
+class FakeClock:
+    """clock returning a settable time"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_AnimationScheduler_runs_keyframes_by_deadline():
+    """keyframes of concurrent animations run in the order of their deadlines once they are due"""
+    clock = FakeClock()
+    animations = AnimationScheduler(clock)
+    calls = []
+    animations.play("a", [(0.5, lambda: calls.append("a1")), (0.1, lambda: calls.append("a0"))])
+    clock.now = 0.2
+    animations.play("b", [(0.1, lambda: calls.append("b0"))])
+    assert animations.next_deadline == pytest.approx(0.1)
+    assert animations.run_due() == 1
+    assert calls == ["a0"]
+    assert animations.run_due(now=1.0) == 2
+    assert calls == ["a0", "b0", "a1"]
+    assert animations.running == ()
+    assert animations.next_deadline is None
+
+
+def test_AnimationScheduler_cancel_and_replay():
+    """playing a name again or cancelling it drops the remaining keyframes of the animation"""
+    clock = FakeClock()
+    animations = AnimationScheduler(clock)
+    calls = []
+    animations.play("flash", [(0.1, lambda: calls.append("old")), (0.2, lambda: calls.append("old"))])
+    animations.play("flash", [(0.3, lambda: calls.append("new"))])
+    animations.schedule("hold", 0.1)
+    animations.cancel("hold")
+    assert animations.running == ("flash",)
+    assert animations.next_deadline == pytest.approx(0.3)
+    animations.run_due(now=1.0)
+    assert calls == ["new"]
+    animations.schedule("hold", 0.1)
+    animations.clear()
+    assert animations.run_due(now=1.0) == 0
+    assert not animations.is_running("hold")
+
+
+@pytest.mark.parametrize("blinks", [1, 2, 3])
+def test_blink(blinks):
+    """blinking starts hidden, alternates within the duration and ends visible"""
+    states = []
+    keyframes = blink(states.append, 0.6, blinks)
+    assert [offset for offset, _ in keyframes] == pytest.approx([i * 0.6 / (2 * blinks) for i in range(2 * blinks)])
+    for _, action in keyframes:
+        action()
+    assert states == [False, True] * blinks
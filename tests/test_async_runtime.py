@@ -0,0 +1,69 @@
+from src.main import Game
+from src.async_runtime import AsyncRuntime
+from unittest.mock import patch
+import asyncio
+import threading
+import time
+import pytest
+
+
+@patch("src.main.collision_animation")
+def test_AsyncRuntime_run_ends_on_collision(mock_animation):
+    """runtime asyncio plays the run on the event loop until the tick in which the player collides"""
+    new_game = Game(runtime="asyncio")
+    assert isinstance(new_game.async_runtime, AsyncRuntime)
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(30, -265)])
+    new_game.run()
+    assert not new_game.running
+    assert new_game.ticks == 10
+    assert new_game.async_runtime.frames >= 1
+    mock_animation.assert_called_once()
+    new_game.async_runtime.close()
+    new_game.highscore.close()
+
+
+@patch("src.main.collision_animation")
+def test_AsyncRuntime_io_does_not_block_ticks(mock_animation):
+    """slow i/o runs in the executor thread while the ticks go on"""
+    new_game = Game(runtime="asyncio")
+    runtime = new_game.async_runtime
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(40, -265)])
+    ticks_after_io = []
+
+    async def run_with_slow_io():
+        future = runtime.submit(time.sleep, 0.2)
+        future.add_done_callback(lambda _: ticks_after_io.append(new_game.ticks))
+        await runtime.run_async()
+
+    asyncio.run(run_with_slow_io())
+    # the block reaches the player after 30 ticks = 0.6s; about 10 ticks ran while the i/o blocked its thread
+    assert new_game.ticks == 30
+    assert 5 <= ticks_after_io[0] < 30
+    runtime.close()
+    new_game.highscore.close()
+
+
+def test_AsyncRuntime_io_and_offload():
+    """io awaits the result from the executor thread; offload calls directly without running loop"""
+    new_game = Game(runtime="asyncio")
+    runtime = new_game.async_runtime
+    threads = []
+
+    def work(value):
+        threads.append(threading.current_thread().name)
+        return value * 2
+
+    assert asyncio.run(runtime.io(work, 21)) == 42
+    assert threads[0].startswith("game-io")
+    runtime.offload(lambda: work(1))()
+    assert threads[1] == threading.current_thread().name
+    runtime.close()
+    new_game.highscore.close()
+
+
+def test_Game_unknown_runtime():
+    """unknown runtimes are rejected"""
+    with pytest.raises(ValueError):
+        Game(runtime="trio")
@@ -0,0 +1,112 @@
+from src.batch_simulation import BatchSimulation, benchmark, EMPTY_X, NO_ACTION, UP, DOWN, RIGHT, LEFT
+from src.difficulty import DifficultySchedule
+import numpy as np
+import pytest
+
+
+def test_BatchSimulation_init():
+    """every game starts on level 1 with the schedule start values and a first batch at the genesis coordinate"""
+    simulation = BatchSimulation(256, seed=1)
+    assert simulation.block_x.shape == (256, 64)
+    assert np.all(simulation.level == 1)
+    assert np.all(simulation.distance == 0.5)
+    assert np.all((simulation.player_x == 0) & (simulation.player_y == -265))
+    counts = simulation.block_counts()
+    assert counts.min() >= 0 and counts.max() <= 3
+    on_screen = simulation.block_x != EMPTY_X
+    assert np.all(simulation.block_x[on_screen] == 320)
+    # y-coordinates are drawn from range(-228, 238, 25) without duplicates per game
+    for row in range(256):
+        ys = simulation.block_y[row][on_screen[row]]
+        assert len(set(ys.tolist())) == len(ys)
+        assert np.all((ys - -228) % 25 == 0)
+
+
+@pytest.mark.parametrize(
+    "initial_x, initial_y, action, expected_x, expected_y",
+    [
+        (0, 0, UP, 0, 10),
+        (0, 10, RIGHT, 10, 10),
+        (10, 10, DOWN, 10, 0),
+        (10, 0, LEFT, 0, 0),
+        (0, 0, NO_ACTION, 0, 0),
+        (0, -265, DOWN, 0, -265),
+        (286, 0, RIGHT, 286, 0),
+        (-288, 0, LEFT, -288, 0),
+    ]
+)
+def test_BatchSimulation_player_moves_params(initial_x, initial_y, action, expected_x, expected_y):
+    """same valid and invalid movement cases as for HeadlessPlayer"""
+    simulation = BatchSimulation(2, seed=1)
+    simulation.block_x[:] = EMPTY_X
+    simulation.player_x[:], simulation.player_y[:] = initial_x, initial_y
+    simulation.step(np.array([action, NO_ACTION]))
+    assert (simulation.player_x[0], simulation.player_y[0]) == (expected_x, expected_y)
+    assert (simulation.player_x[1], simulation.player_y[1]) == (initial_x, initial_y)
+
+
+def test_BatchSimulation_blocks_move_and_spawn():
+    """blocks move by the distance of their game; a new batch is spawned after the x-gap"""
+    simulation = BatchSimulation(3, seed=1, schedule=DifficultySchedule(block_batch_min=1, block_batch_max=1))
+    simulation.distance[1] = 2.0
+    simulation.step()
+    assert simulation.rightmost.tolist() == [319.5, 318.0, 319.5]
+    for _ in range(40):
+        simulation.step()
+    # game 1 moved 82 px and spawned its second batch, the others only moved 20.5 px
+    assert simulation.block_counts().tolist() == [1, 2, 1]
+
+
+def test_BatchSimulation_collision_resets_game():
+    """a crashed game is reset independently and counted as episode; the other games keep their state"""
+    simulation = BatchSimulation(2, seed=1)
+    simulation.level[:] = 4
+    simulation.ticks[:] = 100
+    simulation.block_x[:] = EMPTY_X
+    simulation.block_x[0, 0], simulation.block_y[0, 0] = 10, -265
+    crashed = simulation.step()
+    assert crashed.tolist() == [True, False]
+    assert simulation.final_level[0] == 4
+    assert (simulation.episodes, simulation.episode_levels) == (1, 4)
+    assert simulation.level.tolist() == [1, 4]
+    assert simulation.ticks.tolist() == [0, 101]
+    assert np.all(simulation.block_x[0][simulation.block_x[0] != EMPTY_X] == 320)
+
+
+def test_BatchSimulation_level_up():
+    """reaching the goal increases the level and the difficulty of this game only"""
+    simulation = BatchSimulation(2, seed=1)
+    simulation.block_x[:] = EMPTY_X
+    simulation.player_y[:] = 255
+    simulation.step(np.array([UP, NO_ACTION]))
+    assert simulation.level.tolist() == [2, 1]
+    assert simulation.player_y.tolist() == [-265, 255]
+    assert simulation.distance[0] == pytest.approx(0.5 / 0.95)
+    assert simulation.distance[1] == 0.5
+
+
+def test_BatchSimulation_grows_block_slots():
+    """block slots double when a game needs more slots than allocated"""
+    schedule = DifficultySchedule(block_batch_min=5, block_batch_max=5, block_batch_x_gap=1)
+    simulation = BatchSimulation(2, seed=1, schedule=schedule, max_blocks=4)
+    assert simulation.max_blocks == 8
+    for _ in range(4):
+        simulation.step()
+    assert simulation.max_blocks >= simulation.block_counts().max()
+
+
+def test_BatchSimulation_reproducible():
+    """identical seed and actions deliver identical states"""
+    actions = np.random.default_rng(0).integers(0, 5, size=(300, 64))
+    first, second = BatchSimulation(64, seed=7), BatchSimulation(64, seed=7)
+    for tick_actions in actions:
+        first.step(tick_actions)
+        second.step(tick_actions)
+    assert np.array_equal(first.block_x, second.block_x)
+    assert np.array_equal(first.player_y, second.player_y)
+    assert first.episodes == second.episodes
+
+
+def test_benchmark():
+    """benchmark delivers the game-steps per second"""
+    assert benchmark(games=16, steps=10) > 0
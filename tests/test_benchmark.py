@@ -0,0 +1,62 @@
+from src.benchmark import summarize, bench_headless, compare, FRAME_BUDGET_US
+import pytest
+
+
+def test_summarize():
+    """mean, percentiles and max in microseconds of timings delivered in nanoseconds"""
+    summary = summarize([1000 * i for i in range(1, 101)])
+    assert summary["mean_us"] == 50.5
+    assert summary["p50_us"] == 51
+    assert summary["p99_us"] == 99
+    assert summary["max_us"] == 100
+    assert summarize([]) == {}
+
+
+def test_bench_headless():
+    """headless benchmark delivers tick rate and phase summaries for every level"""
+    result = bench_headless(levels=3, ticks=10, warmup=5)
+    assert list(result) == ["1", "2", "3"]
+    for level in result.values():
+        assert level["ticks_per_second"] > 0
+        # next_batch only shows up in levels spawning a batch
+        assert {"update_blocks", "check_collision"} <= set(level["phases"])
+        assert set(level["phases"]) <= {"update_blocks", "check_collision", "next_batch"}
+        assert level["phases"]["update_blocks"]["p90_us"] >= level["phases"]["update_blocks"]["p50_us"]
+
+
+def test_bench_headless_spawns_solvable_batches():
+    """spawn generator of the game is measured; refills after level ups stay below the frame budget"""
+    result = bench_headless(levels=30, ticks=100, warmup=100)
+    spawns = [level["phases"]["next_batch"] for level in result.values() if "next_batch" in level["phases"]]
+    assert len(spawns) == len(result)
+    assert all(spawn["max_us"] < FRAME_BUDGET_US for spawn in spawns)
+
+
+@pytest.mark.parametrize(
+    "baseline_rate, current_rate, expected_regressions",
+    [
+        (1000, 1000, 0),
+        (1000, 950, 0),
+        (1000, 800, 1),
+    ]
+)
+def test_compare_params(baseline_rate, current_rate, expected_regressions):
+    """only levels slower than the baseline by more than the threshold are reported"""
+    baseline = {"headless": {"1": {"ticks_per_second": baseline_rate}}, "display": None}
+    current = {"headless": {"1": {"ticks_per_second": current_rate}}, "display": None}
+    assert len(compare(baseline, current, threshold=0.1)) == expected_regressions
+
+
+@pytest.mark.parametrize(
+    "baseline_total, current_total, expected_regressions",
+    [
+        (0.5, 0.5, 0),
+        (0.5, 0.54, 0),
+        (0.5, 0.6, 1),
+    ]
+)
+def test_compare_startup_params(baseline_total, current_total, expected_regressions):
+    """start-up taking longer than the baseline by more than the threshold is reported"""
+    baseline = {"headless": None, "display": None, "startup": {"total": baseline_total}}
+    current = {"headless": None, "display": None, "startup": {"total": current_total}}
+    assert len(compare(baseline, current, threshold=0.1)) == expected_regressions
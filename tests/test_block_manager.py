@@ -1,5 +1,8 @@
 from src.screen import GameScreen
 from src.block_manager import Block, BlockManager
+from src.simulation import HeadlessPlayer
+from src.helpers import check_collision
+from unittest.mock import MagicMock
 import pytest
 
 
@@ -63,8 +66,7 @@ def test_BlockManager_init_attributes():
     screen = GameScreen()
     blocks = BlockManager(screen)
     assert hasattr(blocks, "block_container")
-    assert blocks.speed == 0.2
-    assert blocks.distance == 5
+    assert blocks.distance == 0.5
     assert blocks.block_batch_max == 3
     assert blocks.block_batch_min == 0
     assert blocks.block_batch_x_gap == 80
@@ -125,9 +127,9 @@ def test_BlockManager_move_blocks():
     blocks.block_container.clear()
     blocks.render_blocks([(0, 0), (50, 100)])
     blocks.move_blocks()
-    assert blocks.block_container[0].get_xcor() == -5.0
+    assert blocks.block_container[0].get_xcor() == -0.5
     assert blocks.block_container[0].get_ycor() == 0.0
-    assert blocks.block_container[1].get_xcor() == 45.0
+    assert blocks.block_container[1].get_xcor() == 49.5
     assert blocks.block_container[1].get_ycor() == 100.0
 
 
@@ -148,6 +150,148 @@ def test_BlockManager_wreck_blocks():
     assert blocks.block_container[0].get_xcor() == 50.0
 
 
+def test_BlockManager_collision_arrays():
+    """cached collision arrays follow rendering, moving and wrecking of the blocks in block_container order"""
+    screen = GameScreen()
+    blocks = BlockManager(screen)
+    blocks.reset()
+    blocks.render_blocks([(-320, 0), (50, 100)])
+    blocks.move_blocks()
+    xs, ys, half_widths, half_heights = blocks.collision_arrays()
+    assert list(xs) == [block.get_xcor() for block in blocks.block_container]
+    assert list(ys) == [0, 100]
+    assert list(half_widths) == [20, 20]
+    assert list(half_heights) == [10, 10]
+    blocks.wreck_blocks()
+    xs, ys, _, _ = blocks.collision_arrays()
+    assert list(xs) == [49.5]
+    assert list(ys) == [100]
+    # arrays are rebuilt if block_container is changed from outside, also if the amount of blocks stays the same
+    outside = BlockManager(screen)
+    outside.reset()
+    outside.render_blocks([(-100, 200)])
+    blocks.block_container[0] = outside.block_container[0]
+    xs, ys, _, _ = blocks.collision_arrays()
+    assert list(xs) == [-100]
+    assert list(ys) == [200]
+    blocks.block_container.clear()
+    assert len(blocks.collision_arrays()[0]) == 0
+
+
+def test_BlockManager_collision_arrays_grow():
+    """preallocated arrays double their capacity on demand and keep the blocks in order"""
+    screen = GameScreen()
+    blocks = BlockManager(screen)
+    blocks.reset()
+    capacity = len(blocks._block_xs)
+    coordinates = [(x, 0) for x in range(capacity + 1)]
+    blocks.render_blocks(coordinates)
+    xs, _, _, _ = blocks.collision_arrays()
+    assert len(blocks._block_xs) == 2 * capacity
+    assert list(xs) == [x for x, _ in coordinates]
+    blocks.reset()
+
+
+@pytest.mark.parametrize(
+    "block_x, block_y, expected",
+    [
+        (0, -265, True),
+        (25, -265, True),
+        (25.5, -265, False),
+        (0, -243, True),
+        (0, -242, False),
+    ]
+)
+def test_BlockManager_check_collision_params(block_x, block_y, expected):
+    """vectorized collision check on the cached arrays keeps the overlap margin of helpers.check_collision"""
+    screen = GameScreen()
+    blocks = BlockManager(screen)
+    blocks.reset()
+    player = HeadlessPlayer(screen)
+    blocks.render_blocks([(block_x, block_y)])
+    assert blocks.check_collision(player) is expected
+    assert blocks.check_collision(player) == check_collision(player, blocks.block_container)
+
+
+def test_BlockManager_turtle_pool():
+    """turtles of wrecked blocks are reused for new blocks; amount of turtles is bound by peak blocks on screen"""
+    screen = GameScreen()
+    # pool of 3 turtles covers the first batch of max. 3 blocks generated on init
+    blocks = BlockManager(screen, turtle_pool_size=3)
+    blocks.reset()
+    assert blocks.turtle_count == 3
+    # case 1: new blocks take the pre-warmed turtles first and only then create new ones
+    blocks.render_blocks([(-321, 0), (-321, 50), (50, 100), (50, 150)])
+    assert blocks.turtle_count == 4
+    wrecked_turtle = blocks.block_container[0]._turtle
+    blocks.wreck_blocks()
+    assert not wrecked_turtle.isvisible()
+    assert blocks.turtle_count == 4
+    # case 2: recycled turtles are visible again at the new position
+    blocks.render_blocks([(0, 0), (10, 10)])
+    assert blocks.turtle_count == 4
+    assert any(block._turtle is wrecked_turtle for block in blocks.block_container)
+    assert all(block._turtle.isvisible() for block in blocks.block_container)
+    # case 3: reset and restart keep the amount of turtles bound
+    for _ in range(5):
+        blocks.reset()
+        blocks.render_blocks([(0, 0), (10, 10), (20, 20)])
+    assert blocks.turtle_count == 4
+
+
+def test_BlockManager_blocks_near():
+    """lane index delivers only blocks near the queried box and follows moving and wrecking the blocks"""
+    screen = GameScreen()
+    blocks = BlockManager(screen)
+    blocks.reset()
+    blocks.render_blocks([(-320, 0), (0, 0), (0, 100), (200, 0)])
+    near = blocks.blocks_near(0, 0, 7.5, 15)
+    assert near == [blocks.block_container[1]]
+    blocks.move_blocks()
+    blocks.wreck_blocks()
+    assert blocks.lanes.size == 3
+    assert blocks.blocks_near(-300, 0, 7.5, 15) == []
+    assert blocks.lanes.max_x() == 199.5
+
+
+def test_BlockManager_check_collision_looks_at_nearby_lanes_only():
+    """collision check and spawn-gap check never ask blocks outside the queried lanes and x windows; no spawn here"""
+    blocks = BlockManager(GameScreen())
+    blocks.reset()
+    blocks.render_blocks([(0, -265), (0, 100), (-200, -265), (300, 0)])
+    for far_block in blocks.block_container[1:3]:
+        far_block.get_xcor = MagicMock(side_effect=AssertionError)
+    assert blocks.check_collision(HeadlessPlayer(blocks.screen))
+    assert not blocks.check_collision(HeadlessPlayer(blocks.screen, start_x=100))
+    blocks.add_blocks()
+    assert blocks.count == 4
+
+
+def test_BlockManager_compound_batches():
+    """
+    - with compound batches every distinct x-coordinate is drawn by one turtle with a compound shape
+    - blocks still answer per-block coordinate queries; moving and wrecking works per batch
+    """
+    screen = GameScreen()
+    blocks = BlockManager(screen, turtle_pool_size=3, compound_batches=True)
+    blocks.reset()
+    blocks.render_blocks([(-320, 0), (-320, 50), (100, 100)])
+    assert len(blocks.block_container) == 3
+    assert blocks.turtle_count == 3
+    assert [block.get_ycor() for block in blocks.block_container] == [0, 50, 100]
+    assert blocks.block_container[0].get_width == 40
+    assert blocks.block_container[0].get_height == 20
+    blocks.move_blocks()
+    assert [block.get_xcor() for block in blocks.block_container] == [-320.5, -320.5, 99.5]
+    blocks.wreck_blocks()
+    assert len(blocks.block_container) == 1
+    assert blocks.block_container[0].get_xcor() == 99.5
+    assert blocks.turtle_count == 3
+    assert blocks.blocks_near(99.5, 100, 7.5, 15) == blocks.block_container
+    blocks.reset()
+    assert blocks.turtle_count == 3
+
+
 def test_BlockManager_reset():
     """test reset function after collision and player wants to play further game"""
     screen = GameScreen()
@@ -158,21 +302,21 @@ def test_BlockManager_reset():
     assert len(blocks.block_container) == 0
     assert blocks.block_batch_max == 3
     assert blocks.block_batch_min == 0
-    assert blocks.speed == 0.2
+    assert blocks.distance == 0.5
 
 
 @pytest.mark.parametrize(
-    "level, expected_speed, expected_batch_min, expected_batch_max, expected_batch_x_gap, expected_batch_y_gap",
+    "level, expected_distance, expected_batch_min, expected_batch_max, expected_batch_x_gap, expected_batch_y_gap",
     [
-        (2, 0.19, 0, 3, 80, 25),
-        (4, 0.19, 0, 4, 80, 25),
-        (5, 0.19, 0, 4, 76, 23.75),
-        (77, 0.19, 1, 4, 76, 23.75),
+        (2, 0.5 / 0.95, 0, 3, 80, 25),
+        (4, 0.5 / 0.95, 0, 4, 80, 25),
+        (5, 0.5 / 0.95, 0, 4, 76, 23.75),
+        (77, 0.5 / 0.95, 1, 4, 76, 23.75),
     ]
 )
 def test_BlockManager_increase_difficulty_params(
     level,
-    expected_speed,
+    expected_distance,
     expected_batch_min,
     expected_batch_max,
     expected_batch_x_gap,
@@ -188,7 +332,7 @@ def test_BlockManager_increase_difficulty_params(
     screen = GameScreen()
     blocks = BlockManager(screen)
     blocks.increase_difficulty(level)
-    assert blocks.speed == expected_speed
+    assert blocks.distance == expected_distance
     assert blocks.block_batch_min == expected_batch_min
     assert blocks.block_batch_max == expected_batch_max
     assert blocks.block_batch_x_gap == expected_batch_x_gap
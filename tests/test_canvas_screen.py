@@ -0,0 +1,59 @@
+from src.canvas_screen import CanvasScreen
+from src.hud import CanvasLabel
+from src.simulation import HeadlessPlayer, ArrayBlockManager
+from random import Random
+import pytest
+
+
+@pytest.fixture
+def canvas_screen():
+    """canvas screen with its own tk window; destroyed after the test"""
+    screen = CanvasScreen()
+    yield screen
+    screen.close()
+
+
+def visible_rectangles(screen):
+    """ids of the block rectangles currently shown on the canvas"""
+    return [item for item in screen._block_items if screen._canvas.itemcget(item, "state") != "hidden"]
+
+
+def test_CanvasScreen_init(canvas_screen):
+    """same boundaries as GameScreen; start / finish line and both descriptions are drawn once"""
+    assert canvas_screen.top_boundary == 250
+    assert canvas_screen.bottom_boundary == -240
+    assert canvas_screen.left_boundary == -298
+    assert canvas_screen.right_boundary == 296
+    assert len(canvas_screen._canvas.find_all()) == 4
+
+
+def test_CanvasLabel_write_in_place(canvas_screen):
+    """writing a label changes the text of its single item instead of creating new items"""
+    label = canvas_screen.create_label(-70, 257, "left", ("Courier", 30, "bold"))
+    items = len(canvas_screen._canvas.find_all())
+    label.write("Level 1")
+    label.write("Level 2")
+    assert isinstance(label, CanvasLabel)
+    assert canvas_screen._canvas.itemcget(label._item, "text") == "Level 2"
+    assert len(canvas_screen._canvas.find_all()) == items
+
+
+def test_CanvasScreen_draws_tracked_objects(canvas_screen):
+    """blocks are drawn with pooled rectangles in turtle coordinates; unused rectangles are hidden, not deleted"""
+    player = HeadlessPlayer(canvas_screen)
+    blocks = ArrayBlockManager(canvas_screen, rng=Random(1))
+    blocks.reset()
+    blocks.render_blocks([(100, 0), (100, 50)])
+    canvas_screen.track(player, blocks)
+    canvas_screen.update_screen()
+    assert len(visible_rectangles(canvas_screen)) == 2
+    assert canvas_screen._canvas.coords(canvas_screen._block_items[1]) == [80, -60, 120, -40]
+    assert canvas_screen._canvas.coords(canvas_screen._player_item) == [0, 265]
+    blocks.reset()
+    blocks.render_blocks([(20, 0)])
+    player.update_shape("assets/explosion.gif")
+    canvas_screen.update_screen()
+    assert len(canvas_screen._block_items) == 2
+    assert len(visible_rectangles(canvas_screen)) == 1
+    assert canvas_screen._canvas.coords(canvas_screen._block_items[0]) == [0, -10, 40, 10]
+    assert canvas_screen._player_shape == "assets/explosion.gif"
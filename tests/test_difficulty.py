@@ -0,0 +1,41 @@
+from src.difficulty import DifficultySchedule
+from src.simulation import HeadlessScreen, ArrayBlockManager
+import pytest
+
+
+@pytest.mark.parametrize(
+    "levels, expected_distance, expected_batch_min, expected_batch_max, expected_batch_x_gap",
+    [
+        ([2], 0.5 / 0.95, 0, 3, 80),
+        ([2, 3], 0.5 / 0.95 / 0.95, 0, 4, 80),
+        ([2, 3, 4, 5], 0.5 / 0.95 / 0.95 / 0.95 / 0.95, 0, 6, 80 * 0.95),
+        ([7], 0.5 / 0.95, 1, 4, 80 * 0.95),
+    ]
+)
+def test_DifficultySchedule_default_rules_params(
+    levels,
+    expected_distance,
+    expected_batch_min,
+    expected_batch_max,
+    expected_batch_x_gap
+):
+    """default schedule applies the rules of the game level by level"""
+    blocks = ArrayBlockManager(HeadlessScreen())
+    for level in levels:
+        blocks.increase_difficulty(level)
+    assert blocks.distance == expected_distance
+    assert blocks.block_batch_min == expected_batch_min
+    assert blocks.block_batch_max == expected_batch_max
+    assert blocks.block_batch_x_gap == expected_batch_x_gap
+
+
+def test_DifficultySchedule_custom():
+    """custom schedule sets the start values on init and reset and its own level up rules"""
+    schedule = DifficultySchedule(distance=1.0, block_batch_max=5, speed_factor=0.5, batch_max_level=2, batch_max_step=2)
+    blocks = ArrayBlockManager(HeadlessScreen(), schedule=schedule)
+    assert (blocks.distance, blocks.block_batch_max) == (1.0, 5)
+    blocks.increase_difficulty(2)
+    assert (blocks.distance, blocks.block_batch_max) == (2.0, 7)
+    blocks.reset()
+    assert (blocks.distance, blocks.block_batch_max) == (1.0, 5)
+    assert ArrayBlockManager(HeadlessScreen(), distance=3.0, schedule=schedule).distance == 3.0
@@ -0,0 +1,143 @@
+from src.environment import GameEnv, benchmark
+from src.batch_simulation import NO_ACTION, UP, DOWN, RIGHT, LEFT
+import numpy as np
+import pytest
+
+
+def test_GameEnv_reset():
+    """reset starts on level 1 with the player at the start and the first batch in the observation"""
+    env = GameEnv()
+    observation, info = env.reset(1)
+    assert info["level"] == 1 and info["ticks"] == 0
+    assert np.array_equal(observation["player"], [0, -265, 15, 30])
+    count = info["block_count"]
+    assert observation["mask"].sum() == count
+    assert np.all(observation["blocks"][:count, 0] == 320)
+    assert np.all(observation["blocks"][:count, 2:] == (40, 20))
+    assert not observation["blocks"][count:].any()
+
+
+@pytest.mark.parametrize(
+    "action, expected_player",
+    [
+        (NO_ACTION, (0, -265)),
+        (UP, (0, -255)),
+        (DOWN, (0, -265)),
+        (RIGHT, (10, -265)),
+        (LEFT, (-10, -265)),
+    ]
+)
+def test_GameEnv_step_actions_params(action, expected_player):
+    """one step applies the action to the player like a key press in the game"""
+    env = GameEnv()
+    env.reset(1)
+    observation, reward, terminated, truncated, info = env.step(action)
+    assert tuple(observation["player"][:2]) == expected_player
+    assert (reward, terminated, truncated) == (0, False, False)
+    assert info["ticks"] == 1
+
+
+def test_GameEnv_observation_is_reused():
+    """every step returns the same preallocated arrays filled with the current block state"""
+    env = GameEnv()
+    first, _ = env.reset(2)
+    arrays = {name: id(array) for name, array in first.items()}
+    for _ in range(500):
+        observation, _, terminated, _, info = env.step(NO_ACTION)
+        assert {name: id(array) for name, array in observation.items()} == arrays
+        assert not terminated
+    blocks = env.simulation.blocks
+    count = info["block_count"]
+    assert observation["mask"].sum() == count
+    assert np.allclose(observation["blocks"][:count, 0], blocks.xs)
+    assert np.allclose(observation["blocks"][:count, 1], blocks.ys)
+    assert not observation["blocks"][count:].any()
+
+
+def test_GameEnv_blocks_beyond_max_blocks_grow_the_observation():
+    """more blocks than rows double the rows; the observation dict delivers the new arrays with all blocks"""
+    env = GameEnv(max_blocks=8)
+    env.reset(1)
+    env.simulation.blocks.render_blocks([(x, 200) for x in range(-280, 300, 29)])
+    observation, _, _, _, info = env.step(NO_ACTION)
+    count = info["block_count"]
+    assert count > 16
+    assert env.max_blocks == 32 and observation["blocks"].shape == (32, 4)
+    assert observation["mask"].sum() == count and info["blocks_dropped"] == 0
+    assert np.allclose(observation["blocks"][:count, 0], env.simulation.blocks.xs)
+    assert env.step(NO_ACTION)[0]["blocks"] is observation["blocks"]
+
+
+def test_GameEnv_fixed_max_blocks_keep_newest_blocks():
+    """without growing the oldest blocks are left out and the amount is reported"""
+    env = GameEnv(max_blocks=8, grow_blocks=False)
+    env.reset(1)
+    env.simulation.blocks.render_blocks([(x, 200) for x in range(-280, 300, 29)])
+    observation, _, _, _, info = env.step(NO_ACTION)
+    count = info["block_count"]
+    assert observation["blocks"].shape == (8, 4) and observation["mask"].all()
+    assert info["blocks_dropped"] == count - 8
+    assert np.allclose(observation["blocks"][:, 0], env.simulation.blocks.xs[-8:])
+
+
+def test_GameEnv_reward_on_level_up():
+    """crossing the top boundary clears the level: reward 1 and the player is back at the start"""
+    env = GameEnv()
+    env.reset(1)
+    env.simulation.blocks.reset()
+    env.simulation.player.y = 260
+    observation, reward, terminated, _, info = env.step(UP)
+    assert reward == 1
+    assert not terminated
+    assert info["level"] == 2
+    assert tuple(observation["player"][:2]) == (0, -265)
+
+
+def test_GameEnv_terminated_on_collision():
+    """a collision terminates the episode; stepping on needs a reset"""
+    env = GameEnv()
+    env.reset(1)
+    env.simulation.blocks.reset()
+    env.simulation.blocks.render_blocks([(30, -265)])
+    terminated = False
+    while not terminated:
+        _, reward, terminated, truncated, _ = env.step(NO_ACTION)
+    assert reward == 0 and not truncated
+    with pytest.raises(RuntimeError):
+        env.step(NO_ACTION)
+    _, info = env.reset(1)
+    assert info["ticks"] == 0
+
+
+def test_GameEnv_truncated_after_max_steps():
+    """episodes without collision are truncated after max_steps"""
+    env = GameEnv(max_steps=3)
+    env.reset(1)
+    results = [env.step(NO_ACTION)[2:4] for _ in range(3)]
+    assert results == [(False, False), (False, False), (False, True)]
+
+
+def test_GameEnv_same_seed_same_episode():
+    """identical seed and actions reproduce the observations"""
+    actions = [UP, NO_ACTION, RIGHT, NO_ACTION, LEFT, UP] * 50
+    runs = []
+    for _ in range(2):
+        env = GameEnv()
+        env.reset(7)
+        for action in actions:
+            observation = env.step(action)[0]
+        runs.append({name: array.copy() for name, array in observation.items()})
+    for name in runs[0]:
+        assert np.array_equal(runs[0][name], runs[1][name])
+
+
+def test_GameEnv_render():
+    """render delivers an rgb frame of the current state"""
+    env = GameEnv(frame_size=64)
+    env.reset(1)
+    assert env.render().shape == (64, 64, 3)
+
+
+def test_benchmark_throughput():
+    """thousands of steps per second without display"""
+    assert benchmark(steps=5000) > 1000
@@ -0,0 +1,46 @@
+from src.gif import read_gif, write_gif, RGB332_PALETTE
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path, expected_shape",
+    [
+        ("assets/car.gif", (30, 15, 4)),
+        ("assets/explosion.gif", (64, 64, 4)),
+    ]
+)
+def test_read_gif_assets_params(path, expected_shape):
+    """sprites decode to rgba arrays of their size; transparent pixels get alpha 0, all others 255"""
+    image = read_gif(path)
+    assert image.shape == expected_shape
+    assert image.dtype == np.uint8
+    assert set(np.unique(image[..., 3]).tolist()) == {0, 255}
+
+
+def test_read_gif_no_gif(tmp_path):
+    """files without gif header are rejected"""
+    path = tmp_path / "frame.png"
+    path.write_bytes(b"\x89PNG\r\n")
+    with pytest.raises(ValueError):
+        read_gif(str(path))
+
+
+def test_write_gif_grayscale_round_trip(tmp_path):
+    """grayscale frames keep all 256 levels; the first frame is read back unchanged"""
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, size=(37, 53), dtype=np.uint8) for _ in range(3)]
+    path = str(tmp_path / "frames.gif")
+    assert write_gif(path, frames) == 3
+    image = read_gif(path)
+    assert np.array_equal(image[..., 0], frames[0])
+    assert np.all(image[..., 3] == 255)
+
+
+def test_write_gif_rgb_round_trip(tmp_path):
+    """rgb frames are quantized to the 3-3-2 palette; colors of the palette are read back exactly"""
+    rng = np.random.default_rng(1)
+    frame = RGB332_PALETTE[rng.integers(0, 256, size=(20, 30))]
+    path = str(tmp_path / "frame.gif")
+    write_gif(path, [frame])
+    assert np.array_equal(read_gif(path)[..., :3], frame)
@@ -1,7 +1,13 @@
 from src.screen import GameScreen
 from src.block_manager import BlockManager
 from src.player import Player
-from src.helpers import random_color, create_block_batch, check_collision, collision_animation
+from src.simulation import HeadlessScreen, HeadlessPlayer
+from src.helpers import random_color, create_block_batch, check_collision, check_collision_vectorized, collision_animation
+from src.helpers import swept_collision_time
+from src.animation import AnimationScheduler
+from random import Random
+import numpy as np
+import time
 import pytest
 
 
@@ -53,6 +59,14 @@ def test_create_block_batch_params(block_batch_min, block_batch_max, block_batch
         assert abs(sorted_ys[i + 1] - sorted_ys[i]) >= block_batch_y_gap
 
 
+def test_seeded_random_color_and_block_batch():
+    """same seed delivers the same colors and block batches"""
+    screen = GameScreen()
+    first, second = Random(5), Random(5)
+    assert [random_color(first) for _ in range(10)] == [random_color(second) for _ in range(10)]
+    assert create_block_batch(0, 5, 25, 320, screen, first) == create_block_batch(0, 5, 25, 320, screen, second)
+
+
 @pytest.mark.parametrize(
     "player_x, player_y, block_x, block_y, expected_collision",
     [
@@ -80,12 +94,66 @@ def test_check_collision_params(player_x, player_y, block_x, block_y, expected_c
     assert check_collision(player, blocks.block_container) == expected_collision
 
 
+@pytest.mark.parametrize(
+    "player_x, player_y, block_coordinates",
+    [
+        (0, 0, []),
+        (0, -265, [(0, 0), (100, -265)]),
+        (0, -265, [(0, 0), (0, -265)]),
+        (10, 10, [(-300, 10), (15, 10), (200, 200)]),
+        (0, 0, [(27, 0), (28, 0), (0, 23), (0, 24)]),
+    ]
+)
+def test_check_collision_vectorized_params(player_x, player_y, block_coordinates):
+    """vectorized collision check on the cached block arrays must deliver identical results as check_collision"""
+    screen = GameScreen()
+    blocks = BlockManager(screen)
+    blocks.reset()
+    blocks.render_blocks(block_coordinates)
+    blocks.move_blocks()
+    player = Player(screen, start_x=player_x, start_y=player_y)
+    expected: bool = check_collision(player, blocks.block_container)
+    assert check_collision_vectorized(player, *blocks.collision_arrays()) == expected
+
+
+@pytest.mark.parametrize(
+    "player_x, player_y, player_dx, player_dy, block_coordinates, block_dx, expected_time",
+    [
+        (0, 0, 0, 0, [], -60, None),
+        (0, 0, 0, 0, [(-30, 0)], -60, 0.075),        # block tunnels through the player within one tick
+        (0, 0, 0, 0, [(-100, 0)], -60, None),        # block passed left of the player
+        (0, 0, 0, 0, [(0, 23)], 0, None),            # touching edges
+        (0, 0, 0, 0, [(0, 0), (0, 100)], 0, 0.0),    # overlapping already at the start of the tick
+        (0, 60, 0, 60, [(0, 30)], 0, 7 / 60),        # player jumps over a standing block
+        (0, 60, 0, 60, [(-30, 60), (0, 30)], -60, 0.575),  # earliest of several hits
+    ]
+)
+def test_swept_collision_time_params(player_x, player_y, player_dx, player_dy, block_coordinates, block_dx,
+                                     expected_time):
+    """earliest time of impact of blocks moving through or past the player within one tick"""
+    player = HeadlessPlayer(HeadlessScreen(), start_x=player_x, start_y=player_y)
+    block_xs = np.array([x for x, _ in block_coordinates], dtype=float)
+    block_ys = np.array([y for _, y in block_coordinates], dtype=float)
+    half_widths, half_heights = np.full(len(block_xs), 20.0), np.full(len(block_xs), 10.0)
+    time = swept_collision_time(player, player_dx, player_dy, block_xs, block_ys, half_widths, half_heights, block_dx)
+    if expected_time is None:
+        assert time is None
+    else:
+        assert time == pytest.approx(expected_time)
+    # the discrete check only sees the end positions
+    if block_coordinates and expected_time not in (None, 0.0):
+        assert not check_collision_vectorized(player, block_xs, block_ys, half_widths, half_heights)
+
+
 def test_collision_animation():
-    """replaces player with an explosion effect for 0.5s"""
+    """replaces player with an explosion effect held by the animation scheduler without sleeping"""
     screen = GameScreen()
     player = Player(screen)
+    animations = AnimationScheduler()
     # check for correct player shape before collision animation
     assert player._turtle_player.shape() == "assets/car.gif"
     # check for updated shape after collision executed
-    collision_animation(player, screen)
+    collision_animation(player, animations, duration=0.5)
     assert player._turtle_player.shape() == "assets/explosion.gif"
+    assert animations.is_running("explosion")
+    assert animations.next_deadline > time.perf_counter()
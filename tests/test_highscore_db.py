@@ -1,5 +1,7 @@
-from src.highscore_db import HighscoreDB
+from src.highscore_db import HighscoreDB, FALLBACK_HIGHSCORE
 import os
+import random
+import time
 import pytest
 
 
@@ -51,3 +53,169 @@ def test_HighscoreDB_remove_db_file():
     db = HighscoreDB(db_path="data/test.highscore.db")
     db.reset_db()
     assert not os.path.isfile("data/test.highscore.db")
+
+
+def test_HighscoreDB_write_behind(clean_db):
+    """write-behind updates are served from memory at once and persisted by the writer until close"""
+    db = HighscoreDB(db_path="data/test.highscore.db", write_behind=True)
+    assert db.write_behind
+    db.update_highscore(4)
+    db.update_highscore(3)
+    assert db.get_highscore() == 4
+    db.close()
+    type(db)._instance = None
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    assert db.get_highscore() == 4
+    db.reset_db()
+
+
+def test_HighscoreDB_write_behind_coalesces(clean_db):
+    """updates arriving while the writer waits for sqlite are coalesced; only the latest score is written"""
+    db = HighscoreDB(db_path="data/test.highscore.db", write_behind=True)
+    written = []
+    write = db._write_highscore
+    db._write_highscore = lambda score: (written.append(score), write(score))
+    with db._connection_lock:
+        for score in range(2, 10):
+            db.update_highscore(score)
+        # reads never wait for the blocked writer
+        assert db.get_highscore() == 9
+    db.close()
+    assert written[-1] == 9
+    assert len(written) <= 2
+    db.reset_db()
+
+
+def test_HighscoreDB_close_bounded(clean_db):
+    """close returns after the timeout even if the writer is stuck in sqlite"""
+    db = HighscoreDB(db_path="data/test.highscore.db", write_behind=True)
+    with db._connection_lock:
+        db.update_highscore(5)
+        start = time.perf_counter()
+        db.close(timeout=0.1)
+        assert time.perf_counter() - start < 1
+        assert db.write_behind
+    db.close()
+    assert not db.write_behind
+    db.reset_db()
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_HighscoreDB_unreadable_db_params(clean_db, write_behind):
+    """a failing read delivers the fallback highscore 0 instead of none; updates keep working in memory"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    db._connection.close()
+    if write_behind:
+        db._start_writer()
+    assert db.get_highscore() == FALLBACK_HIGHSCORE
+    db.update_highscore(3)
+    if write_behind:
+        assert db.get_highscore() == 3
+    db.close()
+    db.reset_db()
+
+
+def test_HighscoreDB_leaderboard(clean_db):
+    """batched runs are ranked by level, then by duration"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    db.add_runs([("a", 3, 40.0, 1.0), ("b", 5, 90.0, 2.0), ("c", 5, 60.0, 3.0), ("d", 1, 5.0, 4.0)])
+    db.add_run("e", 3, 30.0, 5.0)
+    assert db.leaderboard_size() == 5
+    assert [run[0] for run in db.top_runs(3)] == ["c", "b", "e"]
+    assert db.top_runs(1) == [("c", 5, 60.0, 3.0)]
+    db.reset_db()
+
+
+@pytest.mark.parametrize(
+    "level, duration, expected_rank",
+    [
+        (6, 500.0, 1),
+        (5, 10.0, 1),
+        (5, 60.0, 2),
+        (5, 75.0, 2),
+        (5, 95.0, 3),
+        (4, 1.0, 3),
+        (5, 90.0, 3),
+        (3, 35.0, 4),
+        (3, 39.5, 4),
+        (3, 40.0, 5),
+        (1, 5.0, 6),
+        (0, 1.0, 6)
+    ]
+)
+def test_HighscoreDB_rank_of_params(clean_db, level, duration, expected_rank):
+    """rank a new run would get: higher levels first, then shorter durations; equal durations rank behind"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    db.add_runs([("a", 3, 40.0, 1.0), ("b", 5, 90.0, 2.0), ("c", 5, 60.0, 3.0), ("d", 1, 5.0, 4.0), ("e", 3, 30.0, 5.0)])
+    assert db.rank_of(level, duration) == expected_rank
+    # the run shows up at exactly this position of top_runs once it is added
+    db.add_run("new", level, duration, 6.0)
+    assert [run[0] for run in db.top_runs(10)].index("new") + 1 == expected_rank
+    db.reset_db()
+
+
+def test_HighscoreDB_rank_of_scans_one_bucket(clean_db):
+    """
+    - rank of a run in a crowded level only counts the runs of one duration bucket in the index
+    - measured in sqlite vm instructions: a count over all runs of the level needs far more than the bound
+    """
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    rng = random.Random(0)
+    db.add_runs([("p", 1, rng.uniform(0, 100), 0.0) for _ in range(100000)])
+    calls = []
+    db._connection.set_progress_handler(lambda: calls.append(1), 1000)
+    rank = db.rank_of(1, 99.5)
+    db._connection.set_progress_handler(None, 1000)
+    with db._connection as con:
+        expected = con.execute("SELECT COUNT(*) FROM leaderboard WHERE duration <= 99.5").fetchone()[0] + 1
+    assert rank == expected
+    assert len(calls) < 20
+    db.reset_db()
+
+
+def test_HighscoreDB_bucket_counts_filled_for_older_dbs(clean_db):
+    """leaderboards of versions without bucket counts get them counted on connect"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    db.add_runs([("a", 3, 40.0, 1.0), ("b", 3, 12.5, 2.0), ("c", 2, 1.0, 3.0)])
+    with db._connection as con:
+        con.execute("DROP TABLE leaderboard_bucket_counts")
+    db.close()
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    assert db.rank_of(3, 20.0) == 2
+    db.add_run("d", 3, 15.0, 4.0)
+    assert db.rank_of(3, 20.0) == 3
+    db.reset_db()
+
+
+def test_HighscoreDB_unreadable_leaderboard(clean_db):
+    """rank and size queries deliver 0 instead of none if the db cannot be read"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    db._connection.close()
+    assert db.rank_of(3, 10.0) == 0
+    assert db.leaderboard_size() == 0
+    assert db.top_runs() == []
+    db.reset_db()
+
+
+def test_HighscoreDB_prune_leaderboard(clean_db):
+    """pruning keeps the best runs incl. ties resolved by insertion order and keeps the counts per level in sync"""
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    runs = [("a", 3, 40.0, 1.0), ("b", 5, 90.0, 2.0), ("c", 3, 40.0, 3.0), ("d", 1, 5.0, 4.0)]
+    db.add_runs(runs, retain=2)
+    assert db.top_runs(10) == [("b", 5, 90.0, 2.0), ("a", 3, 40.0, 1.0)]
+    assert db.leaderboard_size() == 2
+    assert db.rank_of(2, 1.0) == 3
+    db.reset_db()
+
+
+def test_HighscoreDB_write_behind_runs(clean_db):
+    """runs added in write-behind mode are inserted by the writer and persisted on close"""
+    db = HighscoreDB(db_path="data/test.highscore.db", write_behind=True)
+    with db._connection_lock:
+        db.add_run("a", 2, 10.0)
+        db.add_run("b", 4, 20.0)
+    db.close()
+    type(db)._instance = None
+    db = HighscoreDB(db_path="data/test.highscore.db")
+    assert [run[:3] for run in db.top_runs()] == [("b", 4, 20.0), ("a", 2, 10.0)]
+    db.reset_db()
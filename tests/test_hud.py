@@ -0,0 +1,75 @@
+from src.hud import CanvasLabel, PerfHud
+import inspect
+import pytest
+
+
+class RecordingCanvas:
+    """minimal canvas recording created text items and their configuration calls"""
+    def __init__(self):
+        self.items = {}
+        self.configure_calls = 0
+
+    def create_text(self, x, y, **options):
+        self.items[len(self.items) + 1] = dict(options, coords=(x, y))
+        return len(self.items)
+
+    def itemconfigure(self, item, **options):
+        self.configure_calls += 1
+        self.items[item].update(options)
+
+
+class Clock:
+    """manually advanced clock"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_CanvasLabel_write():
+    """label creates one item like turtle.write and only touches it for changed texts"""
+    canvas = RecordingCanvas()
+    label = CanvasLabel(canvas, -70, 257, "left", ("Courier", 30, "bold"))
+    label.write("Level 1")
+    label.write("Level 1")
+    label.write("Level 2")
+    assert len(canvas.items) == 1
+    assert canvas.items[1]["coords"] == (-71, -257)
+    assert canvas.items[1]["anchor"] == "sw"
+    assert canvas.items[1]["text"] == "Level 2"
+    assert canvas.configure_calls == 2
+
+
+@pytest.mark.parametrize(
+    "frames, frame_time, expected",
+    [
+        (10, 0.02, "FPS 50  tick 1.00 ms  blocks 7"),
+        (5, 0.1, "FPS 10  tick 1.00 ms  blocks 7"),
+    ]
+)
+def test_PerfHud_refresh_throttled_params(frames, frame_time, expected):
+    """counters are written once per refresh interval however many frames are rendered"""
+    canvas, clock = RecordingCanvas(), Clock()
+    label = CanvasLabel(canvas, 0, 0)
+    hud = PerfHud(label, lambda: 7, refresh_interval=0.19, clock=clock)
+
+    def tick():
+        clock.now += 0.001
+
+    timed_tick = hud.wrap_tick(tick)
+    counted_frame = hud.wrap_frame(lambda: None)
+    for _ in range(frames):
+        timed_tick()
+        clock.now += frame_time - 0.001
+        counted_frame()
+    assert label.text == expected
+    assert canvas.configure_calls == 1
+
+
+def test_PerfHud_wrappers_take_no_arguments():
+    """tick and frame wrappers pack no argument tuple or dict per call"""
+    hud = PerfHud(CanvasLabel(RecordingCanvas(), 0, 0), lambda: 0)
+    for wrapped in (hud.wrap_tick(lambda: None), hud.wrap_frame(lambda: None)):
+        assert wrapped.__code__.co_argcount == 0
+        assert not wrapped.__code__.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
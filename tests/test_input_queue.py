@@ -0,0 +1,54 @@
+from src.input_queue import InputQueue
+import pytest
+
+KEYS = ["Up", "Down", "Right", "Left"]
+
+
+@pytest.mark.parametrize(
+    "events, expected_moves, expected_held",
+    [
+        ([], [], ()),
+        ([("Up", True)], ["Up"], ("Up",)),
+        ([("Up", True), ("Up", False)], ["Up"], ()),                     # tap between two ticks is not lost
+        ([("Left", True), ("Up", True)], ["Up", "Left"], ("Up", "Left")),  # moves in the order of the keys
+        ([("Up", True), ("Up", True), ("Up", True)], ["Up"], ("Up",)),   # os key repeat coalesced
+        ([("Down", False)], [], ()),                                     # release without press
+        ([("F9", True)], [], ()),                                        # unknown key
+    ]
+)
+def test_InputQueue_drain_params(events, expected_moves, expected_held):
+    """events buffered between two ticks are coalesced into at most one move per key"""
+    queue = InputQueue(KEYS)
+    for key, pressed in events:
+        queue.press(key) if pressed else queue.release(key)
+    assert queue.drain() == expected_moves
+    assert queue.held == expected_held
+    assert queue.drain() == []
+
+
+def test_InputQueue_held_key_repeats_per_tick():
+    """a held key moves on press and then every repeat_ticks ticks, whatever the key repeat rate of the os is"""
+    queue = InputQueue(KEYS, repeat_ticks=3)
+    queue.press("Up")
+    moves = []
+    for tick in range(10):
+        # os key repeat as release / press pairs with varying rate
+        for _ in range(tick % 3):
+            queue.release("Up")
+            queue.press("Up")
+        moves.append(queue.drain())
+    assert moves == [["Up"], [], [], ["Up"], [], [], ["Up"], [], [], ["Up"]]
+    queue.release("Up")
+    assert queue.drain() == []
+    assert queue.held == ()
+
+
+def test_InputQueue_clear():
+    """clear drops buffered events and held keys"""
+    queue = InputQueue(KEYS)
+    queue.press("Up")
+    queue.drain()
+    queue.press("Left")
+    queue.clear()
+    assert queue.drain() == []
+    assert queue.held == ()
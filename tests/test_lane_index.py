@@ -0,0 +1,70 @@
+from src.lane_index import LaneIndex
+import random
+import pytest
+
+
+def test_LaneIndex_insert_and_max_x():
+    """items are bucketed per lane; max_x delivers the rightmost current x-coordinate"""
+    lanes = LaneIndex()
+    assert lanes.max_x() is None
+    lanes.insert(100, 0, 20, 10, "a")
+    lanes.insert(320, 25, 20, 10, "b")
+    lanes.insert(240, 0, 20, 10, "c")
+    assert lanes.size == 3
+    assert lanes.max_x() == 320
+
+
+def test_LaneIndex_advance_and_remove():
+    """advancing moves all items to the left; removing the last item of a lane drops the lane"""
+    lanes = LaneIndex()
+    lanes.insert(100, 0, 20, 10, "a")
+    lanes.insert(320, 25, 20, 10, "b")
+    lanes.advance(5)
+    assert lanes.max_x() == 315
+    lanes.remove(310, 25, "b")
+    lanes.remove(95, 0, "a")
+    assert lanes.size == 0
+    assert lanes.max_x() is None
+    assert lanes.query(-1000, 1000, -1000, 1000) == []
+
+
+@pytest.mark.parametrize(
+    "left, right, bottom, top, expected",
+    [
+        (-10, 10, -10, 10, ["a"]),
+        (-10, 10, 40, 60, []),
+        (90, 110, -10, 30, ["b", "c"]),
+        (300, 310, -1000, 1000, []),
+    ]
+)
+def test_LaneIndex_query_params(left, right, bottom, top, expected):
+    """query only delivers items in lanes and x window overlapping the box widened by the half extents"""
+    lanes = LaneIndex()
+    lanes.insert(0, 0, 20, 10, "a")
+    lanes.insert(100, 0, 20, 10, "b")
+    lanes.insert(100, 25, 20, 10, "c")
+    lanes.insert(200, 25, 20, 10, "d")
+    lanes.insert(0, 100, 20, 10, "e")
+    assert sorted(lanes.query(left, right, bottom, top)) == expected
+
+
+def test_LaneIndex_query_superset_of_overlaps():
+    """randomized check: every item overlapping the queried box is part of the result while items keep moving"""
+    random.seed(7)
+    lanes = LaneIndex()
+    items = {}
+    for i in range(200):
+        x, y = random.uniform(-320, 320), random.choice(range(-228, 238, 25))
+        lanes.insert(x, y, 20, 10, i)
+        items[i] = [x, y]
+    for _ in range(50):
+        distance = random.uniform(0, 7)
+        lanes.advance(distance)
+        for coordinates in items.values():
+            coordinates[0] -= distance
+        left, bottom = random.uniform(-300, 300), random.uniform(-250, 250)
+        right, top = left + 11, bottom + 26
+        result = set(lanes.query(left, right, bottom, top))
+        for i, (x, y) in items.items():
+            if right > x - 20 and left < x + 20 and top > y - 10 and bottom < y + 10:
+                assert i in result
@@ -3,7 +3,11 @@ from src.screen import GameScreen
 from src.player import Player
 from src.block_manager import BlockManager
 from src.scoreboard import Scoreboard, Highscore
-from unittest.mock import patch
+from src.replay import Recording, replay
+from src.simulation import ArrayBlockManager
+from src.telemetry import read_records
+from unittest.mock import MagicMock, patch
+import json
 import pytest
 
 
@@ -28,6 +32,13 @@ def test_Game_init(mock_block_turtle, mock_score_turtle, mock_screen_screen, moc
     assert new_game.running
 
 
+def test_Game_spawns_solvable_batches():
+    """block manager of the game takes its batches from a spawn generator following the player"""
+    new_game = Game()
+    assert new_game.blocks.spawner.player is new_game.player
+    assert new_game.blocks.block_container
+
+
 @patch("src.screen.Turtle")
 @patch("src.scoreboard.Turtle")
 @patch("src.block_manager.Turtle")
@@ -37,8 +48,108 @@ def test_Game_level_up(mock_block_turtle, mock_score_turtle, mock_screen_turtle)
     new_game._level_up()
     assert new_game.scoreboard.level == 2
     assert new_game.player._turtle_player.pos() == (0, -265)
-    # level 1 to 2 increases only speed
-    assert new_game.blocks.speed == 0.19
+    # level 1 to 2 increases only the distance blocks move per tick
+    assert new_game.blocks.distance == 0.5 / 0.95
+
+
+def test_Game_tick():
+    """one fixed tick moves the blocks by the distance per tick and levels up when the player reached the goal"""
+    new_game = Game()
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(100, 0)])
+    new_game.player._turtle_player.goto(0, 261)
+    new_game._tick()
+    assert new_game.blocks.block_container[0].get_xcor() == 99.5
+    assert new_game.scoreboard.level == 2
+    assert new_game.running
+
+
+@patch("src.main.collision_animation")
+def test_Game_run_ends_on_collision(mock_animation):
+    """fixed timestep loop ends after the tick in which the player collides with a block"""
+    new_game = Game()
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(0, -265)])
+    new_game.run()
+    assert not new_game.running
+    mock_animation.assert_called_once()
+
+
+@patch("src.main.collision_animation")
+def test_Game_record_and_replay(mock_animation, tmp_path):
+    """seeded run with recorded key presses is saved on game over and reproduced by the headless replay"""
+    path = str(tmp_path / "run.rrr")
+    new_game = Game(seed=7, record_path=path)
+    while new_game.running:
+        if new_game.ticks % 4 == 0:
+            new_game.input.press("Up")
+            new_game.input.release("Up")
+        new_game._tick()
+    new_game._save_recording()
+    recording = Recording.load(path)
+    assert recording.seed == 7
+    assert recording.end_tick == new_game.ticks
+    simulation = replay(recording)
+    assert simulation.ticks == new_game.ticks
+    assert simulation.level == new_game.scoreboard.level
+    assert sorted(simulation.blocks.xs.tolist()) == sorted(block.get_xcor() for block in new_game.blocks.block_container)
+
+
+@patch("src.main.collision_animation")
+def test_Game_records_every_run_to_its_own_file(mock_animation, tmp_path):
+    """restarts do not overwrite the recording of the previous run"""
+    path = tmp_path / "run.rrr"
+    new_game = Game(seed=7, record_path=str(path))
+    seeds = []
+    for _ in range(3):
+        seeds.append(new_game.seed)
+        new_game._tick()
+        new_game._save_recording()
+        new_game.reset()
+    assert [Recording.load(str(tmp_path / name)).seed for name in ("run.rrr", "run.2.rrr", "run.3.rrr")] == seeds
+
+
+def test_Game_replay_writes_no_highscore():
+    """level ups while replaying do not touch the persistent highscore"""
+    new_game = Game()
+    new_game.highscore.update_highscore = MagicMock()
+    new_game.replaying = True
+    new_game._level_up()
+    new_game.replaying = False
+    new_game.highscore.update_highscore.assert_not_called()
+    new_game._level_up()
+    new_game.highscore.update_highscore.assert_called_once_with(new_game.scoreboard.level)
+
+
+def test_Game_input_drained_once_per_tick():
+    """key callbacks only buffer; the tick applies one move per key and repeats held keys every few ticks"""
+    new_game = Game()
+    new_game.blocks.reset()
+    for _ in range(3):
+        new_game.input.press("Up")
+    new_game.input.press("Right")
+    new_game.input.release("Right")
+    assert new_game.player.get_ycor() == -265
+    for _ in range(new_game.input.repeat_ticks + 1):
+        new_game._tick()
+    assert (new_game.player.get_xcor(), new_game.player.get_ycor()) == (10, -245)
+    assert [event for _, event in new_game.recording.events] == ["Up", "Right", "Up"]
+
+
+def test_Game_level_up_animations():
+    """level ups flash the level and blink the teleported player without blocking; reset drops the animations"""
+    new_game = Game()
+    new_game._level_up()
+    assert {"level", "teleport"} <= set(new_game.animations.running)
+    assert new_game.player.get_ycor() == -265
+    new_game._render()
+    assert not new_game.player._turtle_player.isvisible()
+    new_game.animations.run_due(now=float("inf"))
+    assert new_game.player._turtle_player.isvisible()
+    assert new_game.animations.running == ()
+    new_game._level_up()
+    new_game.reset()
+    assert new_game.animations.running == ()
 
 
 @pytest.mark.parametrize(
@@ -72,7 +183,87 @@ def test_Game_ask_restart_no(mock_prompt):
     assert game._ask_restart() is False
 
 
+@patch("src.main.collision_animation")
+def test_Game_trace_exported_on_game_over(mock_animation, tmp_path):
+    """with trace path the frame phases are timed and written as chrome trace when the run ends"""
+    path = tmp_path / "trace.json"
+    new_game = Game(trace_path=str(path))
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(0, -265)])
+    new_game.run()
+    phases = {event["name"] for event in json.loads(path.read_text())["traceEvents"]}
+    assert {"tick", "update_blocks", "check_collision"} <= phases
+
+
+def test_Game_without_trace_not_instrumented():
+    """without trace path no profiler exists and the phase methods are the plain bound methods"""
+    new_game = Game()
+    assert new_game.profiler is None
+    assert "_tick" not in vars(new_game)
+
+
+@patch("src.main.collision_animation")
+def test_Game_canvas_renderer(mock_animation):
+    """canvas renderer plays with the turtle-free game objects; a run ends on collision like with turtles"""
+    new_game = Game(seed=3, renderer="canvas")
+    assert isinstance(new_game.blocks, ArrayBlockManager)
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(0, -265)])
+    new_game.run()
+    assert not new_game.running
+    new_game.screen.close()
+
+
+@patch("src.main.collision_animation")
+def test_Game_compound_batches(mock_animation):
+    """compound batches reach the BlockManager of the turtle renderer; a run ends on collision like without"""
+    new_game = Game(seed=3, compound_batches=True)
+    assert new_game.blocks.compound_batches
+    assert not Game(seed=3).blocks.compound_batches
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(30, -265), (30, 0)])
+    assert len(new_game.blocks._batches) == 1
+    new_game.run()
+    assert not new_game.running
+    assert new_game.ticks == 10
+
+
+def test_Game_unknown_renderer():
+    """only the listed renderers can be selected"""
+    with pytest.raises(ValueError):
+        Game(renderer="opengl")
+
+
+def test_Game_perf_hud():
+    """perf hud counts the ticks and frames of the running game and shows the block count"""
+    new_game = Game(perf_hud=True)
+    new_game.perf_hud.refresh_interval = 0
+    new_game._tick()
+    new_game._render()
+    assert new_game.perf_hud.label.text.endswith(f"blocks {new_game.blocks.count}")
+    assert Game().perf_hud is None
 
 
+@patch("src.main.collision_animation")
+@patch.object(Highscore, "add_run")
+def test_Game_run_added_to_leaderboard(mock_add_run, mock_animation):
+    """finished run is added to the leaderboard with player name, level and played seconds"""
+    new_game = Game(player_name="tester")
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(0, -265)])
+    new_game.run()
+    mock_add_run.assert_called_once_with("tester", 1, new_game.ticks / 50)
 
 
+@patch("src.main.collision_animation")
+def test_Game_telemetry(mock_animation, tmp_path):
+    """every tick of the run loop writes one telemetry record"""
+    path = str(tmp_path / "session.rrt")
+    new_game = Game(telemetry_path=path)
+    new_game.blocks.reset()
+    new_game.blocks.render_blocks([(0, -265)])
+    new_game.run()
+    records = read_records(path)
+    assert records["tick"].tolist() == list(range(1, new_game.ticks + 1))
+    assert records["y"][-1] == -265
+    new_game.telemetry.close()
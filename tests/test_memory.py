@@ -0,0 +1,34 @@
+from src.memory import MemoryMonitor, soak
+from src.screen import GameScreen
+
+# fixed bounds of the growth after the warm-up; a leak of one object per tick or one turtle per batch exceeds them
+# turtles are counted per screen and never unregistered, so the other tests add to the absolute counts
+MAX_GROWTH_BYTES = 1024 * 1024
+MAX_TURTLE_GROWTH = 16
+MAX_CANVAS_ITEM_GROWTH = 64
+
+
+def test_MemoryMonitor_reports_growth():
+    """allocations after the baseline are reported with their source line; counts come from the screen"""
+    monitor = MemoryMonitor(GameScreen(), top=3)
+    monitor.start()
+    leak = [bytearray(1024) for _ in range(1000)]
+    report = monitor.report(ticks=7)
+    monitor.stop()
+    assert report.ticks == 7
+    assert report.growth_bytes >= 1000 * 1024
+    assert "test_memory.py" in report.top_growth[0][0]
+    assert report.turtles >= 1
+    assert report.canvas_items >= 0
+    assert len(leak) == 1000
+
+
+def test_soak_memory_bounded():
+    """100k ticks of restarted games with level ups and crashes keep memory, turtles and canvas items bounded"""
+    reports = soak(ticks=100000, samples=5)
+    baseline = reports[0]
+    assert [report.ticks for report in reports] == [0, 20000, 40000, 60000, 80000, 100000]
+    for report in reports[1:]:
+        assert report.growth_bytes < MAX_GROWTH_BYTES
+        assert report.turtles - baseline.turtles <= MAX_TURTLE_GROWTH
+        assert report.canvas_items - baseline.canvas_items <= MAX_CANVAS_ITEM_GROWTH
@@ -137,3 +137,13 @@ def test_Player_update_shape():
     player = Player(screen)
     player.update_shape("assets/explosion.gif")
     assert player._turtle_player.shape() == "assets/explosion.gif"
+
+
+def test_Player_set_visible():
+    """hiding and showing the player e.g. for blinking; reset shows it again"""
+    screen = GameScreen()
+    player = Player(screen)
+    player.set_visible(False)
+    assert not player._turtle_player.isvisible()
+    player.reset()
+    assert player._turtle_player.isvisible()
@@ -0,0 +1,48 @@
+from src.profiler import FrameProfiler
+import inspect
+import json
+
+
+def test_FrameProfiler_wrap_records_samples():
+    """wrapped phases keep their result and record one sample per call with the phase name"""
+    profiler = FrameProfiler(capacity=8)
+    values = iter([3, 7])
+    phase = profiler.wrap("add", lambda: next(values))
+    assert phase() == 3
+    assert phase() == 7
+    samples = profiler.samples()
+    assert profiler.recorded == 2
+    assert [sample["phase"] for sample in samples] == ["add", "add"]
+    assert all(sample["duration_ns"] >= 0 for sample in samples)
+    assert samples[0]["start_ns"] <= samples[1]["start_ns"]
+
+
+def test_FrameProfiler_wrap_takes_no_arguments():
+    """phase wrappers are zero-argument closures; arguments are not packed and passed on per call"""
+    profiler = FrameProfiler(capacity=8)
+    phase = profiler.wrap("phase", lambda: None)
+    assert phase.__code__.co_argcount == 0
+    assert not phase.__code__.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+
+
+def test_FrameProfiler_ring_buffer_overwrites_oldest():
+    """buffer keeps the newest samples in order once the capacity is exceeded"""
+    profiler = FrameProfiler(capacity=4)
+    phase_ids = [profiler._phase_id(name) for name in ("a", "b")]
+    for i in range(10):
+        profiler.record(phase_ids[i % 2], 1000 * i, 1000 * i + i)
+    samples = profiler.samples()
+    assert profiler.recorded == 10
+    assert [sample["duration_ns"] for sample in samples] == [6, 7, 8, 9]
+    assert [sample["phase"] for sample in samples] == ["a", "b", "a", "b"]
+
+
+def test_FrameProfiler_export_chrome_trace(tmp_path):
+    """export writes complete events with timestamps and durations in microseconds"""
+    profiler = FrameProfiler(capacity=4)
+    phase_id = profiler._phase_id("tick")
+    profiler.record(phase_id, profiler._origin_ns + 2000, profiler._origin_ns + 5000)
+    path = tmp_path / "trace.json"
+    profiler.export(str(path))
+    trace = json.loads(path.read_text())
+    assert trace["traceEvents"] == [{"name": "tick", "ph": "X", "ts": 2.0, "dur": 3.0, "pid": 1, "tid": 1}]
@@ -0,0 +1,118 @@
+from src.rasterizer import Rasterizer, benchmark, to_grayscale, BACKGROUND_COLOR, LINE_COLOR, ZONE_COLOR
+from src.simulation import Simulation
+from src.gif import read_gif
+import numpy as np
+import pytest
+
+
+def empty_simulation():
+    """simulation without blocks; blocks are placed by the tests"""
+    simulation = Simulation(seed=1)
+    simulation.blocks.reset()
+    return simulation
+
+
+@pytest.mark.parametrize(
+    "width, height, grayscale, expected_shape",
+    [
+        (84, 84, False, (84, 84, 3)),
+        (84, 84, True, (84, 84)),
+        (160, 120, False, (120, 160, 3)),
+        (600, 600, True, (600, 600)),
+    ]
+)
+def test_Rasterizer_frame_shape_params(width, height, grayscale, expected_shape):
+    """frames have the configured resolution; render returns the same buffer every call"""
+    simulation = Simulation(seed=1)
+    rasterizer = Rasterizer(width, height, grayscale)
+    frame = rasterizer.render(simulation.player, simulation.blocks)
+    assert frame.shape == expected_shape
+    assert frame.dtype == np.uint8
+    assert rasterizer.render(simulation.player, simulation.blocks) is frame
+
+
+def test_Rasterizer_background():
+    """finish and start line are black rows between the zone bands; the road in between is white"""
+    rasterizer = Rasterizer(600, 600)
+    background = rasterizer.background
+    # top boundary y=250 is row 50, bottom boundary y=-240 is row 540
+    assert np.all(background[50, 10:590] == LINE_COLOR)
+    assert np.all(background[540, 10:590] == LINE_COLOR)
+    assert np.all(background[:50] == ZONE_COLOR)
+    assert np.all(background[541:] == ZONE_COLOR)
+    assert np.all(background[51:540] == BACKGROUND_COLOR)
+
+
+@pytest.mark.parametrize(
+    "x, y, expected_box",
+    [
+        (0, 0, (290, 310, 280, 320)),
+        (-100, 150, (140, 160, 180, 220)),
+        # partially beyond the right edge of the screen
+        (310, 0, (290, 310, 590, 600)),
+    ]
+)
+def test_Rasterizer_block_params(x, y, expected_box):
+    """a block fills exactly its 40x20 rectangle with its color at full resolution"""
+    simulation = empty_simulation()
+    simulation.blocks.render_blocks([(x, y)])
+    simulation.blocks.colors[0] = (200, 10, 30)
+    simulation.player.set_visible(False)
+    rasterizer = Rasterizer(600, 600)
+    frame = rasterizer.render(simulation.player, simulation.blocks)
+    top, bottom, left, right = expected_box
+    assert np.all(frame[top:bottom, left:right] == (200, 10, 30))
+    covered = np.all(frame == (200, 10, 30), axis=-1)
+    assert covered.sum() == (bottom - top) * (right - left)
+
+
+def test_Rasterizer_block_covers_a_pixel_at_low_resolution():
+    """blocks smaller than a pixel of the frame are still drawn"""
+    simulation = empty_simulation()
+    simulation.blocks.render_blocks([(0, 0)])
+    simulation.player.set_visible(False)
+    frame = Rasterizer(8, 8).render(simulation.player, simulation.blocks)
+    assert np.any(np.all(frame == simulation.blocks.colors[0], axis=-1))
+
+
+def test_Rasterizer_player_sprite():
+    """the car sprite is pasted at the player position through its alpha mask; hidden players are not drawn"""
+    simulation = empty_simulation()
+    rasterizer = Rasterizer(600, 600)
+    car = read_gif("assets/car.gif")
+    frame = rasterizer.render(simulation.player, simulation.blocks)
+    # player at (0, -265) is row 565, column 300; the 15x30 sprite starts 7 columns and 15 rows before
+    region = frame[550:580, 293:308]
+    opaque = car[..., 3] > 0
+    assert np.array_equal(region[opaque], car[..., :3][opaque])
+    simulation.player.set_visible(False)
+    frame = rasterizer.render(simulation.player, simulation.blocks)
+    assert np.array_equal(frame, rasterizer.background)
+
+
+def test_Rasterizer_explosion_sprite_is_clipped():
+    """sprites partly outside the frame are cut off at the edge"""
+    simulation = empty_simulation()
+    simulation.player.update_shape("assets/explosion.gif")
+    simulation.player.y = -290
+    frame = Rasterizer(84, 84).render(simulation.player, simulation.blocks)
+    assert frame.shape == (84, 84, 3)
+    assert not np.array_equal(frame, Rasterizer(84, 84).background)
+
+
+def test_Rasterizer_grayscale_matches_rgb_luminance():
+    """grayscale frames equal the luminance of the rgb frames of the same state"""
+    simulation = Simulation(seed=3)
+    for _ in range(400):
+        simulation.step()
+    rgb = Rasterizer(84, 84).render(simulation.player, simulation.blocks)
+    gray = Rasterizer(84, 84, grayscale=True).render(simulation.player, simulation.blocks)
+    assert np.array_equal(gray, to_grayscale(rgb))
+
+
+def test_benchmark_throughput_and_gif(tmp_path):
+    """thousands of 84x84 frames per second; frames are written to an animated gif on request"""
+    path = tmp_path / "frames.gif"
+    fps = benchmark(frames=500, gif_path=str(path))
+    assert fps > 1000
+    assert read_gif(str(path)).shape == (84, 84, 4)
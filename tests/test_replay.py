@@ -0,0 +1,69 @@
+from src.replay import Recording, replay, run_path
+from src.simulation import Simulation
+import random
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path, run, expected_path",
+    [
+        ("last_run.rrr", 1, "last_run.rrr"),
+        ("last_run.rrr", 2, "last_run.2.rrr"),
+        ("records/run.rrr", 12, "records/run.12.rrr"),
+        ("run", 3, "run.3"),
+    ]
+)
+def test_run_path_params(path, run, expected_path):
+    """the first run keeps the path; further runs of the session are numbered before the extension"""
+    assert run_path(path, run) == expected_path
+
+
+def test_Recording_save_load(tmp_path):
+    """seed, end tick and events survive a round trip through the binary file; 5 bytes per event"""
+    path = tmp_path / "run.rrr"
+    recording = Recording(seed=123, end_tick=50)
+    recording.add(0, "Up")
+    recording.add(0, "Left")
+    recording.add(17, "Down")
+    recording.save(str(path))
+    loaded = Recording.load(str(path))
+    assert loaded.seed == 123
+    assert loaded.end_tick == 50
+    assert loaded.events == [(0, "Up"), (0, "Left"), (17, "Down")]
+    assert loaded.events_per_tick() == {0: ["Up", "Left"], 17: ["Down"]}
+
+
+def test_Recording_load_invalid_file(tmp_path):
+    """files of unknown format are rejected"""
+    path = tmp_path / "invalid.rrr"
+    path.write_bytes(b"no recording at all")
+    with pytest.raises(ValueError):
+        Recording.load(str(path))
+
+
+def test_replay_reproduces_run():
+    """a seeded run of Game, i.e. with solvable spawns, and recorded key presses is reproduced exactly by the replay"""
+    policy = random.Random(0)
+    simulation = Simulation(seed=99, solvable=True)
+    recording = Recording(seed=99)
+    while simulation.running:
+        if policy.random() < 0.3:
+            action = policy.choice(["Up", "Up", "Left", "Right", "Down"])
+            recording.add(simulation.ticks, action)
+            simulation.act(action)
+        simulation.step()
+    recording.end_tick = simulation.ticks
+    replayed = replay(recording)
+    assert replayed.ticks == simulation.ticks
+    assert replayed.level == simulation.level
+    assert not replayed.running
+    assert replayed.blocks.xs.tolist() == simulation.blocks.xs.tolist()
+    assert replayed.blocks.colors.tolist() == simulation.blocks.colors.tolist()
+
+
+def test_replay_max_ticks_and_on_tick():
+    """replay stops at max_ticks and hands the simulation to on_tick after every tick"""
+    ticks = []
+    simulation = replay(Recording(seed=1, end_tick=1000), on_tick=lambda sim: ticks.append(sim.ticks), max_ticks=10)
+    assert simulation.ticks == 10
+    assert ticks == list(range(1, 11))
@@ -58,5 +58,25 @@ def test_Highscore_update():
     assert highscore.highscore == 5
 
 
+def test_Scoreboard_label_factory():
+    """with a label factory the level is written to the created label instead of a turtle"""
+    labels = []
 
+    class Label:
+        def __init__(self, x, y, align, font):
+            self.args, self.text = (x, y, align, font), None
+            labels.append(self)
 
+        def write(self, text):
+            self.text = text
+
+    scoreboard = Scoreboard(label_factory=Label)
+    scoreboard.increase_level()
+    assert scoreboard._turtle is None
+    assert labels[0].args == (-70, 257, "left", ("Courier", 30, "bold"))
+    assert labels[0].text == "Level 2"
+    # hidden while flashing
+    scoreboard.render_level(visible=False)
+    assert labels[0].text == ""
+    scoreboard.render_level()
+    assert labels[0].text == "Level 2"
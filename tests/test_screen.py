@@ -14,6 +14,7 @@ def test_GameScreen_init_attributes(mock_screen_turtle_class, mock_screen_screen
     assert screen.bottom_boundary == -240
     assert screen.left_boundary == -298
     assert screen.right_boundary == 296
+    assert list(screen.startup_times) == ["window", "shapes", "decorations"]
 
 @patch("src.screen.Turtle")
 def test_GameScreen_init_screen_obj(mock_screen_turtle_class):
@@ -31,3 +32,19 @@ def test_GameScreen_add_shapes(mock_screen_turtle_class):
     registered_shapes = screen._turtle_screen.getshapes()
     assert "assets/car.gif" in registered_shapes
     assert "assets/explosion.gif" in registered_shapes
+
+
+@patch("src.screen.Turtle")
+def test_GameScreen_add_compound_shape(mock_screen_turtle_class):
+    """compound shape with one component per polygon and color is registered under the given name"""
+    screen = GameScreen()
+    screen.add_compound_shape("test_batch", [(((0, 0), (0, 1), (1, 1)), (255, 0, 0))])
+    assert "test_batch" in screen._turtle_screen.getshapes()
+
+
+def test_GameScreen_create_label():
+    """labels are text items on the turtle canvas updated in place"""
+    screen = GameScreen()
+    label = screen.create_label(-70, 257, "left", ("Courier", 30, "bold"))
+    label.write("Level 3")
+    assert label.text == "Level 3"
@@ -0,0 +1,177 @@
+from src.simulation import HeadlessScreen, HeadlessPlayer, ArrayBlockManager, Simulation
+from src.difficulty import DifficultySchedule
+import numpy as np
+import pytest
+
+
+def test_HeadlessScreen_boundaries():
+    """boundaries must be identical to the ones calculated by GameScreen"""
+    screen = HeadlessScreen()
+    assert screen.top_boundary == 250
+    assert screen.bottom_boundary == -240
+    assert screen.left_boundary == -298
+    assert screen.right_boundary == 296
+
+
+@pytest.mark.parametrize(
+    "initial_x, initial_y, move_method, expected_x, expected_y",
+    [
+        (0, 0, "move_up", 0, 10),
+        (0, 10, "move_right", 10, 10),
+        (10, 10, "move_down", 10, 0),
+        (10, 0, "move_left", 0, 0),
+        (0, -265, "move_down", 0, -265),
+        (296, 0, "move_right", 296, 0),
+        (-298, 0, "move_left", -298, 0),
+    ]
+)
+def test_HeadlessPlayer_movements_params(initial_x, initial_y, move_method, expected_x, expected_y):
+    """same valid and invalid movement cases as for Player"""
+    player = HeadlessPlayer(HeadlessScreen())
+    player.x, player.y = initial_x, initial_y
+    getattr(player, move_method)()
+    assert (player.get_xcor(), player.get_ycor()) == (expected_x, expected_y)
+
+
+def test_ArrayBlockManager_init_attributes():
+    """test default values identical to BlockManager and first batch added on init"""
+    blocks = ArrayBlockManager(HeadlessScreen())
+    assert blocks.distance == 0.5
+    assert blocks.x_genesis_cor == 320
+    assert blocks.x_wrecking_cor == -320
+    assert 0 <= blocks.count <= 3
+    assert np.all(blocks.xs == 320)
+
+
+def test_ArrayBlockManager_render_move_wreck():
+    """render blocks into the arrays, move them and wreck the one crossing the x-wrecking-coordinate"""
+    blocks = ArrayBlockManager(HeadlessScreen(), capacity=1)
+    blocks.reset()
+    blocks.render_blocks([(-316, 0), (50, 100)])
+    assert blocks.count == 2
+    assert list(blocks.widths) == [40, 40]
+    assert list(blocks.heights) == [20, 20]
+    assert blocks.colors.shape == (2, 3)
+    blocks.move_blocks()
+    assert list(blocks.xs) == [-316.5, 49.5]
+    blocks.distance = 5
+    blocks.move_blocks()
+    assert list(blocks.xs) == [-321.5, 44.5]
+    blocks.wreck_blocks()
+    assert blocks.count == 1
+    assert list(blocks.xs) == [44.5]
+    assert list(blocks.ys) == [100]
+
+
+def test_ArrayBlockManager_add_blocks():
+    """new batch is only added if the rightmost block is far enough away from the genesis point"""
+    blocks = ArrayBlockManager(HeadlessScreen())
+    blocks.reset()
+    blocks.render_blocks([(240, 0)])
+    blocks.add_blocks()
+    assert blocks.count == 1
+    blocks.reset()
+    blocks.render_blocks([(239, 0)])
+    blocks.block_batch_min = 1
+    blocks.add_blocks()
+    assert 2 <= blocks.count <= 4
+
+
+def test_ArrayBlockManager_increase_difficulty_and_reset():
+    """difficulty schedule identical to BlockManager; reset restores the defaults"""
+    blocks = ArrayBlockManager(HeadlessScreen())
+    blocks.increase_difficulty(77)
+    assert blocks.distance == 0.5 / 0.95
+    assert blocks.block_batch_min == 1
+    assert blocks.block_batch_max == 4
+    assert blocks.block_batch_x_gap == 76
+    assert blocks.block_batch_y_gap == 23.75
+    blocks.reset()
+    assert blocks.count == 0
+    assert blocks.distance == 0.5
+    assert blocks.block_batch_max == 3
+
+
+@pytest.mark.parametrize(
+    "player_x, player_y, block_x, block_y, expected_collision",
+    [
+        (0, 0, None, None, False),
+        (0, -265, 0, 0, False),
+        (0, -265, 0, -265, True),
+        (0, 0, 5, 5, True),
+        (10, 10, 15, 10, True),
+    ]
+)
+def test_ArrayBlockManager_check_collision_params(player_x, player_y, block_x, block_y, expected_collision):
+    """same collision cases as for helpers.check_collision"""
+    screen = HeadlessScreen()
+    blocks = ArrayBlockManager(screen)
+    blocks.reset()
+    if block_x is not None:
+        blocks.render_blocks([(block_x, block_y)])
+    player = HeadlessPlayer(screen, start_x=player_x, start_y=player_y)
+    assert blocks.check_collision(player) == expected_collision
+
+
+def test_Simulation_step_level_up_and_collision():
+    """reaching the goal levels up; a block on the player ends the run"""
+    sim = Simulation()
+    sim.blocks.reset()
+    sim.player.y = 260
+    assert sim.step("Up")
+    assert sim.level == 2
+    assert sim.player.get_ycor() == -265
+    assert sim.blocks.distance == 0.5 / 0.95
+    sim.blocks.reset()
+    sim.blocks.render_blocks([(5, -265)])
+    assert not sim.step()
+    assert not sim.running
+    sim.reset()
+    assert sim.running and sim.level == 1 and sim.ticks == 0
+
+
+@pytest.mark.parametrize("swept, expected_running", [(False, True), (True, False)])
+def test_Simulation_swept_collision(swept, expected_running):
+    """with 60 px per tick a block tunnels through the player unless the collision check is swept"""
+    sim = Simulation(schedule=DifficultySchedule(distance=60), swept=swept)
+    sim.blocks.reset()
+    sim.blocks.render_blocks([(30, -265)])
+    assert sim.step() == expected_running
+    assert sim.impact_time == (None if expected_running else pytest.approx(0.075))
+
+
+@pytest.mark.parametrize("block_x, expected_impact_time", [(-261, (29 - 25.5) / 60), (-255, (35 - 25.5) / 60)])
+def test_Simulation_swept_collision_before_wrecking_params(block_x, expected_impact_time):
+    """a block passing the player and the left border within one tick is checked before it is wrecked"""
+    sim = Simulation(schedule=DifficultySchedule(distance=60), swept=True)
+    sim.blocks.reset()
+    sim.blocks.render_blocks([(block_x, 0)])
+    sim.player.x, sim.player.y = -290, 0
+    assert not sim.step()
+    assert sim.impact_time == pytest.approx(expected_impact_time)
+
+
+@pytest.mark.parametrize("spawned, expected_impact_time", [(True, 1.0), (False, (80 - 25.5) / 60)])
+def test_ArrayBlockManager_swept_collision_spawned_blocks_params(spawned, expected_impact_time):
+    """blocks spawned in the tick are not projected back along the move; they only collide at the end of the tick"""
+    screen = HeadlessScreen()
+    blocks = ArrayBlockManager(screen, schedule=DifficultySchedule(distance=60))
+    blocks.reset()
+    if spawned:
+        blocks.move_blocks()
+        blocks.render_blocks([(320, 0)])
+    else:
+        blocks.render_blocks([(380, 0)])
+        blocks.move_blocks()
+    assert blocks.swept_collision(HeadlessPlayer(screen, start_x=300, start_y=0), 0, 0) == pytest.approx(
+        expected_impact_time
+    )
+
+
+def test_Simulation_runs_headless_many_ticks():
+    """the simulation runs many ticks without display while the block arrays stay bounded"""
+    sim = Simulation()
+    for _ in range(5000):
+        if not sim.step():
+            sim.reset()
+    assert sim.blocks.count < 64
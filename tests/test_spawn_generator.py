@@ -0,0 +1,167 @@
+from src.spawn_generator import SpawnGenerator
+from src.simulation import HeadlessScreen, HeadlessPlayer, ArrayBlockManager, Simulation
+from src.block_manager import BlockManager
+from src.screen import GameScreen
+from src.input_queue import InputQueue
+from src.difficulty import DifficultySchedule
+from random import Random
+import pytest
+
+
+class Parameters:
+    """plain holder for the block parameters of a difficulty schedule"""
+
+
+class RecordingSpawner(SpawnGenerator):
+    """spawn generator keeping the minimal amount of blocks and the delivered batch of every call"""
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        super().__init__(*args, **kwargs)
+
+    def next_batch(self, *parameters):
+        batch = super().next_batch(*parameters)
+        self.batches.append((parameters[0], batch))
+        return batch
+
+
+def level_parameters(level):
+    """block batch parameters of the default schedule for the delivered level in the order of next_batch"""
+    parameters = Parameters()
+    schedule = DifficultySchedule()
+    schedule.reset(parameters)
+    for new_level in range(2, level + 1):
+        schedule.increase(parameters, new_level)
+    return (
+        parameters.block_batch_min,
+        parameters.block_batch_max,
+        parameters.block_batch_y_gap,
+        parameters.block_batch_x_gap,
+        parameters.distance
+    )
+
+
+def test_SpawnGenerator_lane_table_cached():
+    """lane table holds the y-coordinates of create_block_batch and is computed once per y-gap"""
+    generator = SpawnGenerator(HeadlessScreen())
+    table = generator.lane_table(25)
+    assert list(table.ys) == list(range(-228, 238, 25))
+    assert generator.lane_table(25) is table
+    # lowest lane blocks the player cells from y=-245 up to y=-215; start cell and y=-255 stay free
+    assert table.masks[0] & 0b11 == 0
+    assert table.masks[0] & 0b11100 == 0b11100
+
+
+def test_SpawnGenerator_next_batch_rules():
+    """batches follow the rules of create_block_batch: genesis x, distinct lanes, amount between min and max"""
+    generator = SpawnGenerator(HeadlessScreen(), Random(1))
+    for _ in range(200):
+        batch = generator.next_batch(0, 3, 25, 80, 0.5)
+        ys = [y for _, y in batch]
+        assert all(x == 320 for x, _ in batch)
+        assert len(set(ys)) == len(ys) <= 3
+        assert all(y in generator.lane_table(25).ys for y in ys)
+
+
+@pytest.mark.parametrize("level", [1, 10, 25])
+def test_SpawnGenerator_goal_stays_reachable_params(level):
+    """goal gets reachable at least every cells / min_climb_rate key presses, however dense the batches are"""
+    generator = SpawnGenerator(HeadlessScreen(), Random(level))
+    parameters = level_parameters(level)
+    for _ in range(500):
+        generator.next_batch(*parameters)
+    key_presses = generator._position / (generator.ticks_per_move * parameters[-1])
+    assert generator.crossings >= int(key_presses / (generator.cells / generator.min_climb_rate))
+    assert generator.crossings > 0
+
+
+@pytest.mark.parametrize("level", [10, 20, 30])
+def test_SpawnGenerator_thinned_batches_keep_minimum_params(level):
+    """thinned out batches are topped up to block_batch_min and the goal still gets reachable"""
+    generator = SpawnGenerator(HeadlessScreen(), Random(level))
+    parameters = level_parameters(level)
+    sizes = [len(generator.next_batch(*parameters)) for _ in range(300)]
+    assert generator.thinned > 0
+    assert min(sizes) >= parameters[0]
+    assert generator.crossings > 0
+
+
+def test_SpawnGenerator_reads_player():
+    """player delivers position, size and move distance; moves follow the key repeat schedule of the input queue"""
+    screen = HeadlessScreen()
+    player = HeadlessPlayer(screen, start_x=-100, start_y=-255, move_distance=20)
+    generator = SpawnGenerator(screen, Random(1), lookahead=1, player=player)
+    assert (generator.start_x, generator.start_y, generator.move_distance) == (-100, -255, 20)
+    assert generator.ticks_per_move == InputQueue(("Up",)).repeat_ticks
+    generator.next_batch(3, 3, 25, 80, 0.5)
+    # batch overlaps the start column 100 travelled distance later than the center column
+    assert generator._occupancies[-1].start == generator.x_genesis_cor + 100 - generator.overlap_x
+
+
+def test_SpawnGenerator_ignores_sideways_moves_between_refills():
+    """buffered and new batches are all searched along the start column, wherever the player is while refilling"""
+    screen = HeadlessScreen()
+    parameters = level_parameters(20)
+    still, moving = HeadlessPlayer(screen), HeadlessPlayer(screen)
+    first = SpawnGenerator(screen, Random(4), lookahead=8, player=still)
+    second = SpawnGenerator(screen, Random(4), lookahead=8, player=moving)
+    for batch in range(300):
+        moving.x = (-1) ** batch * 10 * (batch % 25)
+        assert first.next_batch(*parameters) == second.next_batch(*parameters)
+    assert first._snapshot() == second._snapshot()
+    assert second.crossings > 0
+
+
+def test_SpawnGenerator_lookahead_discarded_on_new_parameters():
+    """buffered batches of old parameters are dropped; the next batch uses the lanes of the new y-gap"""
+    generator = SpawnGenerator(HeadlessScreen(), Random(1), lookahead=4)
+    generator.next_batch(3, 3, 25, 80, 0.5)
+    assert len(generator._buffer) == 3
+    batch = generator.next_batch(3, 3, 40, 80, 0.5)
+    assert all(y in generator.lane_table(40).ys for _, y in batch)
+    assert len(generator._buffer) == 3
+
+
+def test_SpawnGenerator_reproducible():
+    """same seed delivers the same batches; reset starts the search from scratch"""
+    first, second = SpawnGenerator(HeadlessScreen(), Random(5)), SpawnGenerator(HeadlessScreen(), Random(5))
+    parameters = level_parameters(12)
+    assert [first.next_batch(*parameters) for _ in range(50)] == [second.next_batch(*parameters) for _ in range(50)]
+    first.reset()
+    assert first._position == 0 and not first._buffer
+
+
+def test_ArrayBlockManager_spawner():
+    """block manager takes its batches from the spawner and resets it on game restart"""
+    screen = HeadlessScreen()
+    blocks = ArrayBlockManager(screen, rng=Random(1), spawner=SpawnGenerator(screen, Random(1)))
+    for _ in range(1000):
+        blocks.update_blocks()
+    assert blocks.count > 0
+    blocks.reset()
+    assert blocks.spawner._position == 0
+
+
+def test_BlockManager_spawner():
+    """turtle block manager spawns every batch through the spawner, level ups included"""
+    screen = GameScreen()
+    rng = Random(3)
+    spawner = RecordingSpawner(screen, rng, player=HeadlessPlayer(screen))
+    blocks = BlockManager(screen, rng=rng, spawner=spawner)
+    for level in range(2, 12):
+        blocks.increase_difficulty(level)
+        for _ in range(200):
+            blocks.update_blocks()
+    assert len(spawner.batches) > 10
+    assert all(len(batch) >= block_batch_min for block_batch_min, batch in spawner.batches)
+    assert spawner.crossings > 0
+    blocks.reset()
+    assert spawner._position == 0
+
+
+def test_Simulation_solvable():
+    """solvable simulation plays with a spawn generator"""
+    simulation = Simulation(seed=1, solvable=True)
+    assert simulation.blocks.spawner.player is simulation.player
+    for _ in range(500):
+        simulation.step("Up" if simulation.ticks % 5 == 0 else None)
+    assert simulation.ticks > 0
@@ -0,0 +1,26 @@
+from src.startup import measure_startup, PHASES
+from src.highscore_db import HighscoreDB
+import subprocess
+import sys
+
+
+def test_imports_create_no_tk_root():
+    """every module in src is importable in a fresh interpreter without creating a tk root or turtle screen"""
+    code = (
+        "import importlib, pkgutil, src, tkinter, turtle\n"
+        "for module in pkgutil.iter_modules(src.__path__):\n"
+        "    importlib.import_module(f'src.{module.name}')\n"
+        "print(tkinter._default_root is None and turtle.Turtle._screen is None)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "True"
+
+
+def test_measure_startup():
+    """report holds every phase in seconds; the window is closed again"""
+    # singleton on the test db; the report closes it again
+    HighscoreDB("data/test.highscore.db")
+    report = measure_startup(renderer="canvas")
+    assert list(report) == PHASES + ["total"]
+    assert all(duration >= 0 for duration in report.values())
+    assert report["total"] >= report["first_frame"]
@@ -0,0 +1,48 @@
+from src.telemetry import TelemetryWriter, read_records, to_csv, RECORD_SIZE, HEADER_SIZE
+import io
+import os
+import pytest
+
+
+def test_TelemetryWriter_file_size(tmp_path):
+    """ring file is created with its full size up front; writing records never grows it"""
+    path = str(tmp_path / "session.rrt")
+    writer = TelemetryWriter(path, capacity=8)
+    for tick in range(1, 20):
+        writer.write(tick, 1, 3, 0, -265, 20.0)
+    writer.close()
+    assert os.path.getsize(path) == HEADER_SIZE + 8 * RECORD_SIZE
+
+
+def test_read_records_while_writing(tmp_path):
+    """records are readable before the writer is closed; after wrapping only the newest ones are left in order"""
+    path = str(tmp_path / "session.rrt")
+    writer = TelemetryWriter(path, capacity=4)
+    for tick in range(1, 7):
+        writer.write(tick, 2, tick * 2, 10, 0.5 * tick, 16.5)
+    records = read_records(path)
+    assert records["seq"].tolist() == [3, 4, 5, 6]
+    assert records["tick"].tolist() == [3, 4, 5, 6]
+    assert records["blocks"].tolist() == [6, 8, 10, 12]
+    assert records["y"].tolist() == [1.5, 2.0, 2.5, 3.0]
+    assert read_records(path, after=5)["tick"].tolist() == [6]
+    writer.close()
+
+
+def test_read_records_invalid_file(tmp_path):
+    """files of unknown format are rejected"""
+    path = tmp_path / "invalid.rrt"
+    path.write_bytes(b"no telemetry at all")
+    with pytest.raises(ValueError):
+        read_records(str(path))
+
+
+def test_to_csv(tmp_path):
+    """csv has a header line and one line per record"""
+    path = str(tmp_path / "session.rrt")
+    writer = TelemetryWriter(path, capacity=4)
+    writer.write(1, 1, 3, 0, -265, 20.0)
+    writer.close()
+    output = io.StringIO()
+    to_csv(read_records(path), output)
+    assert output.getvalue() == "seq,tick,level,blocks,x,y,frame_ms\n1,1,1,3,0.0,-265.0,20.0\n"
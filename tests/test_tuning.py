@@ -0,0 +1,46 @@
+from src.tuning import play_game, level_statistics, run_tuning, dodge_policy
+from src.difficulty import DifficultySchedule
+from src.simulation import Simulation
+from random import Random
+import pytest
+
+
+def test_play_game_deterministic():
+    """identical seed, schedule and policy play the identical game"""
+    schedule = DifficultySchedule()
+    assert play_game(3, schedule, "random") == play_game(3, schedule, "random")
+
+
+def test_play_game_max_ticks():
+    """games end after max ticks without crash"""
+    level, crashed, ticks = play_game(1, DifficultySchedule(), "dodge", max_ticks=20)
+    assert (level, crashed, ticks) == (1, False, 20)
+
+
+def test_dodge_policy_moves_up_on_free_screen():
+    """without blocks in the way the scripted player moves up"""
+    simulation = Simulation(seed=1)
+    simulation.blocks.reset()
+    assert dodge_policy(simulation, Random(0)) == "Up"
+    simulation.blocks.render_blocks([(0, -255)])
+    assert dodge_policy(simulation, Random(0)) != "Up"
+
+
+def test_level_statistics():
+    """survival counts games reaching a level, clear rate the share of those games clearing it"""
+    results = [(1, True, 100), (2, True, 300), (3, True, 500), (3, False, 900)]
+    statistics = level_statistics(results, 3)
+    assert [level["reached"] for level in statistics] == [4, 3, 2]
+    assert [level["crashed"] for level in statistics] == [1, 1, 1]
+    assert statistics[1]["survival"] == 0.75
+    assert statistics[1]["clear_rate"] == pytest.approx(2 / 3)
+    assert statistics[2]["clear_rate"] == 0.0
+
+
+def test_run_tuning_process_pool():
+    """games are played in worker processes; results equal playing them one by one"""
+    schedule = DifficultySchedule(speed_factor=0.5)
+    result = run_tuning(games=4, schedule=schedule, policy="random", workers=2, max_level=5)
+    expected = level_statistics([play_game(seed, schedule, "random", max_level=5) for seed in range(4)], 5)
+    assert result["levels"] == expected
+    assert result["schedule"]["speed_factor"] == 0.5